@@ -0,0 +1,57 @@
+"""Compares the per-retry cost of calling handlers through call_handler, which
+inspects the handler signature on every call, against an invoker made by
+make_handler_invoker, which does it once when the decorator is created.
+
+Run with::
+
+    python benchmarks/bench_handler_dispatch.py
+"""
+
+import timeit
+from dataclasses import fields
+
+from yet_another_retry import RetryConfig
+from yet_another_retry.exception_handlers import default_exception_handler
+from yet_another_retry.retry_handlers import (
+    default_retry_handler,
+    exponential_backoff,
+    sleep_attempt_seconds,
+)
+from yet_another_retry.utils import call_handler, make_handler_invoker
+
+NUMBER = 100_000
+
+
+def main():
+    retry_config = RetryConfig(
+        tries=3,
+        retry_delay=0,
+        raise_final_exception=True,
+        retry_exceptions=Exception,
+        fail_on_exceptions=(),
+        retry_handler=default_retry_handler,
+        exception_handler=default_exception_handler,
+        attempt=2,
+    )
+    config_keys = [field.name for field in fields(RetryConfig)]
+    e = Exception("benchmark")
+
+    for handler in (default_retry_handler, sleep_attempt_seconds, exponential_backoff):
+        invoke = make_handler_invoker(handler, config_keys)
+
+        old = timeit.timeit(
+            lambda: call_handler(e=e, handler=handler, retry_config=retry_config),
+            number=NUMBER,
+        )
+        new = timeit.timeit(lambda: invoke(e, retry_config), number=NUMBER)
+
+        print(
+            f"{handler.__name__:<25}"
+            f" call_handler: {old / NUMBER * 1e6:6.2f} us"
+            f"  invoker: {new / NUMBER * 1e6:6.2f} us"
+            f"  ({old / new:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
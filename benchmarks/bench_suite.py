@@ -0,0 +1,322 @@
+"""Benchmarks of the decorator, written as JSON so runs of different releases can be compared.
+
+Measures:
+
+* success path: a call of a decorated function that succeeds on the first try, compared to the undecorated function
+* retry: the cost of each retry with every built in retry handler, without sleeping
+* dispatch: call_handler and get_func_meta, that inspect the handler on every call, against a handler invoker
+* threads: calls per second with many threads calling one decorated function
+* import: milliseconds to import yet_another_retry in a new interpreter
+
+Run with::
+
+    python benchmarks/bench_suite.py --output results.json
+    python benchmarks/bench_suite.py --compare results.json
+
+Every metric is saved with its unit and whether lower or higher is better.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+import yet_another_retry
+from yet_another_retry import RetryBudget, RetryConfig, retry
+from yet_another_retry.exception_handlers import default_exception_handler
+from yet_another_retry.retry_handlers import (
+    AdaptiveRateLimit,
+    JitteredBackoff,
+    decorrelated_jitter,
+    default_retry_handler,
+    equal_jitter,
+    exponential_backoff,
+    full_jitter,
+    retry_after,
+    sleep_attempt_seconds,
+)
+from yet_another_retry.utils import (
+    RETRY_CONFIG_FIELDS,
+    call_handler,
+    get_func_meta,
+    make_handler_invoker,
+)
+
+RETRIES = 4
+THREAD_COUNTS = (1, 2, 4, 8, 16)
+
+
+def no_sleep(seconds: float) -> None:
+    pass
+
+
+def per_call(func, number: int, repeat: int = 5) -> float:
+    """Best of repeat runs, in nanoseconds per call"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e9
+
+
+def bench_success_path(number: int) -> dict:
+    def plain():
+        return 1
+
+    decorated = retry()(plain)
+
+    @retry()
+    async def decorated_async():
+        return 1
+
+    async def plain_async():
+        return 1
+
+    def run_async(func):
+        async def calls():
+            for _ in range(number):
+                await func()
+
+        return lambda: asyncio.run(calls())
+
+    results = {}
+    undecorated = per_call(plain, number)
+    results["success.undecorated"] = (undecorated, "ns", "lower")
+    results["success.sync"] = (per_call(decorated, number), "ns", "lower")
+    results["success.sync_overhead"] = (
+        results["success.sync"][0] - undecorated,
+        "ns",
+        "lower",
+    )
+
+    # every repeat runs all calls in one event loop, so the loop is only started once per repeat
+    undecorated_async = per_call(run_async(plain_async), 1) / number
+    results["success.async"] = (
+        per_call(run_async(decorated_async), 1) / number,
+        "ns",
+        "lower",
+    )
+    results["success.async_overhead"] = (
+        results["success.async"][0] - undecorated_async,
+        "ns",
+        "lower",
+    )
+    return results
+
+
+def failing_function(retries: int):
+    """A function that fails retries times and then succeeds, over and over"""
+    attempts = [0]
+
+    def func():
+        attempts[0] += 1
+        if attempts[0] % (retries + 1):
+            raise ValueError("benchmark")
+        return 1
+
+    return func
+
+
+def bench_retry(number: int) -> dict:
+    handlers = {
+        "default_retry_handler": default_retry_handler,
+        "sleep_attempt_seconds": sleep_attempt_seconds,
+        "exponential_backoff": exponential_backoff,
+        "retry_after": retry_after,
+        "AdaptiveRateLimit": AdaptiveRateLimit(initial_rate=1e9, min_rate=1e9),
+        "full_jitter": full_jitter,
+        "equal_jitter": equal_jitter,
+        "decorrelated_jitter": decorrelated_jitter,
+        "JitteredBackoff": JitteredBackoff(max_delay_seconds=30),
+    }
+
+    succeeding = retry(sleeper=no_sleep)(failing_function(0))
+    success = per_call(succeeding, number)
+
+    results = {}
+    for name, handler in handlers.items():
+        func = retry(tries=RETRIES + 1, retry_handler=handler, sleeper=no_sleep)(
+            failing_function(RETRIES)
+        )
+        duration = per_call(func, max(number // RETRIES, 1))
+        results[f"retry.{name}"] = ((duration - success) / RETRIES, "ns", "lower")
+    return results
+
+
+def bench_dispatch(number: int) -> dict:
+    retry_config = RetryConfig(
+        tries=3,
+        retry_delay=0,
+        raise_final_exception=True,
+        retry_exceptions=Exception,
+        fail_on_exceptions=(),
+        retry_handler=default_retry_handler,
+        exception_handler=default_exception_handler,
+        attempt=2,
+    )
+    e = Exception("benchmark")
+
+    results = {}
+    for handler in (default_retry_handler, sleep_attempt_seconds, exponential_backoff):
+        name = handler.__name__
+        invoke = make_handler_invoker(handler, RETRY_CONFIG_FIELDS)
+        results[f"dispatch.get_func_meta.{name}"] = (
+            per_call(lambda: get_func_meta(handler), number),
+            "ns",
+            "lower",
+        )
+        results[f"dispatch.call_handler.{name}"] = (
+            per_call(
+                lambda: call_handler(e=e, handler=handler, retry_config=retry_config),
+                number,
+            ),
+            "ns",
+            "lower",
+        )
+        results[f"dispatch.invoker.{name}"] = (
+            per_call(lambda: invoke(e, retry_config), number),
+            "ns",
+            "lower",
+        )
+    return results
+
+
+def calls_per_second(func, threads: int, number: int) -> float:
+    start_barrier = threading.Barrier(threads + 1)
+    calls = max(number // threads, 1)
+
+    def worker():
+        start_barrier.wait()
+        for _ in range(calls):
+            func()
+
+    with ThreadPoolExecutor(threads) as executor:
+        futures = [executor.submit(worker) for _ in range(threads)]
+        start_barrier.wait()
+        start = time.perf_counter()
+        for future in futures:
+            future.result()
+        duration = time.perf_counter() - start
+
+    return calls * threads / duration
+
+
+def bench_threads(number: int) -> dict:
+    def plain():
+        return 1
+
+    variants = {
+        "plain": retry()(plain),
+        # the budget is shared by all threads, every success records to it
+        "retry_budget": retry(retry_budget=RetryBudget())(plain),
+    }
+
+    results = {}
+    for name, func in variants.items():
+        for threads in THREAD_COUNTS:
+            results[f"threads.{name}.{threads}"] = (
+                max(calls_per_second(func, threads, number) for _ in range(3)),
+                "calls/s",
+                "higher",
+            )
+    return results
+
+
+def bench_import(repeat: int) -> dict:
+    # the package is imported from wherever this interpreter found it
+    package_path = os.path.dirname(os.path.dirname(yet_another_retry.__file__))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (package_path, env.get("PYTHONPATH")) if path
+    )
+    code = "import time; start = time.perf_counter(); import yet_another_retry; print(time.perf_counter() - start)"
+
+    durations = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code],
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(repeat)
+    ]
+    return {"import.yet_another_retry": (min(durations) * 1e3, "ms", "lower")}
+
+
+def run(quick: bool) -> dict:
+    number = 10_000 if quick else 100_000
+    results = {}
+    results.update(bench_success_path(number))
+    results.update(bench_retry(number // 4))
+    results.update(bench_dispatch(number))
+    results.update(bench_threads(number))
+    results.update(bench_import(3 if quick else 10))
+
+    return {
+        "version": yet_another_retry.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "metrics": {
+            name: {"value": round(value, 3), "unit": unit, "better": better}
+            for name, (value, unit, better) in results.items()
+        },
+    }
+
+
+def print_results(results: dict, baseline: dict = None) -> None:
+    print(
+        f"yet_another_retry {results['version']}, {results['implementation']} {results['python']}"
+    )
+    if baseline is not None:
+        print(
+            f"compared to {baseline['version']}, {baseline['implementation']} {baseline['python']}"
+        )
+
+    for name, metric in results["metrics"].items():
+        line = f"{name:<45}{metric['value']:>14,.1f} {metric['unit']:<8}"
+
+        old = (baseline or {}).get("metrics", {}).get(name)
+        if old is not None and old["value"]:
+            # as the change of the time taken, so positive is slower whatever the unit
+            if metric["better"] == "higher":
+                change = old["value"] / metric["value"] - 1
+            else:
+                change = metric["value"] / old["value"] - 1
+            line += f"{old['value']:>14,.1f}  {change:+7.1%}{'  slower' if change > 0.1 else ''}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="File to write the results to as JSON")
+    parser.add_argument(
+        "--compare", help="JSON file of an earlier run to compare the results to"
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Fewer calls, less precise results"
+    )
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+
+    results = run(args.quick)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import asyncio
+from yet_another_retry import retry, RetryConfig
+
+
+async def async_retry_handler(e: Exception, attempt: int) -> int:
+    print(f"Attempt {attempt} failed with: {e}")
+    return 1
+
+
+# coroutine functions are awaited and asyncio.sleep is used between tries so the event loop is never blocked
+@retry(retry_handler=async_retry_handler, tries=3)
+async def my_function(retry_config: RetryConfig):
+    print(f"This is attempt number: {retry_config.attempt}")
+    raise Exception("This is an exception")
+
+
+asyncio.run(my_function())
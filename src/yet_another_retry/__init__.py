@@ -1,11 +1,58 @@
 from .api import retry
+from .batch import retry_map
 from yet_another_retry import retry_handlers, exception_handlers
 from .utils.retry_config import RetryConfig
-from importlib.metadata import version, PackageNotFoundError
+from .utils.exception_policy import ExceptionPolicy
+from .utils.attempt_record import AttemptRecord
+from .retry_budget import RetryBudget
+from .shared_retry_budget import SharedRetryBudget
+from .circuit_breaker import CircuitBreaker
+from .bulkhead import RetryBulkhead
+from .exceptions import CircuitOpenError, RetryCancelledError, RetryResultError
+from .cancellation import CancellationToken, cancel_all_retries, shutdown_token
+from .instrumentation import RetryHooks, RetryStats
+from .process_pool import RetryingFunction, submit_retry
+from .retry_executor import RetryExecutor
+from .simulation import SimulationResult, simulate_policy
 
-__all__ = ["retry", "retry_handlers", "exception_handlers", "RetryConfig"]
+__all__ = [
+    "retry",
+    "retry_map",
+    "retry_handlers",
+    "exception_handlers",
+    "RetryConfig",
+    "ExceptionPolicy",
+    "AttemptRecord",
+    "RetryBudget",
+    "SharedRetryBudget",
+    "CircuitBreaker",
+    "RetryBulkhead",
+    "CircuitOpenError",
+    "RetryCancelledError",
+    "RetryResultError",
+    "CancellationToken",
+    "cancel_all_retries",
+    "shutdown_token",
+    "RetryHooks",
+    "RetryStats",
+    "RetryingFunction",
+    "submit_retry",
+    "RetryExecutor",
+    "simulate_policy",
+    "SimulationResult",
+]
 
-try:
-    __version__ = version("yet-another-retry")
-except PackageNotFoundError:
-    __version__ = "0.0.0+local"
+
+def __getattr__(name: str):
+    # importlib.metadata is slow to import and the version is rarely needed, so it is only looked up when asked for
+    if name == "__version__":
+        from importlib.metadata import version, PackageNotFoundError
+
+        global __version__
+        try:
+            __version__ = version("yet-another-retry")
+        except PackageNotFoundError:
+            __version__ = "0.0.0+local"
+        return __version__
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,53 @@
 import argparse
 from . import __version__
+from .retry_handlers import (
+    decorrelated_jitter,
+    default_retry_handler,
+    equal_jitter,
+    exponential_backoff,
+    full_jitter,
+    sleep_attempt_seconds,
+)
+from .simulation import DEFAULT_PERCENTILES, simulate_policy
 import sys
 
+RETRY_HANDLERS = {
+    "default_retry_handler": default_retry_handler,
+    "sleep_attempt_seconds": sleep_attempt_seconds,
+    "exponential_backoff": exponential_backoff,
+    "full_jitter": full_jitter,
+    "equal_jitter": equal_jitter,
+    "decorrelated_jitter": decorrelated_jitter,
+}
 
-def main():
+# options of the simulate command that are passed to the retry handler, only when given
+HANDLER_OPTIONS = ("exponential_factor", "max_delay_seconds", "jitter_range")
+
+
+def simulate(args: argparse.Namespace) -> None:
+    handler_kwargs = {
+        name: getattr(args, name)
+        for name in HANDLER_OPTIONS
+        if getattr(args, name) is not None
+    }
+    result = simulate_policy(
+        failure_probability=args.failure_probability,
+        calls=args.calls,
+        tries=args.tries,
+        retry_handler=RETRY_HANDLERS[args.retry_handler],
+        retry_delay=args.retry_delay,
+        attempt_duration=args.attempt_duration,
+        arrival_rate=args.arrival_rate,
+        bucket_seconds=args.bucket_seconds,
+        outage_start=args.outage_start,
+        outage_duration=args.outage_duration,
+        seed=args.seed,
+        **handler_kwargs,
+    )
+    print(result.report(tuple(args.percentiles)))
+
+
+def main(argv: list[str] = None):
     parser = argparse.ArgumentParser(description="Yet Another Retry")
     parser.add_argument(
         "--version",
@@ -11,11 +55,88 @@ def main():
         version=f"%(prog)s {__version__}",
         help="Prints current installed version",
     )
+    commands = parser.add_subparsers(dest="command")
+
+    simulate_parser = commands.add_parser(
+        "simulate",
+        help="Simulates a retry policy and prints latency, attempts and retry bursts",
+        description="Simulates many calls retried with a policy, without sleeping, to check the backoff settings before using them",
+    )
+    simulate_parser.add_argument(
+        "--failure-probability",
+        type=float,
+        required=True,
+        help="Probability that an attempt fails, between 0 and 1",
+    )
+    simulate_parser.add_argument(
+        "--calls", type=int, default=100_000, help="Number of calls to simulate"
+    )
+    simulate_parser.add_argument(
+        "--tries", type=int, default=3, help="Number of tries of each call"
+    )
+    simulate_parser.add_argument(
+        "--retry-handler",
+        choices=RETRY_HANDLERS,
+        default="exponential_backoff",
+        help="The built in retry handler to use",
+    )
+    simulate_parser.add_argument(
+        "--retry-delay", type=float, default=0, help="Seconds of retry_delay"
+    )
+    simulate_parser.add_argument(
+        "--exponential-factor", type=float, help="exponential_factor of the handler"
+    )
+    simulate_parser.add_argument(
+        "--max-delay-seconds", type=float, help="max_delay_seconds of the handler"
+    )
+    simulate_parser.add_argument(
+        "--jitter-range", type=float, help="jitter_range of the handler"
+    )
+    simulate_parser.add_argument(
+        "--attempt-duration",
+        type=float,
+        default=0,
+        help="Seconds every attempt takes",
+    )
+    simulate_parser.add_argument(
+        "--arrival-rate", type=float, default=1000, help="Calls started per second"
+    )
+    simulate_parser.add_argument(
+        "--bucket-seconds",
+        type=float,
+        default=1,
+        help="Width of the time buckets retry bursts are counted in",
+    )
+    simulate_parser.add_argument(
+        "--outage-start",
+        type=float,
+        help="Seconds into the simulation when every attempt starts failing",
+    )
+    simulate_parser.add_argument(
+        "--outage-duration", type=float, default=0, help="Seconds the outage lasts"
+    )
+    simulate_parser.add_argument(
+        "--percentiles",
+        type=float,
+        nargs="+",
+        default=list(DEFAULT_PERCENTILES),
+        help="Latency percentiles to print",
+    )
+    simulate_parser.add_argument(
+        "--seed", type=int, help="Seed to get the same result every run"
+    )
+    simulate_parser.set_defaults(handler=simulate)
+
+    if argv is None:
+        argv = sys.argv[1:]
 
-    if len(sys.argv) == 1:
+    if not argv:
         parser.print_help()
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    if args.command is not None:
+        args.handler(args)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,31 @@
-from typing import Callable
+from typing import Any, Callable, Hashable
+import functools
+import inspect
+import threading
 import time
 from datetime import timedelta
 from yet_another_retry.retry_handlers import default_retry_handler
 from yet_another_retry.exception_handlers import default_exception_handler
-from yet_another_retry.utils import RetryConfig, get_func_meta, call_handler
+from yet_another_retry.retry_budget import RetryBudget
+from yet_another_retry.circuit_breaker import CircuitBreaker
+from yet_another_retry.bulkhead import RetryBulkhead
+from yet_another_retry.exceptions import CircuitOpenError, RetryResultError
+from yet_another_retry.instrumentation import RetryHooks
+from yet_another_retry.cancellation import CancellationToken
+from yet_another_retry.streaming import (
+    make_generator_wrapper,
+    make_async_generator_wrapper,
+)
+from yet_another_retry.utils import (
+    RetryPolicy,
+    FAIL,
+    RETRY,
+    IGNORE,
+    RetryCall,
+    get_func_meta,
+    SingleFlight,
+    ExceptionPolicy,
+)
 
 
 def retry(
@@ -14,10 +36,31 @@ def retry(
     retry_handler: Callable = default_retry_handler,
     exception_handler: Callable = default_exception_handler,
     raise_final_exception: bool = True,
+    retry_budget: RetryBudget = None,
+    circuit_breaker: CircuitBreaker = None,
+    max_total_time: float | int | timedelta = None,
+    attempt_timeout: float | int | timedelta = None,
+    hedge_after: float | int | timedelta = None,
+    hedge_max_workers: int = None,
+    hooks: RetryHooks | list[RetryHooks] = None,
+    clock: Callable[[], float] = None,
+    sleeper: Callable[[float], Any] = None,
+    cancel_token: CancellationToken | threading.Event = None,
+    coalesce_key: Callable[..., Hashable] | bool = None,
+    exception_policies: dict[type[BaseException], ExceptionPolicy] = None,
+    retry_on_result: Callable[[Any], bool] = None,
+    attempt_history: int = None,
+    clear_tracebacks: bool = False,
+    bulkhead: RetryBulkhead | int = None,
     **kwargs,
 ) -> Callable:
     """Decorator for retrying a function
 
+    Coroutine functions are also supported, they are awaited and asyncio.sleep is used between tries. When decorating a coroutine function the retry and exception handlers can also be coroutine functions.
+
+    Generator and async generator functions are restarted after a retryable exception without yielding an item twice. The generator can store where to resume in retry_config.checkpoint, after a restart the items it yields again since that checkpoint are dropped.
+    For generators tries limit the failures in a row, a restart that yields a new item before failing again counts as the first try.
+
     All the above values will also be available in a dataclass called retry_config which will be passed to the decorated function if it accepts it as a parameter named "retry_config" with type hint "RetryConfig".
 
     :param  retry_exceptions: An Exception or tuple of exceptions to retry. If supplied all other exceptions will be treated as instant failures. Python base Exception acts as a catch-all. Defaults to Exception.
@@ -32,7 +75,7 @@ def retry(
     :param retry_delay: Time to sleep between retries. If int or float, it is treated as seconds. If timedelta, total_seconds() is used. If negative, it will be treated as 0. Defaults to 0
     :type retry_delay: int | float | timedelta
 
-    :param retry_handler: Callable function to run in case of retries. Defaults to default_retry_handler function
+    :param retry_handler: Callable function to run in case of retries. If it also has acquire() and record_success() methods, like AdaptiveRateLimit, acquire() is called before the first attempt of every call and the returned seconds are slept, and record_success() after every successful call. Defaults to default_retry_handler function
     :type retry_handler: Callable
 
     :param exception_handler: Callable function to run in case of erroring out, either by reaching max tries +1 or hitting a fail_on_exception exception. Defaults to default_exception_handler function.
@@ -41,90 +84,423 @@ def retry(
     :param raise_final_exception: If set to false the decorator itself will not raise the error but expect the handler to do it. Default is True
     :type raise_final_exception: bool
 
+    :param retry_budget: A RetryBudget that can be shared between decorated functions. Each retry takes a token from the budget and when it is spent retryable exceptions go straight to the exception_handler. If None, retries are only limited by tries. Defaults to None
+    :type retry_budget: RetryBudget, optional
+
+    :param circuit_breaker: A CircuitBreaker that decides if an attempt is made at all. While it is open the function is not called and CircuitOpenError is raised immediately, without calling any handler. Defaults to None
+    :type circuit_breaker: CircuitBreaker, optional
+
+    :param max_total_time: Maximum time all tries together may take. If the delay before the next try would reach past it the exception handler is called instead of retrying. The time left is available as retry_config.remaining_time. If int or float, it is treated as seconds. If None, there is no time limit. Defaults to None
+    :type max_total_time: int | float | timedelta, optional
+
+    :param attempt_timeout: Time a single attempt should at most take. The decorator does not interrupt the function, the value is made available as retry_config.attempt_timeout, clamped to the time left of max_total_time, so the function can pass it on to the calls it makes. Defaults to None
+    :type attempt_timeout: int | float | timedelta, optional
+
+    :param hedge_after: Only for idempotent functions. If an attempt has not returned within this time another attempt is started next to it, on a thread pool for regular functions or as a task for coroutine functions. The first attempt to succeed wins, every started attempt counts against tries and they all share the same retry_config. If int or float, it is treated as seconds. If None, attempts are not hedged. Defaults to None
+    :type hedge_after: int | float | timedelta, optional
+
+    :param hedge_max_workers: Max number of threads in the thread pool used for hedged attempts. Defaults to None, the ThreadPoolExecutor default
+    :type hedge_max_workers: int, optional
+
+    :param hooks: RetryHooks, or a list of them, that are told about every attempt, retry, give up and success, for example a RetryStats collecting metrics. If None, no instrumentation is done. Defaults to None
+    :type hooks: RetryHooks | list[RetryHooks], optional
+
+    :param clock: Function returning the current time in seconds, used for max_total_time. If None the default clock is used, time.monotonic unless replaced with yet_another_retry.clock.set_default_clock. Defaults to None
+    :type clock: Callable[[], float], optional
+
+    :param sleeper: Function called with the number of seconds to sleep between tries. For coroutine functions it can also be a coroutine function. If None the default clock is used, time.sleep or asyncio.sleep unless replaced. Defaults to None
+    :type sleeper: Callable[[float], Any], optional
+
+    :param cancel_token: CancellationToken, or threading.Event, that is waited on instead of sleeping between tries. Cancelling it wakes every sleeping call, which then goes to the exception handler with a RetryCancelledError. If None, the global shutdown_token is used, see cancel_all_retries(). Defaults to None
+    :type cancel_token: CancellationToken | threading.Event, optional
+
+    :param coalesce_key: Lets concurrent calls share one run of the retry loop. Either a function called with the arguments of the call returning a hashable key, or True to use the arguments themselves as key, which then have to be hashable. Calls made while a call with the same key is running wait for it and get its result or its final exception. Calls are shared between threads, or between tasks of the same event loop for coroutine functions. If None, every call runs on its own. Defaults to None
+    :type coalesce_key: Callable[..., Hashable] | bool, optional
+
+    :param exception_policies: Maps exception types to an ExceptionPolicy with their own tries, retry handler or fail fast, e.g. to retry timeouts quickly and throttling slowly with one decorator. The policy of the closest class in the MRO of a raised exception is used, looked up once per exception type. If None, all exceptions use the decorator settings. Defaults to None
+    :type exception_policies: dict[type[BaseException], ExceptionPolicy], optional
+
+    :param retry_on_result: Function called with the result of every successful attempt. If it returns True the result is retried like an exception, the handlers get a RetryResultError holding the result and the rejected result is available as retry_config.last_result. When the tries are used up the exception handler gets the RetryResultError, if it does not raise and raise_final_exception is False the last result is returned. If None, results are never retried. Defaults to None
+    :type retry_on_result: Callable[[Any], bool], optional
+
+    :param attempt_history: Keep a compact AttemptRecord of each failed attempt, with the exception type, message, duration and delay, in retry_config.attempt_history instead of the exceptions themselves. At most this many of the latest records are kept. On python 3.11 and later the history is added as a note to the final exception. If None, no history is kept. Defaults to None
+    :type attempt_history: int, optional
+
+    :param clear_tracebacks: Clear the frames and traceback of every exception that is retried, once it is recorded, so the variables of the failed attempt are freed before sleeping. Defaults to False
+    :type clear_tracebacks: bool
+
+    :param bulkhead: A RetryBulkhead limiting how many calls can be retrying at the same time, shared between the decorated functions it is given to, or an int to create one for this decorator that fails fast. A call takes a slot before its first retry and keeps it until it ends. When no slot is free the exception goes straight to the exception handler. If None, the number of retrying calls is not limited. Defaults to None
+    :type bulkhead: RetryBulkhead | int, optional
+
     :param **kwargs: Any additional kwargs gets added as input to handlers and will also be sent as parameters to retry and exception handlers.
     :type **kwargs: Any
 
-    :return: The decorated function
+    :return: The decorated function, with the metadata of the original function and its RetryPolicy as the attribute retry_policy
     :rtype: Callable
     """
 
+    policy = RetryPolicy(
+        retry_exceptions=retry_exceptions,
+        fail_on_exceptions=fail_on_exceptions,
+        tries=tries,
+        retry_delay=retry_delay,
+        retry_handler=retry_handler,
+        exception_handler=exception_handler,
+        raise_final_exception=raise_final_exception,
+        kwargs=kwargs,
+        retry_budget=retry_budget,
+        circuit_breaker=circuit_breaker,
+        max_total_time=max_total_time,
+        attempt_timeout=attempt_timeout,
+        hedge_after=hedge_after,
+        hedge_max_workers=hedge_max_workers,
+        hooks=hooks,
+        clock=clock,
+        sleeper=sleeper,
+        cancel_token=cancel_token,
+        exception_policies=exception_policies,
+        retry_on_result=retry_on_result,
+        attempt_history=attempt_history,
+        clear_tracebacks=clear_tracebacks,
+        bulkhead=bulkhead,
+    )
+
     def decorator(func: Callable) -> Callable:
 
         # check if the function accepts a retry_config parameter
-        (func_params, _) = get_func_meta(func)
+        func_params, _ = get_func_meta(func)
         add_retry_config = "retry_config" in func_params
 
-        def wrapper(*func_args, **func_kwargs) -> Callable:
+        if inspect.isgeneratorfunction(func):
+            if policy.has_async_handlers:
+                raise TypeError(
+                    f"Async retry handlers, exception handlers or sleepers can only be used when decorating an async function, {func.__name__} is not async."
+                )
+            wrapper = make_generator_wrapper(func, policy, add_retry_config)
+
+        elif inspect.isasyncgenfunction(func):
+            wrapper = make_async_generator_wrapper(func, policy, add_retry_config)
 
-            retry_config = RetryConfig(
-                retry_exceptions=retry_exceptions,
-                fail_on_exceptions=fail_on_exceptions,
-                tries=tries,
-                retry_delay=retry_delay,
-                retry_handler=retry_handler,
-                exception_handler=exception_handler,
-                raise_final_exception=raise_final_exception,
+        elif inspect.iscoroutinefunction(func):
+            wrapper = make_async_wrapper(func, policy, add_retry_config)
+
+        elif policy.has_async_handlers:
+            raise TypeError(
+                f"Async retry handlers, exception handlers or sleepers can only be used when decorating an async function, {func.__name__} is not async."
             )
 
-            vars(retry_config).update(kwargs)
+        else:
+            wrapper = make_sync_wrapper(func, policy, add_retry_config)
 
-            for i in range(1, tries + 1):
+        if coalesce_key is not None and coalesce_key is not False:
+            wrapper = make_coalescing_wrapper(wrapper, coalesce_key)
 
-                retry_config.attempt = i
+        # keeping the name, module and qualname of the function lets module level decorated functions be pickled by reference, e.g. for a ProcessPoolExecutor
+        functools.update_wrapper(wrapper, func)
+        wrapper.retry_policy = policy
 
-                try:
-                    if add_retry_config:
-                        func_kwargs["retry_config"] = retry_config
-                    return func(*func_args, **func_kwargs)
+        return wrapper
 
-                # first check if we hit a fail_on_exceptions and should fail immediately
-                except fail_on_exceptions as e:
+    return decorator
 
-                    call_handler(
-                        e=e, handler=exception_handler, retry_config=retry_config
-                    )
 
-                    if raise_final_exception:
-                        raise e
+def make_coalescing_wrapper(
+    wrapper: Callable, coalesce_key: Callable[..., Hashable] | bool
+) -> Callable:
+    """Wraps a retry wrapper so that concurrent calls with the same key share one run of it
 
-                # then check if we hit a retryable exception
-                except retry_exceptions as e:
-                    if i == tries:
-                        call_handler(
-                            e=e, handler=exception_handler, retry_config=retry_config
-                        )
+    :param wrapper: The sync or async retry wrapper
+    :type wrapper: Callable
 
-                        if raise_final_exception:
-                            raise e
+    :param coalesce_key: Function returning the key for the arguments of a call, or True to use the arguments as key
+    :type coalesce_key: Callable[..., Hashable] | bool
 
-                    # if we are within the max tries we retry
-                    delay_time = call_handler(
-                        e=e, handler=retry_handler, retry_config=retry_config
-                    )
+    :return: The coalescing wrapper
+    :rtype: Callable
+    """
 
-                    if not isinstance(delay_time, (int, float, timedelta)):
-                        raise TypeError(
-                            f"The retry_handler did not return an int, float or timedelta. Can not use {type(delay_time)} as input to sleep."
-                        )
+    single_flight = SingleFlight()
+    get_key = arguments_key if coalesce_key is True else coalesce_key
+
+    if inspect.iscoroutinefunction(wrapper):
 
-                    retry_config.previous_delay = delay_time
+        async def coalescing_wrapper(*func_args, **func_kwargs) -> Any:
+            return await single_flight.do_async(
+                get_key(*func_args, **func_kwargs),
+                lambda: wrapper(*func_args, **func_kwargs),
+            )
 
-                    # we need to make sure time.sleep() gets a float/int so if we happen to have a timedelta we convert it now after saving it to config so that handlers can still use it
-                    if isinstance(delay_time, timedelta):
-                        sleep_seconds = delay_time.total_seconds()
+    else:
+
+        def coalescing_wrapper(*func_args, **func_kwargs) -> Any:
+            return single_flight.do(
+                get_key(*func_args, **func_kwargs),
+                lambda: wrapper(*func_args, **func_kwargs),
+            )
+
+    return coalescing_wrapper
+
+
+def arguments_key(*func_args, **func_kwargs) -> Hashable:
+    """Default coalesce_key, the arguments of the call
+
+    :return: Hashable key of the arguments
+    :rtype: Hashable
+    """
+    return func_args, frozenset(func_kwargs.items())
+
+
+def make_sync_wrapper(
+    func: Callable, policy: RetryPolicy, add_retry_config: bool
+) -> Callable:
+    """Creates the wrapper for a regular function, sleeping with the sleeper of the policy between tries
+
+    :param func: The decorated function
+    :type func: Callable
+
+    :param policy: The retry policy of the decorator
+    :type policy: RetryPolicy
+
+    :param add_retry_config: If the retry_config should be passed to the function
+    :type add_retry_config: bool
+
+    :return: The wrapper function
+    :rtype: Callable
+    """
+
+    success_callbacks = policy.success_callbacks
+    circuit_breaker = policy.circuit_breaker
+    has_deadline = policy.max_total_time is not None
+    hedger = policy.hedger
+    tries = policy.tries
+    hooks = policy.hooks
+    acquire_attempt = policy.acquire_attempt
+    retry_on_result = policy.retry_on_result
+    timed = hooks is not None or policy.attempt_history is not None
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    def wrapper(*func_args, **func_kwargs) -> Any:
+
+        # the retry_config is only created once it is needed, either because the function asks for it or because an attempt failed.
+        retry_config = None
+        # the retries of the call, created when an attempt fails, so a call that succeeds right away does not pay for them
+        call = None
+        attempt = 1
+        deadline = policy.get_deadline() if has_deadline else None
+
+        # retries wait for their turn through the retry handler, the first attempt waits here.
+        # a cancelled wait still makes the attempt, a failure then ends with RetryCancelledError.
+        if acquire_attempt is not None:
+            wait_seconds = acquire_attempt()
+            if wait_seconds > 0:
+                policy.sleep(wait_seconds)
+
+        try:
+            while True:
+
+                if add_retry_config:
+                    if retry_config is None:
+                        retry_config = policy.new_retry_config()
+                    retry_config.attempt = attempt
+                    if deadline is not None:
+                        policy.update_remaining_time(retry_config, deadline)
+                    func_kwargs["retry_config"] = retry_config
+
+                # an open circuit fails fast without calling the function
+                if circuit_breaker is not None and not circuit_breaker.allow_request():
+                    raise CircuitOpenError(circuit_breaker)
+
+                if hooks is not None:
+                    hooks.on_attempt_start(name, attempt)
+                if timed:
+                    started = time.perf_counter()
+
+                try:
+                    if hedger is None:
+                        result = func(*func_args, **func_kwargs)
                     else:
-                        sleep_seconds = delay_time
+                        attempt, future = hedger.run(
+                            func, func_args, func_kwargs, attempt, tries
+                        )
+                        result = future.result()
+
+                except BaseException as attempt_error:
+                    e = attempt_error
+
+                else:
+                    # a result rejected by retry_on_result goes through the same handling as an exception, without raising one
+                    if retry_on_result is None or not retry_on_result(result):
+                        if hooks is not None:
+                            hooks.on_attempt_end(
+                                name, attempt, time.perf_counter() - started, None
+                            )
+                            hooks.on_success(
+                                name, attempt, 0 if call is None else call.total_sleep
+                            )
+                        if success_callbacks:
+                            for callback in success_callbacks:
+                                callback()
+                        return result
+
+                    e = RetryResultError(result)
+
+                if call is None:
+                    call = RetryCall(policy, name, deadline, retry_config, attempt)
+                else:
+                    # a hedged attempt may have used up more than one attempt
+                    call.attempt = attempt
+
+                action, sleep_seconds = call.failed(
+                    e, time.perf_counter() - started if timed else 0
+                )
+
+                if action is RETRY:
+                    # a cancelled sleep ends the retries
+                    if not policy.sleep(sleep_seconds):
+                        attempt = call.attempt
+                        retry_config = call.retry_config
+                        continue
+                    e = call.cancelled_error(e)
+                    action = FAIL
+
+                # exceptions that are not an Exception, like KeyboardInterrupt, are always raised
+                if action is IGNORE:
+                    if isinstance(e, Exception):
+                        return None
+                    raise e
+
+                return call.give_up(e)
+        finally:
+            # the slot of the bulkhead is taken before the first retry and held until the call ends
+            if call is not None:
+                call.release()
+
+    return wrapper
+
+
+def make_async_wrapper(
+    func: Callable, policy: RetryPolicy, add_retry_config: bool
+) -> Callable:
+    """Creates the wrapper for an async function, awaiting the sleeper of the policy between tries
 
-                    # can not sleep negative time
-                    if sleep_seconds < 0:
-                        sleep_seconds = 0
+    Retry and exception handlers can be regular functions or coroutine functions.
 
-                    time.sleep(sleep_seconds)
+    :param func: The decorated coroutine function
+    :type func: Callable
 
-                # if we hit an exception that is not in either retry_exceptions or fail_on_exceptions we break the loop to exit the decorator
-                except Exception as e:
-                    break
+    :param policy: The retry policy of the decorator
+    :type policy: RetryPolicy
 
-        return wrapper
+    :param add_retry_config: If the retry_config should be passed to the function
+    :type add_retry_config: bool
 
-    return decorator
+    :return: The async wrapper function
+    :rtype: Callable
+    """
+
+    success_callbacks = policy.success_callbacks
+    circuit_breaker = policy.circuit_breaker
+    has_deadline = policy.max_total_time is not None
+    hedger = policy.hedger
+    tries = policy.tries
+    hooks = policy.hooks
+    acquire_attempt = policy.acquire_attempt
+    retry_on_result = policy.retry_on_result
+    timed = hooks is not None or policy.attempt_history is not None
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    async def wrapper(*func_args, **func_kwargs) -> Any:
+
+        retry_config = None
+        call = None
+        attempt = 1
+        deadline = policy.get_deadline() if has_deadline else None
+
+        # retries wait for their turn through the retry handler, the first attempt waits here.
+        # a cancelled wait still makes the attempt, a failure then ends with RetryCancelledError.
+        if acquire_attempt is not None:
+            wait_seconds = acquire_attempt()
+            if wait_seconds > 0:
+                await policy.async_sleep(wait_seconds)
+
+        try:
+            while True:
+
+                if add_retry_config:
+                    if retry_config is None:
+                        retry_config = policy.new_retry_config()
+                    retry_config.attempt = attempt
+                    if deadline is not None:
+                        policy.update_remaining_time(retry_config, deadline)
+                    func_kwargs["retry_config"] = retry_config
+
+                # an open circuit fails fast without calling the function
+                if circuit_breaker is not None and not circuit_breaker.allow_request():
+                    raise CircuitOpenError(circuit_breaker)
+
+                if hooks is not None:
+                    hooks.on_attempt_start(name, attempt)
+                if timed:
+                    started = time.perf_counter()
+
+                try:
+                    if hedger is None:
+                        result = await func(*func_args, **func_kwargs)
+                    else:
+                        attempt, task = await hedger.run_async(
+                            func, func_args, func_kwargs, attempt, tries
+                        )
+                        result = task.result()
+
+                except BaseException as attempt_error:
+                    e = attempt_error
+
+                else:
+                    # a result rejected by retry_on_result goes through the same handling as an exception, without raising one
+                    if retry_on_result is None or not retry_on_result(result):
+                        if hooks is not None:
+                            hooks.on_attempt_end(
+                                name, attempt, time.perf_counter() - started, None
+                            )
+                            hooks.on_success(
+                                name, attempt, 0 if call is None else call.total_sleep
+                            )
+                        if success_callbacks:
+                            for callback in success_callbacks:
+                                callback()
+                        return result
+
+                    e = RetryResultError(result)
+
+                if call is None:
+                    call = RetryCall(policy, name, deadline, retry_config, attempt)
+                else:
+                    # a hedged attempt may have used up more than one attempt
+                    call.attempt = attempt
+
+                action, sleep_seconds = await call.failed_async(
+                    e, time.perf_counter() - started if timed else 0
+                )
+
+                if action is RETRY:
+                    # a cancelled sleep ends the retries
+                    if not await policy.async_sleep(sleep_seconds):
+                        attempt = call.attempt
+                        retry_config = call.retry_config
+                        continue
+                    e = call.cancelled_error(e)
+                    action = FAIL
+
+                # exceptions that are not an Exception, like asyncio.CancelledError, are always raised
+                if action is IGNORE:
+                    if isinstance(e, Exception):
+                        return None
+                    raise e
+
+                return await call.give_up_async(e)
+        finally:
+            # the slot of the bulkhead is taken before the first retry and held until the call ends
+            if call is not None:
+                call.release()
+
+    return wrapper
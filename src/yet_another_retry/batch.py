@@ -0,0 +1,367 @@
+import asyncio
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator
+
+from yet_another_retry.cancellation import CancellationToken
+from yet_another_retry.circuit_breaker import CircuitBreaker
+from yet_another_retry.exception_handlers import default_exception_handler
+from yet_another_retry.exceptions import CircuitOpenError, RetryResultError
+from yet_another_retry.retry_budget import RetryBudget
+from yet_another_retry.retry_handlers import default_retry_handler
+from yet_another_retry.utils import (
+    FAIL,
+    IGNORE,
+    RETRY,
+    ExceptionPolicy,
+    RetryCall,
+    RetryPolicy,
+    get_func_meta,
+    get_sleep_seconds,
+)
+
+# parameters of the retry decorator that retry_map does not support, without this check they would end up in kwargs and be passed to the handlers
+DECORATOR_ONLY_PARAMETERS = (
+    "max_total_time",
+    "attempt_timeout",
+    "hedge_after",
+    "hedge_max_workers",
+    "hooks",
+    "coalesce_key",
+    "attempt_history",
+    "clear_tracebacks",
+    "bulkhead",
+)
+
+
+def retry_map(
+    func: Callable,
+    iterable: Iterable,
+    retry_exceptions: Exception | tuple[Exception, ...] = Exception,
+    fail_on_exceptions: Exception | tuple[Exception] = (),
+    tries: int = 3,
+    retry_delay: float | int | timedelta = 0,
+    retry_handler: Callable = default_retry_handler,
+    exception_handler: Callable = default_exception_handler,
+    raise_final_exception: bool = True,
+    retry_budget: RetryBudget = None,
+    circuit_breaker: CircuitBreaker = None,
+    clock: Callable[[], float] = None,
+    sleeper: Callable[[float], Any] = None,
+    cancel_token: CancellationToken | threading.Event = None,
+    exception_policies: dict[type[BaseException], ExceptionPolicy] = None,
+    retry_on_result: Callable[[Any], bool] = None,
+    max_workers: int = None,
+    chunk_size: int = 256,
+    **kwargs,
+) -> Iterator | AsyncIterator:
+    """Calls func once for each item in iterable, concurrently, retrying only the items that failed.
+
+    Items are read ``chunk_size`` at a time. All items of a chunk are run concurrently, then the items that failed with a retryable exception are retried together after one shared delay, returned by the retry handler for the first of them.
+    Results are yielded in the same order as the input once a chunk is done, so memory use depends on chunk_size and not on the size of the input.
+
+    Regular functions run on a thread pool and a generator is returned. Coroutine functions run as tasks and an async generator is returned, use it with ``async for``.
+
+    Each item gets its own retry_config if func accepts it. An item that fails for good is handled like the retry decorator handles it: the exception handler is called and the exception is raised if raise_final_exception is True, which ends the iteration, otherwise None, or the last result rejected by retry_on_result, is yielded for it.
+
+    See the retry decorator for a description of the retry parameters. max_total_time, attempt_timeout, hedge_after, hedge_max_workers, hooks, coalesce_key,
+    attempt_history, clear_tracebacks and bulkhead are not supported.
+
+    :param func: Function to call with each item as its only positional argument
+    :type func: Callable
+
+    :param iterable: The items
+    :type iterable: Iterable
+
+    :param max_workers: Max number of threads for regular functions, or max number of concurrent tasks for coroutine functions. Defaults to None, the ThreadPoolExecutor default for threads and no limit other than chunk_size for tasks
+    :type max_workers: int, optional
+
+    :param chunk_size: Number of items read from the iterable and run together. Defaults to 256
+    :type chunk_size: int
+
+    :raises TypeError: If a parameter of the retry decorator that is not supported is given
+
+    :return: Iterator, or async iterator for coroutine functions, with one result per item
+    :rtype: Iterator | AsyncIterator
+    """
+
+    unsupported = [name for name in DECORATOR_ONLY_PARAMETERS if name in kwargs]
+    if unsupported:
+        raise TypeError(
+            f"retry_map does not support the retry parameters {', '.join(unsupported)}"
+        )
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    policy = RetryPolicy(
+        retry_exceptions=retry_exceptions,
+        fail_on_exceptions=fail_on_exceptions,
+        tries=tries,
+        retry_delay=retry_delay,
+        retry_handler=retry_handler,
+        exception_handler=exception_handler,
+        raise_final_exception=raise_final_exception,
+        kwargs=kwargs,
+        retry_budget=retry_budget,
+        circuit_breaker=circuit_breaker,
+        clock=clock,
+        sleeper=sleeper,
+        cancel_token=cancel_token,
+        exception_policies=exception_policies,
+        retry_on_result=retry_on_result,
+    )
+
+    func_params, _ = get_func_meta(func)
+    add_retry_config = "retry_config" in func_params
+
+    if inspect.iscoroutinefunction(func):
+        return _async_retry_map(
+            func, iterable, policy, add_retry_config, max_workers, chunk_size
+        )
+
+    if policy.has_async_handlers:
+        raise TypeError(
+            f"Async retry handlers, exception handlers or sleepers can only be used with an async function, {func.__name__} is not async."
+        )
+
+    return _retry_map(func, iterable, policy, add_retry_config, max_workers, chunk_size)
+
+
+def _chunks(iterable: Iterable, chunk_size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def _result_outcome(retry_on_result: Callable[[Any], bool] | None) -> Callable:
+    # a result rejected by retry_on_result is a failed outcome holding a RetryResultError, which is never raised
+    def result_outcome(index: int, result: Any) -> tuple[int, bool, Any]:
+        if retry_on_result is not None and retry_on_result(result):
+            return index, False, RetryResultError(result)
+        return index, True, result
+
+    return result_outcome
+
+
+class _Chunk:
+    """Book keeping for one chunk of items while it goes through its rounds of attempts, with the retries of each item in a RetryCall"""
+
+    def __init__(
+        self, items: list, policy: RetryPolicy, add_retry_config: bool, name: str
+    ):
+        self.items = items
+        self.policy = policy
+        self.name = name
+        self.results = [None] * len(items)
+        self.calls: list[RetryCall | None] = [None] * len(items)
+        self.pending = list(range(len(items)))
+        self.attempt = 1
+        self.add_retry_config = add_retry_config
+
+        if add_retry_config:
+            self.calls = [RetryCall(policy, name) for _ in items]
+
+    def get_call(self, index: int) -> RetryCall:
+        call = self.calls[index]
+        if call is None:
+            call = self.calls[index] = RetryCall(
+                self.policy, self.name, attempt=self.attempt
+            )
+        return call
+
+    def args(self, index: int) -> tuple[int, tuple, dict]:
+        """Returns the index, args and kwargs for the next attempt of an item"""
+        if self.add_retry_config:
+            return (
+                index,
+                (self.items[index],),
+                {"retry_config": self.calls[index].get_retry_config()},
+            )
+        return index, (self.items[index],), {}
+
+    def record(
+        self, outcomes: list[tuple[int, bool, Any]]
+    ) -> tuple[list[tuple[int, BaseException]], list[tuple[int, BaseException]]]:
+        """Stores the results of a round and sorts the failures
+
+        :return: The items that failed for good and the items to retry, as (index, exception)
+        """
+        final, retries = [], []
+
+        for index, ok, value in outcomes:
+            if ok:
+                self.results[index] = value
+                for callback in self.policy.success_callbacks:
+                    callback()
+                continue
+
+            # an open circuit stops the whole map like it stops the decorator
+            if isinstance(value, CircuitOpenError):
+                raise value
+
+            action = self.get_call(index).classify(value, 0)
+
+            # exceptions that are not retried or failed on give None, like the decorator returns None
+            if action is IGNORE:
+                continue
+
+            if action is FAIL:
+                final.append((index, value))
+            else:
+                retries.append((index, value))
+
+        return final, retries
+
+    def next_round(
+        self, retries: list[tuple[int, BaseException]], delay_time: Any
+    ) -> tuple[list[tuple[int, BaseException]], float]:
+        """Moves the retried items on to their next attempt, all with the same delay
+
+        :return: The items that can not be retried after all, as (index, exception), and the seconds to sleep
+        """
+        final = []
+        self.pending = []
+        sleep_seconds = get_sleep_seconds(delay_time)
+
+        for index, e in retries:
+            action, _ = self.calls[index].retry(e, delay_time)
+            if action is RETRY:
+                self.pending.append(index)
+            else:
+                final.append((index, e))
+
+        self.attempt += 1
+        return final, sleep_seconds
+
+    def give_up(self, final: list[tuple[int, BaseException]]) -> None:
+        """Calls the exception handler for the items that failed for good, see RetryCall.give_up"""
+        for index, e in final:
+            self.results[index] = self.calls[index].give_up(e)
+
+    async def give_up_async(self, final: list[tuple[int, BaseException]]) -> None:
+        for index, e in final:
+            self.results[index] = await self.calls[index].give_up_async(e)
+
+    def cancelled(self) -> list[tuple[int, BaseException]]:
+        """The items waiting for a retry that was cancelled, with the exception to give up with"""
+        return [
+            (index, self.calls[index].cancelled_error(self.calls[index].error))
+            for index in self.pending
+        ]
+
+
+def _retry_map(
+    func: Callable,
+    iterable: Iterable,
+    policy: RetryPolicy,
+    add_retry_config: bool,
+    max_workers: int,
+    chunk_size: int,
+) -> Iterator:
+    circuit_breaker = policy.circuit_breaker
+    result_outcome = _result_outcome(policy.retry_on_result)
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    def call(index: int, args: tuple, kwargs: dict) -> tuple[int, bool, Any]:
+        try:
+            if circuit_breaker is not None and not circuit_breaker.allow_request():
+                raise CircuitOpenError(circuit_breaker)
+            result = func(*args, **kwargs)
+        # exceptions that are not an Exception, like KeyboardInterrupt, are not caught and stop the map
+        except Exception as e:
+            return index, False, e
+        return result_outcome(index, result)
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="yet-another-retry-map"
+    ) as executor:
+
+        for items in _chunks(iterable, chunk_size):
+            chunk = _Chunk(items, policy, add_retry_config, name)
+
+            while chunk.pending:
+                futures = [
+                    executor.submit(call, *chunk.args(index)) for index in chunk.pending
+                ]
+                outcomes = [future.result() for future in futures]
+
+                final, retries = chunk.record(outcomes)
+                chunk.give_up(final)
+
+                if not retries:
+                    break
+
+                # one delay for the whole round, decided from the first failure
+                index, e = retries[0]
+                delay_time = policy.invoke_retry_handler(
+                    e, chunk.calls[index].retry_config
+                )
+                final, sleep_seconds = chunk.next_round(retries, delay_time)
+                chunk.give_up(final)
+
+                # a cancelled sleep ends the retries of all items in the round
+                if chunk.pending and policy.sleep(sleep_seconds):
+                    chunk.give_up(chunk.cancelled())
+                    break
+
+            yield from chunk.results
+
+
+async def _async_retry_map(
+    func: Callable,
+    iterable: Iterable,
+    policy: RetryPolicy,
+    add_retry_config: bool,
+    max_workers: int,
+    chunk_size: int,
+) -> AsyncIterator:
+    circuit_breaker = policy.circuit_breaker
+    result_outcome = _result_outcome(policy.retry_on_result)
+    name = f"{func.__module__}.{func.__qualname__}"
+    semaphore = asyncio.Semaphore(max_workers) if max_workers else None
+
+    async def call(index: int, args: tuple, kwargs: dict) -> tuple[int, bool, Any]:
+        try:
+            if circuit_breaker is not None and not circuit_breaker.allow_request():
+                raise CircuitOpenError(circuit_breaker)
+            if semaphore is None:
+                result = await func(*args, **kwargs)
+            else:
+                async with semaphore:
+                    result = await func(*args, **kwargs)
+        # exceptions that are not an Exception, like asyncio.CancelledError, are not caught and stop the map
+        except Exception as e:
+            return index, False, e
+        return result_outcome(index, result)
+
+    for items in _chunks(iterable, chunk_size):
+        chunk = _Chunk(items, policy, add_retry_config, name)
+
+        while chunk.pending:
+            outcomes = await asyncio.gather(
+                *(call(*chunk.args(index)) for index in chunk.pending)
+            )
+
+            final, retries = chunk.record(outcomes)
+            await chunk.give_up_async(final)
+
+            if not retries:
+                break
+
+            index, e = retries[0]
+            delay_time = policy.invoke_retry_handler(e, chunk.calls[index].retry_config)
+            if inspect.isawaitable(delay_time):
+                delay_time = await delay_time
+            final, sleep_seconds = chunk.next_round(retries, delay_time)
+            await chunk.give_up_async(final)
+
+            if chunk.pending and await policy.async_sleep(sleep_seconds):
+                await chunk.give_up_async(chunk.cancelled())
+                break
+
+        for result in chunk.results:
+            yield result
@@ -0,0 +1,183 @@
+import asyncio
+import threading
+from collections import deque
+
+
+class _Waiter:
+    """A call waiting for a slot, woken by release() when the slot is handed to it"""
+
+    __slots__ = ("event", "loop", "future", "granted")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop = None):
+        self.granted = False
+        self.loop = loop
+        if loop is None:
+            self.event = threading.Event()
+            self.future = None
+        else:
+            self.event = None
+            self.future = loop.create_future()
+
+    def wake(self) -> None:
+        if self.event is not None:
+            self.event.set()
+        else:
+            # release() can be called from any thread
+            self.loop.call_soon_threadsafe(_set_result, self.future)
+
+
+def _set_result(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class RetryBulkhead:
+    """Limits how many calls can be retrying at the same time, so calls sleeping between tries do not take up every thread or connection.
+
+    A call takes a slot when its first retry is about to be made and keeps it until it returns or raises, calls that succeed on the first attempt never need one.
+    When all slots are taken a call waits for one if fewer than ``max_waiting`` calls are already waiting, otherwise, or when ``wait_timeout`` runs out, the retry is not made and the exception goes straight to the exception handler, like with a spent RetryBudget.
+
+    One bulkhead can be shared by any number of decorated functions, regular and async, to limit them together. Threads and tasks wait in one queue and get slots in the order they started waiting.
+
+    :param max_concurrent_retries: Number of calls that can be retrying at the same time
+    :type max_concurrent_retries: int
+
+    :param max_waiting: Number of calls that can wait for a slot. Defaults to 0, fail fast when all slots are taken
+    :type max_waiting: int
+
+    :param wait_timeout: Max seconds to wait for a slot. If None, wait until one is free. Defaults to None
+    :type wait_timeout: float, optional
+    """
+
+    def __init__(
+        self,
+        max_concurrent_retries: int,
+        max_waiting: int = 0,
+        wait_timeout: float = None,
+    ):
+        if max_concurrent_retries < 1:
+            raise ValueError("max_concurrent_retries must be at least 1")
+        if max_waiting < 0:
+            raise ValueError("max_waiting can not be negative")
+
+        self.max_concurrent_retries = max_concurrent_retries
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters: deque[_Waiter] = deque()
+        self._rejected = 0
+
+    @property
+    def active(self) -> int:
+        """Number of calls holding a slot"""
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        """Number of calls waiting for a slot"""
+        return len(self._waiters)
+
+    @property
+    def rejected(self) -> int:
+        """Number of retries that were not made because no slot was free"""
+        return self._rejected
+
+    def _try_enter(self, waiter: _Waiter = None) -> bool | None:
+        # must be called with the lock held. True if a slot was taken, False if rejected, None if the waiter was queued
+        if self._active < self.max_concurrent_retries and not self._waiters:
+            self._active += 1
+            return True
+
+        if waiter is None or len(self._waiters) >= self.max_waiting:
+            self._rejected += 1
+            return False
+
+        self._waiters.append(waiter)
+        return None
+
+    def try_acquire(self) -> bool:
+        """Takes a slot if one is free, without waiting
+
+        :return: True if a slot was taken
+        :rtype: bool
+        """
+        with self._lock:
+            return self._try_enter() is True
+
+    def acquire(self) -> bool:
+        """Takes a slot, waiting for one if the queue is not full
+
+        :return: True if a slot was taken, False if the queue was full or the wait timed out
+        :rtype: bool
+        """
+        with self._lock:
+            if self.max_waiting == 0:
+                return self._try_enter() is True
+            waiter = _Waiter()
+            entered = self._try_enter(waiter)
+        if entered is not None:
+            return entered
+
+        waiter.event.wait(self.wait_timeout)
+        return self._leave_queue(waiter)
+
+    async def acquire_async(self) -> bool:
+        """Takes a slot, waiting for one without blocking the event loop if the queue is not full
+
+        :return: True if a slot was taken, False if the queue was full or the wait timed out
+        :rtype: bool
+        """
+        with self._lock:
+            if self.max_waiting == 0:
+                return self._try_enter() is True
+            waiter = _Waiter(asyncio.get_running_loop())
+            entered = self._try_enter(waiter)
+        if entered is not None:
+            return entered
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.wait_timeout)
+        except asyncio.TimeoutError:
+            pass
+        except BaseException:
+            # a cancelled task must not keep or lose a slot
+            if self._leave_queue(waiter):
+                self.release()
+            raise
+        return self._leave_queue(waiter)
+
+    def _leave_queue(self, waiter: _Waiter) -> bool:
+        # after waking up or timing out, True if the slot was handed over
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters.remove(waiter)
+            self._rejected += 1
+            return False
+
+    def release(self) -> None:
+        """Gives back a slot, handing it to the call that has waited longest if there is one"""
+        with self._lock:
+            if self._waiters:
+                # the slot is not freed, it goes straight to the waiter
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+            else:
+                self._active -= 1
+                return
+        waiter.wake()
+
+    def __getstate__(self) -> dict:
+        # a pickled bulkhead is a copy without calls holding or waiting for slots
+        return {
+            "max_concurrent_retries": self.max_concurrent_retries,
+            "max_waiting": self.max_waiting,
+            "wait_timeout": self.wait_timeout,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(max_concurrent_retries={self.max_concurrent_retries}, max_waiting={self.max_waiting}, active={self.active}, waiting={self.waiting}, rejected={self.rejected})"
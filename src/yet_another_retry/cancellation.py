@@ -0,0 +1,116 @@
+import asyncio
+import threading
+
+# how often an async sleep checks a threading.Event it can not be woken up by
+EVENT_POLL_INTERVAL = 0.1
+
+
+class CancellationToken:
+    """Token that cuts the sleep between tries short when cancelled.
+
+    Decorators given the token wait on it instead of sleeping. Calling cancel() wakes every call that is sleeping between tries, in any thread or event loop, and sends it to the exception handler with a RetryCancelledError.
+    Decorators without a token of their own use ``shutdown_token``, see cancel_all_retries().
+
+    :param event: An existing threading.Event to use. Setting the event directly works for threads, async sleeps then check it every EVENT_POLL_INTERVAL seconds. Call cancel() to wake everything at once. Defaults to a new Event
+    :type event: threading.Event, optional
+    """
+
+    def __init__(self, event: threading.Event = None):
+        self._external_event = event is not None
+        self._event = event if event is not None else threading.Event()
+        self._lock = threading.Lock()
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = set()
+
+    @property
+    def cancelled(self) -> bool:
+        """True once the token is cancelled"""
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Cancels the token, waking all sleeping calls"""
+        self._event.set()
+
+        with self._lock:
+            waiters, self._waiters = self._waiters, set()
+
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                # the event loop is already closed
+                pass
+
+    def reset(self) -> None:
+        """Makes the token usable again after a cancel"""
+        self._event.clear()
+
+    def wait(self, timeout: float) -> bool:
+        """Blocks the thread until the token is cancelled or the timeout has passed
+
+        :param timeout: Max number of seconds to wait
+        :type timeout: float
+
+        :return: True if the token is cancelled
+        :rtype: bool
+        """
+        return self._event.wait(timeout)
+
+    async def wait_async(self, timeout: float) -> bool:
+        """Suspends the task until the token is cancelled or the timeout has passed
+
+        :param timeout: Max number of seconds to wait
+        :type timeout: float
+
+        :return: True if the token is cancelled
+        :rtype: bool
+        """
+        if self._event.is_set():
+            return True
+
+        loop = asyncio.get_running_loop()
+
+        if self._external_event:
+            deadline = loop.time() + timeout
+            while not self._event.is_set():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                await asyncio.sleep(min(remaining, EVENT_POLL_INTERVAL))
+            return True
+
+        future = loop.create_future()
+        waiter = (loop, future)
+        with self._lock:
+            self._waiters.add(waiter)
+
+        try:
+            # checked again after registering so a cancel in between is not missed
+            if self._event.is_set():
+                return True
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return self._event.is_set()
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(cancelled={self.cancelled})"
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+# used by all decorators that were not given a cancel_token
+shutdown_token = CancellationToken()
+
+
+def cancel_all_retries() -> None:
+    """Wakes every call sleeping between tries in decorators without their own cancel_token, e.g. on shutdown.
+
+    Until shutdown_token.reset() is called, any failed attempt in those decorators goes straight to the exception handler with a RetryCancelledError instead of being retried.
+    """
+    shutdown_token.cancel()
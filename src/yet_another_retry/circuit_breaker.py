@@ -0,0 +1,202 @@
+import threading
+from collections import deque
+from datetime import timedelta
+from typing import Callable
+
+from yet_another_retry.clock import get_default_clock
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Circuit breaker that stops attempts from being made while a dependency is failing.
+
+    The breaker keeps the outcome of the last ``window_size`` attempts. When at least ``minimum_calls`` are recorded and the share of failures reaches ``failure_rate_threshold`` the circuit opens.
+    While open every attempt is refused, the retry decorator then raises CircuitOpenError without calling the function.
+    After ``cooldown`` the circuit is half-open and lets ``half_open_max_calls`` trial attempts through. A successful trial closes the circuit, a failed one opens it again.
+
+    A breaker can be shared between decorated functions that use the same dependency.
+
+    :param failure_rate_threshold: Share of failed attempts, between 0 and 1, that opens the circuit. Defaults to 0.5
+    :type failure_rate_threshold: float
+
+    :param window_size: Number of most recent attempts the failure rate is calculated over. Defaults to 20
+    :type window_size: int
+
+    :param minimum_calls: Minimum number of attempts in the window before the circuit can open. Defaults to 10
+    :type minimum_calls: int
+
+    :param cooldown: Time the circuit stays open before allowing trial attempts. If int or float, it is treated as seconds. Defaults to 30
+    :type cooldown: int | float | timedelta
+
+    :param half_open_max_calls: Number of concurrent trial attempts allowed while half-open. Defaults to 1
+    :type half_open_max_calls: int
+
+    :param failure_exceptions: Exceptions that count as failures, any other Exception counts as a success as the dependency did respond. Defaults to Exception
+    :type failure_exceptions: Exception | tuple[Exception]
+
+    :param clock: Function returning the current time in seconds, used for the cooldown. If None the default clock is used, see yet_another_retry.clock. Defaults to None
+    :type clock: Callable[[], float], optional
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        cooldown: int | float | timedelta = 30,
+        half_open_max_calls: int = 1,
+        failure_exceptions: Exception | tuple[Exception] = Exception,
+        clock: Callable[[], float] = None,
+    ):
+        if not 0 < failure_rate_threshold <= 1:
+            raise ValueError("failure_rate_threshold must be above 0 and at most 1")
+        if window_size < 1 or minimum_calls < 1 or half_open_max_calls < 1:
+            raise ValueError(
+                "window_size, minimum_calls and half_open_max_calls must be at least 1"
+            )
+
+        if isinstance(cooldown, timedelta):
+            cooldown = cooldown.total_seconds()
+
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_size = window_size
+        self.minimum_calls = min(minimum_calls, window_size)
+        self.cooldown = cooldown
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_exceptions = failure_exceptions
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._window = deque(maxlen=window_size)
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+
+    @property
+    def state(self) -> str:
+        """The current state, "closed", "open" or "half_open" """
+        with self._lock:
+            self._check_cooldown()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Decides if an attempt can be made right now
+
+        While half-open, an allowed attempt takes one of the trial slots until its outcome is recorded.
+
+        :return: True if the attempt can be made
+        :rtype: bool
+        """
+
+        # reading the state without the lock is fine, a closed circuit always allows requests
+        if self._state is CLOSED:
+            return True
+
+        with self._lock:
+            self._check_cooldown()
+
+            if self._state is CLOSED:
+                return True
+
+            if self._state is HALF_OPEN and (
+                self._half_open_calls < self.half_open_max_calls
+            ):
+                self._half_open_calls += 1
+                return True
+
+            return False
+
+    def record_success(self) -> None:
+        """Records a successful attempt"""
+        with self._lock:
+            if self._state is HALF_OPEN:
+                self._close()
+            elif self._state is CLOSED:
+                self._record(False)
+
+    def record_exception(self, e: BaseException) -> None:
+        """Records an attempt that raised an exception
+
+        An exception that is not a failure counts as a success. A BaseException that is not an Exception, like a cancellation or KeyboardInterrupt,
+        says nothing about the dependency, it is not recorded and only frees the trial slot the attempt took while half-open.
+
+        :param e: The exception raised by the attempt
+        :type e: BaseException
+        """
+        if not isinstance(e, self.failure_exceptions):
+            if isinstance(e, Exception):
+                self.record_success()
+                return
+
+            with self._lock:
+                if self._state is HALF_OPEN and self._half_open_calls > 0:
+                    self._half_open_calls -= 1
+            return
+
+        with self._lock:
+            if self._state is HALF_OPEN:
+                self._open()
+            elif self._state is CLOSED:
+                self._record(True)
+
+                calls_in_window = len(self._window)
+                if (
+                    calls_in_window >= self.minimum_calls
+                    and self._failures / calls_in_window >= self.failure_rate_threshold
+                ):
+                    self._open()
+
+    def reset(self) -> None:
+        """Closes the circuit and forgets all recorded attempts"""
+        with self._lock:
+            self._close()
+
+    def _record(self, failed: bool) -> None:
+        if len(self._window) == self._window.maxlen and self._window[0]:
+            self._failures -= 1
+        self._window.append(failed)
+        if failed:
+            self._failures += 1
+
+    def _check_cooldown(self) -> None:
+        if self._state is OPEN and self._now() - self._opened_at >= self.cooldown:
+            self._state = HALF_OPEN
+            self._half_open_calls = 0
+
+    def _now(self) -> float:
+        if self.clock is not None:
+            return self.clock()
+        return get_default_clock().now()
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._now()
+        self._half_open_calls = 0
+
+    def _close(self) -> None:
+        self._state = CLOSED
+        self._window.clear()
+        self._failures = 0
+        self._half_open_calls = 0
+
+    def __getstate__(self) -> dict:
+        # a pickled breaker is a copy of the settings, it starts closed and is not shared with the original
+        return {
+            "failure_rate_threshold": self.failure_rate_threshold,
+            "window_size": self.window_size,
+            "minimum_calls": self.minimum_calls,
+            "cooldown": self.cooldown,
+            "half_open_max_calls": self.half_open_max_calls,
+            "failure_exceptions": self.failure_exceptions,
+            "clock": self.clock,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(state={self.state!r}, failure_rate_threshold={self.failure_rate_threshold}, window_size={self.window_size})"
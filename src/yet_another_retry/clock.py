@@ -0,0 +1,58 @@
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from yet_another_retry.cancellation import CancellationToken
+
+
+class SystemClock:
+    """The clock used by default: time.monotonic() for the current time, time.sleep() and asyncio.sleep() for sleeping."""
+
+    def now(self) -> float:
+        """Returns the current time in seconds"""
+        return time.monotonic()
+
+    def sleep(self, seconds: float, cancel_token: "CancellationToken" = None) -> None:
+        """Blocks the current thread for a number of seconds, or until the cancel_token is cancelled"""
+        if cancel_token is None:
+            time.sleep(seconds)
+        else:
+            cancel_token.wait(seconds)
+
+    async def async_sleep(
+        self, seconds: float, cancel_token: "CancellationToken" = None
+    ) -> None:
+        """Suspends the current task for a number of seconds, or until the cancel_token is cancelled"""
+        if cancel_token is None:
+            await asyncio.sleep(seconds)
+        else:
+            await cancel_token.wait_async(seconds)
+
+
+_default_clock = SystemClock()
+
+
+def get_default_clock() -> SystemClock:
+    """Returns the clock used by decorators and circuit breakers that were not given a clock or sleeper
+
+    :return: The default clock
+    :rtype: SystemClock
+    """
+    return _default_clock
+
+
+def set_default_clock(clock: SystemClock) -> SystemClock:
+    """Replaces the default clock, mostly for tests. See yet_another_retry.testing.VirtualClock
+
+    Any object with now(), sleep(seconds, cancel_token=None) and async_sleep(seconds, cancel_token=None) methods can be used.
+
+    :param clock: The new default clock
+    :type clock: SystemClock
+
+    :return: The previous default clock
+    :rtype: SystemClock
+    """
+    global _default_clock
+    previous, _default_clock = _default_clock, clock
+    return previous
@@ -0,0 +1,41 @@
+class CircuitOpenError(Exception):
+    """Raised instead of calling the decorated function when its circuit breaker is open.
+
+    :param circuit_breaker: The circuit breaker that refused the attempt
+    :type circuit_breaker: CircuitBreaker
+    """
+
+    def __init__(self, circuit_breaker):
+        self.circuit_breaker = circuit_breaker
+        super().__init__(
+            f"Circuit breaker is {circuit_breaker.state}, the attempt was not made"
+        )
+
+
+class RetryCancelledError(Exception):
+    """Passed to the exception handler, and raised, when the sleep before a retry was cut short by a CancellationToken.
+
+    The exception of the last attempt is available as __cause__.
+
+    :param attempt: The last attempt that was made
+    :type attempt: int
+    """
+
+    def __init__(self, attempt: int):
+        self.attempt = attempt
+        super().__init__(f"Retrying was cancelled after attempt {attempt}")
+
+
+class RetryResultError(Exception):
+    """Stands in for an exception when retry_on_result rejects the result of an attempt.
+
+    It is passed to the handlers and hooks like a raised exception but it is only created, never raised during the retries, so it has no traceback.
+    When the tries are used up it is passed to the exception handler, the default exception handler raises it.
+
+    :param result: The rejected result
+    :type result: Any
+    """
+
+    def __init__(self, result):
+        self.result = result
+        super().__init__(f"Result was rejected by retry_on_result: {result!r}")
@@ -0,0 +1,242 @@
+import threading
+from bisect import bisect_left
+from typing import Any, Iterable
+
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 60)
+
+
+class RetryHooks:
+    """Base class for instrumenting the retry decorator.
+
+    Subclass it and override the methods of the events you are interested in, the default methods do nothing.
+    ``name`` is always the module and qualified name of the decorated function.
+    Hooks are called in the thread, or event loop, running the decorated function so they should be fast and thread-safe.
+    """
+
+    def on_attempt_start(self, name: str, attempt: int) -> None:
+        """Called right before an attempt
+
+        :param name: Name of the decorated function
+        :type name: str
+
+        :param attempt: The attempt number, first attempt is 1
+        :type attempt: int
+        """
+
+    def on_attempt_end(
+        self, name: str, attempt: int, duration: float, e: BaseException | None
+    ) -> None:
+        """Called right after an attempt
+
+        :param name: Name of the decorated function
+        :type name: str
+
+        :param attempt: The attempt number
+        :type attempt: int
+
+        :param duration: Seconds the attempt took
+        :type duration: float
+
+        :param e: The exception raised by the attempt, None if it succeeded
+        :type e: BaseException | None
+        """
+
+    def on_retry(self, name: str, attempt: int, delay: float, e: BaseException) -> None:
+        """Called when a failed attempt will be retried, before sleeping
+
+        :param name: Name of the decorated function
+        :type name: str
+
+        :param attempt: The attempt that failed
+        :type attempt: int
+
+        :param delay: Seconds that will be slept before the next attempt
+        :type delay: float
+
+        :param e: The exception raised by the attempt
+        :type e: BaseException
+        """
+
+    def on_give_up(
+        self, name: str, attempt: int, e: BaseException, total_sleep: float
+    ) -> None:
+        """Called when the decorator stops retrying and calls the exception handler
+
+        :param name: Name of the decorated function
+        :type name: str
+
+        :param attempt: The last attempt
+        :type attempt: int
+
+        :param e: The final exception
+        :type e: BaseException
+
+        :param total_sleep: Seconds slept between all attempts of the call
+        :type total_sleep: float
+        """
+
+    def on_success(self, name: str, attempt: int, total_sleep: float) -> None:
+        """Called when a call succeeds
+
+        :param name: Name of the decorated function
+        :type name: str
+
+        :param attempt: The attempt that succeeded, 1 if no retries were needed
+        :type attempt: int
+
+        :param total_sleep: Seconds slept between all attempts of the call
+        :type total_sleep: float
+        """
+
+
+class MultiHooks(RetryHooks):
+    """Forwards every event to several hooks, in order
+
+    :param hooks: The hooks to call
+    :type hooks: Iterable[RetryHooks]
+    """
+
+    def __init__(self, hooks: Iterable[RetryHooks]):
+        self.hooks = tuple(hooks)
+
+    def on_attempt_start(self, name, attempt):
+        for hooks in self.hooks:
+            hooks.on_attempt_start(name, attempt)
+
+    def on_attempt_end(self, name, attempt, duration, e):
+        for hooks in self.hooks:
+            hooks.on_attempt_end(name, attempt, duration, e)
+
+    def on_retry(self, name, attempt, delay, e):
+        for hooks in self.hooks:
+            hooks.on_retry(name, attempt, delay, e)
+
+    def on_give_up(self, name, attempt, e, total_sleep):
+        for hooks in self.hooks:
+            hooks.on_give_up(name, attempt, e, total_sleep)
+
+    def on_success(self, name, attempt, total_sleep):
+        for hooks in self.hooks:
+            hooks.on_success(name, attempt, total_sleep)
+
+
+class _FunctionStats:
+    """Counters for one decorated function"""
+
+    def __init__(self, latency_buckets: tuple[float, ...]):
+        self.calls = 0
+        self.successes = 0
+        self.successes_after_retry = 0
+        self.give_ups = 0
+        self.attempts = 0
+        self.failed_attempts = 0
+        self.retries = 0
+        self.total_sleep = 0.0
+        self.exceptions: dict[str, int] = {}
+        self.attempts_histogram: dict[int, int] = {}
+        self.latency_buckets = latency_buckets
+        self.latency_histogram = [0] * (len(latency_buckets) + 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "successes_after_retry": self.successes_after_retry,
+            "give_ups": self.give_ups,
+            "attempts": self.attempts,
+            "failed_attempts": self.failed_attempts,
+            "retries": self.retries,
+            "total_sleep": self.total_sleep,
+            "exceptions": dict(self.exceptions),
+            "attempts_histogram": dict(sorted(self.attempts_histogram.items())),
+            "latency_histogram": {
+                **{
+                    f"le_{bucket}": count
+                    for bucket, count in zip(
+                        self.latency_buckets, self.latency_histogram
+                    )
+                },
+                "le_inf": self.latency_histogram[-1],
+            },
+        }
+
+
+class RetryStats(RetryHooks):
+    """Thread-safe in-memory aggregation of retry events, per decorated function.
+
+    Keeps counters of calls, attempts, retries, give ups and sleep time, which exceptions caused failed attempts, a histogram of how many attempts calls needed and a histogram of attempt latency.
+
+    :param latency_buckets: Upper bounds, in seconds, of the attempt latency histogram buckets. Defaults to DEFAULT_LATENCY_BUCKETS
+    :type latency_buckets: Iterable[float]
+    """
+
+    def __init__(self, latency_buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS):
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self._lock = threading.Lock()
+        self._stats: dict[str, _FunctionStats] = {}
+
+    def _get(self, name: str) -> _FunctionStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = _FunctionStats(self.latency_buckets)
+        return stats
+
+    def on_attempt_end(self, name, attempt, duration, e):
+        bucket = bisect_left(self.latency_buckets, duration)
+        with self._lock:
+            stats = self._get(name)
+            stats.attempts += 1
+            stats.latency_histogram[bucket] += 1
+            if e is not None:
+                stats.failed_attempts += 1
+                exception_name = type(e).__name__
+                stats.exceptions[exception_name] = (
+                    stats.exceptions.get(exception_name, 0) + 1
+                )
+
+    def on_retry(self, name, attempt, delay, e):
+        with self._lock:
+            self._get(name).retries += 1
+
+    def on_give_up(self, name, attempt, e, total_sleep):
+        with self._lock:
+            stats = self._get(name)
+            stats.calls += 1
+            stats.give_ups += 1
+            stats.total_sleep += total_sleep
+            stats.attempts_histogram[attempt] = (
+                stats.attempts_histogram.get(attempt, 0) + 1
+            )
+
+    def on_success(self, name, attempt, total_sleep):
+        with self._lock:
+            stats = self._get(name)
+            stats.calls += 1
+            stats.successes += 1
+            stats.total_sleep += total_sleep
+            if attempt > 1:
+                stats.successes_after_retry += 1
+            stats.attempts_histogram[attempt] = (
+                stats.attempts_histogram.get(attempt, 0) + 1
+            )
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Returns a copy of all counters
+
+        :return: dict with the name of each decorated function as key and its counters as value
+        :rtype: dict[str, dict[str, Any]]
+        """
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    def reset(self) -> None:
+        """Removes all counters"""
+        with self._lock:
+            self._stats.clear()
+
+    def __getstate__(self) -> dict:
+        # a pickled RetryStats starts without counters, e.g. in a worker process
+        return {"latency_buckets": self.latency_buckets}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
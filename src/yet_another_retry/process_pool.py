@@ -0,0 +1,84 @@
+import asyncio
+import inspect
+from concurrent.futures import Executor, Future
+from typing import Any, Callable
+
+from yet_another_retry.api import retry
+
+
+class RetryingFunction:
+    """Picklable pairing of a function and retry parameters, calling it calls the function with retries.
+
+    Use it for functions that can not be decorated where they are defined, e.g. functions from other packages.
+    Only the function and the parameters are pickled, the decorator is created again the first time it is called in a new process,
+    so the function, handlers and any RetryBudget, CircuitBreaker or hooks must be picklable and are copies in the worker.
+
+    :param func: The function to retry, picklable by reference
+    :type func: Callable
+
+    :param **retry_kwargs: Parameters for the retry decorator
+    :type **retry_kwargs: Any
+    """
+
+    def __init__(self, func: Callable, **retry_kwargs):
+        self.func = func
+        self.retry_kwargs = retry_kwargs
+        self._wrapper = None
+
+    @property
+    def decorated(self) -> Callable:
+        """The function decorated with the retry parameters, created on first use"""
+        if self._wrapper is None:
+            self._wrapper = retry(**self.retry_kwargs)(self.func)
+        return self._wrapper
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.decorated(*args, **kwargs)
+
+    def __getstate__(self) -> dict:
+        return {"func": self.func, "retry_kwargs": self.retry_kwargs}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["func"], **state["retry_kwargs"])
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.func!r}, **{self.retry_kwargs!r})"
+
+
+def submit_retry(executor: Executor, func: Callable, /, *args, **kwargs) -> Future:
+    """Submits a retrying function to an executor, typically a ProcessPoolExecutor, so all tries and the sleeps between them run in the worker.
+
+    func is either a function decorated with retry at module level, which is pickled by reference, or a RetryingFunction.
+    Coroutine functions are run with asyncio.run() in the worker.
+
+    :param executor: The executor to submit to
+    :type executor: Executor
+
+    :param func: The decorated function or RetryingFunction
+    :type func: Callable
+
+    :param *args: Positional arguments for func
+
+    :param **kwargs: Keyword arguments for func
+
+    :raises TypeError: If func is not decorated with retry or a RetryingFunction
+
+    :return: Future with the result of the last try
+    :rtype: Future
+    """
+
+    if getattr(func, "retry_policy", None) is None and not isinstance(
+        func, RetryingFunction
+    ):
+        raise TypeError(
+            f"{func!r} is not decorated with retry, decorate it or wrap it in a RetryingFunction"
+        )
+
+    return executor.submit(_call_in_worker, func, args, kwargs)
+
+
+def _call_in_worker(func: Callable, args: tuple, kwargs: dict) -> Any:
+    result = func(*args, **kwargs)
+    if inspect.iscoroutine(result):
+        return asyncio.run(result)
+    return result
@@ -0,0 +1,100 @@
+import itertools
+import threading
+
+
+class RetryBudget:
+    """Token bucket limiting how many retries can be made, refilled by successful calls.
+
+    One budget can be shared by any number of decorated functions, sync or async, to stop a failing dependency from multiplying load by ``tries``.
+    Every retry takes one token from the bucket and every successful call puts ``retry_ratio`` tokens back, up to ``max_tokens``.
+    When the bucket is empty retryable exceptions are sent straight to the exception handler instead of being retried.
+
+    With the defaults, once the initial tokens are spent, at most 1 retry is allowed for every 10 successful calls.
+
+    :param retry_ratio: Number of tokens added for each successful call. Defaults to 0.1
+    :type retry_ratio: float
+
+    :param max_tokens: The maximum number of tokens in the bucket. Defaults to 10
+    :type max_tokens: float
+
+    :param initial_tokens: Number of tokens in the bucket when created. If None it starts full. Defaults to None
+    :type initial_tokens: float, optional
+    """
+
+    def __init__(
+        self,
+        retry_ratio: float = 0.1,
+        max_tokens: float = 10,
+        initial_tokens: float = None,
+    ):
+        if retry_ratio < 0:
+            raise ValueError("retry_ratio can not be negative")
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1")
+
+        self.retry_ratio = retry_ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens if initial_tokens is None else initial_tokens
+        self._suppressed = 0
+        self._lock = threading.Lock()
+
+        # successes are only counted, next() on itertools.count is atomic so the success path needs no lock.
+        # the count is turned into tokens the next time the bucket is read.
+        self._successes = itertools.count()
+        self._settled_successes = 0
+
+    def record_success(self) -> None:
+        """Records a successful call, refilling the bucket with retry_ratio tokens."""
+        next(self._successes)
+
+    def try_acquire(self) -> bool:
+        """Takes a token for a retry if there is one
+
+        :return: True if the retry is allowed, False if the budget is spent
+        :rtype: bool
+        """
+        with self._lock:
+            self._settle()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+
+            self._suppressed += 1
+            return False
+
+    @property
+    def tokens(self) -> float:
+        """Number of tokens currently in the bucket"""
+        with self._lock:
+            self._settle()
+            return self._tokens
+
+    @property
+    def suppressed(self) -> int:
+        """Number of retries that were not made because the budget was spent"""
+        return self._suppressed
+
+    def _settle(self) -> None:
+        # reading the counter also increases it by one, which is not a success
+        count = next(self._successes)
+        successes = count - self._settled_successes
+        self._settled_successes = count + 1
+
+        if successes:
+            self._tokens = min(
+                self.max_tokens, self._tokens + successes * self.retry_ratio
+            )
+
+    def __getstate__(self) -> dict:
+        # a pickled budget is a copy, it is not shared with the original
+        return {
+            "retry_ratio": self.retry_ratio,
+            "max_tokens": self.max_tokens,
+            "initial_tokens": self.tokens,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(retry_ratio={self.retry_ratio}, max_tokens={self.max_tokens}, tokens={self.tokens}, suppressed={self.suppressed})"
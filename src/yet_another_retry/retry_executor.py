@@ -0,0 +1,323 @@
+import heapq
+import inspect
+import itertools
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_for_futures
+from typing import Any, Callable
+
+from yet_another_retry.exceptions import RetryResultError
+from yet_another_retry.process_pool import RetryingFunction
+from yet_another_retry.utils import (
+    IGNORE,
+    RETRY,
+    RetryCall,
+    RetryPolicy,
+    get_func_meta,
+)
+
+
+class RetryExecutor(Executor):
+    """Executor that runs retrying functions without sleeping in a worker thread between tries.
+
+    Every attempt is a separate task on the underlying executor. When an attempt fails and is retried, the call is put in a timer heap and a single scheduler thread submits the next attempt when the delay has passed,
+    so the worker is free for other work in the meantime and a small pool can hold any number of backing-off calls.
+
+    Functions are submitted like to any executor and a Future with the final result is returned. The retry parameters are taken from the retry decorator of the function, or from a RetryingFunction.
+    All parameters of the decorator are supported except hedge_after, sleeper and coalesce_key, and coroutine functions can not be submitted.
+    A bulkhead does not make calls wait, a call that finds no free slot fails fast. A cancelled cancel token is checked when the delay has passed.
+    A retry handler that gates all attempts, like AdaptiveRateLimit, also delays the first attempt of a call, which waits in the timer heap like a retry.
+
+    :param executor: The executor attempts run on. If None a ThreadPoolExecutor is created, and shut down with the RetryExecutor. Defaults to None
+    :type executor: Executor, optional
+
+    :param max_workers: Max number of threads of the ThreadPoolExecutor created when executor is None. Defaults to None, the ThreadPoolExecutor default
+    :type max_workers: int, optional
+    """
+
+    def __init__(self, executor: Executor = None, max_workers: int = None):
+        self._own_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="yet-another-retry-executor"
+        )
+
+        self._condition = threading.Condition()
+        self._heap: list[tuple[float, int, "_ScheduledCall"]] = []
+        self._sequence = itertools.count()
+        self._calls: set["_ScheduledCall"] = set()
+        self._timer_thread = None
+        self._shutdown = False
+
+    @property
+    def pending(self) -> int:
+        """Number of calls waiting in the timer heap for their next attempt"""
+        return len(self._heap)
+
+    def submit(self, func: Callable, /, *args, **kwargs) -> Future:
+        """Starts a call of a retrying function
+
+        :param func: A function decorated with retry, or a RetryingFunction
+        :type func: Callable
+
+        :param *args: Positional arguments for func
+
+        :param **kwargs: Keyword arguments for func
+
+        :raises TypeError: If func is not decorated with retry or a RetryingFunction, or is a coroutine function
+        :raises RuntimeError: If the executor was shut down
+
+        :return: Future with the result of the call
+        :rtype: Future
+        """
+
+        if isinstance(func, RetryingFunction):
+            func = func.decorated
+
+        policy = getattr(func, "retry_policy", None)
+        if policy is None:
+            raise TypeError(
+                f"{func!r} is not decorated with retry, decorate it or wrap it in a RetryingFunction"
+            )
+
+        # the retry decorator keeps the decorated function as __wrapped__
+        func = func.__wrapped__
+        if inspect.iscoroutinefunction(func):
+            raise TypeError(
+                f"{func.__name__} is a coroutine function, RetryExecutor only runs regular functions"
+            )
+
+        call = _ScheduledCall(self, func, policy, args, kwargs)
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            self._calls.add(call)
+
+        # a retry handler that gates all attempts, like AdaptiveRateLimit, gates the first one too, the call waits for its turn in the timer heap
+        wait_seconds = 0
+        if policy.acquire_attempt is not None:
+            wait_seconds = policy.acquire_attempt()
+        self._schedule(call, wait_seconds)
+        return call.future
+
+    def shutdown(
+        self,
+        wait: bool = True,
+        *,
+        cancel_futures: bool = False,
+        cancel_pending: bool = False,
+    ) -> None:
+        """Stops accepting calls, calls already submitted keep retrying unless cancel_pending is True
+
+        :param wait: Wait until all submitted calls are done. Defaults to True
+        :type wait: bool
+
+        :param cancel_futures: Cancel calls that did not start their first attempt yet, passed on to the underlying executor if it was created by the RetryExecutor. Defaults to False
+        :type cancel_futures: bool
+
+        :param cancel_pending: End calls waiting for a retry right away, their exception handler gets a RetryCancelledError. Calls still waiting for their first attempt are cancelled. Defaults to False
+        :type cancel_pending: bool
+        """
+
+        with self._condition:
+            self._shutdown = True
+            if cancel_pending:
+                pending = [call for _, _, call in self._heap]
+                self._heap.clear()
+            else:
+                pending = []
+            calls = list(self._calls)
+            self._condition.notify()
+
+        for call in pending:
+            # waiting for the turn of its first attempt, nothing was called yet
+            if call.error is None:
+                call.future.cancel()
+                self._done(call)
+            else:
+                call.end(call.cancelled_error(call.error))
+
+        if cancel_futures:
+            for call in calls:
+                call.future.cancel()
+
+        if wait:
+            wait_for_futures([call.future for call in calls])
+
+        if self._own_executor:
+            self.executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def _submit_attempt(self, call: "_ScheduledCall") -> None:
+        try:
+            self.executor.submit(call.run)
+        except BaseException as e:
+            # e.g. the underlying executor was shut down
+            call.finish(exception=e)
+
+    def _schedule(self, call: "_ScheduledCall", delay: float) -> None:
+        if delay <= 0:
+            self._submit_attempt(call)
+            return
+
+        with self._condition:
+            heapq.heappush(
+                self._heap, (time.monotonic() + delay, next(self._sequence), call)
+            )
+            if self._timer_thread is None:
+                self._timer_thread = threading.Thread(
+                    target=self._run_timer,
+                    name="yet-another-retry-executor-timer",
+                    daemon=True,
+                )
+                self._timer_thread.start()
+            # only needed when the new call is due before the one the timer waits for
+            elif self._heap[0][2] is call:
+                self._condition.notify()
+
+    def _run_timer(self) -> None:
+        heap = self._heap
+        while True:
+            with self._condition:
+                while True:
+                    if not heap:
+                        if self._shutdown:
+                            self._timer_thread = None
+                            return
+                        self._condition.wait()
+                        continue
+
+                    timeout = heap[0][0] - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self._condition.wait(timeout)
+
+                now = time.monotonic()
+                due = []
+                while heap and heap[0][0] <= now:
+                    due.append(heapq.heappop(heap)[2])
+
+            for call in due:
+                self._submit_attempt(call)
+
+    def _done(self, call: "_ScheduledCall") -> None:
+        with self._condition:
+            self._calls.discard(call)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(executor={self.executor!r}, calls={len(self._calls)}, pending={self.pending})"
+
+
+class _ScheduledCall(RetryCall):
+    """One call of a retrying function, running one attempt at a time.
+
+    run() makes the same steps as the wrapper of the retry decorator, but instead of sleeping before a retry it puts itself back in the timer heap.
+    """
+
+    # there is no waiting for a slot of the bulkhead, it would take up the worker
+    wait_for_slot = False
+
+    def __init__(
+        self,
+        retry_executor: RetryExecutor,
+        func: Callable,
+        policy: RetryPolicy,
+        args: tuple,
+        kwargs: dict,
+    ):
+        super().__init__(
+            policy, f"{func.__module__}.{func.__qualname__}", policy.get_deadline()
+        )
+        self.retry_executor = retry_executor
+        self.func = func
+        self.args = args
+        self.kwargs = dict(kwargs)
+        self.future = Future()
+
+        func_params, _ = get_func_meta(func)
+        self.add_retry_config = "retry_config" in func_params
+
+    def run(self) -> None:
+        """Makes the next attempt, then finishes the call or schedules the retry"""
+
+        if self.attempt == 1:
+            if not self.future.set_running_or_notify_cancel():
+                self.retry_executor._done(self)
+                return
+
+        # the cancel token is not waited on, it ends the retries once the delay has passed
+        elif self.policy.get_cancel_token().cancelled:
+            self.end(self.cancelled_error(self.error))
+            return
+
+        try:
+            delay = self.make_attempt()
+        except BaseException as e:
+            self.finish(exception=e)
+            return
+
+        if delay is not None:
+            self.retry_executor._schedule(self, delay)
+
+    def make_attempt(self) -> float | None:
+        """Calls the function once
+
+        :return: Seconds to wait before the next attempt, or None if the call is finished
+        :rtype: float | None
+        """
+        self.start_attempt(self.kwargs if self.add_retry_config else None)
+
+        try:
+            result = self.func(*self.args, **self.kwargs)
+
+        except BaseException as attempt_error:
+            e = attempt_error
+
+        else:
+            retry_on_result = self.policy.retry_on_result
+            if retry_on_result is None or not retry_on_result(result):
+                self.succeeded()
+                self.finish(result=result)
+                return None
+
+            e = RetryResultError(result)
+
+        action, delay = self.failed(e, time.perf_counter() - self.started)
+
+        if action is RETRY:
+            return delay
+
+        # exceptions that are not an Exception, like KeyboardInterrupt, are always raised
+        if action is IGNORE:
+            if isinstance(e, Exception):
+                self.finish(result=None)
+                return None
+            raise e
+
+        self.end(e)
+        return None
+
+    def end(self, e: BaseException) -> None:
+        """Gives up with the final exception and finishes the call with the outcome of the exception handler
+
+        :param e: The final exception
+        :type e: BaseException
+        """
+        try:
+            result = self.give_up(e)
+        except BaseException as final_error:
+            self.finish(exception=final_error)
+        else:
+            self.finish(result=result)
+
+    def finish(self, result: Any = None, exception: BaseException = None) -> None:
+        """Sets the outcome of the future and releases what the call holds"""
+        self.release()
+
+        self.retry_executor._done(self)
+
+        if self.future.done():
+            return
+        if exception is not None:
+            self.future.set_exception(exception)
+        else:
+            self.future.set_result(result)
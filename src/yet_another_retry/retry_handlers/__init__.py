@@ -1,6 +1,12 @@
 from yet_another_retry.retry_handlers.default_retry_handler import default_retry_handler
 from yet_another_retry.retry_handlers.sleep_attempt_seconds import sleep_attempt_seconds
 from yet_another_retry.retry_handlers.exponential_backoff import exponential_backoff
+from yet_another_retry.retry_handlers.retry_after import retry_after
+from yet_another_retry.retry_handlers.adaptive_rate_limit import AdaptiveRateLimit
+from yet_another_retry.retry_handlers.full_jitter import full_jitter
+from yet_another_retry.retry_handlers.equal_jitter import equal_jitter
+from yet_another_retry.retry_handlers.decorrelated_jitter import decorrelated_jitter
+from yet_another_retry.retry_handlers.jittered_backoff import JitteredBackoff
 
 
-__all__ = ["default_retry_handler", "sleep_attempt_seconds", "exponential_backoff"]
+__all__ = ["default_retry_handler", "sleep_attempt_seconds", "exponential_backoff", "retry_after", "AdaptiveRateLimit", "full_jitter", "equal_jitter", "decorrelated_jitter", "JitteredBackoff"]
@@ -0,0 +1,154 @@
+import threading
+from typing import Callable
+
+from yet_another_retry.clock import get_default_clock
+
+
+class AdaptiveRateLimit:
+    """Retry handler that adapts a shared send rate to what the backend can take (AIMD).
+
+    One instance is shared by all decorators calling the same backend. It keeps an estimate of how many attempts per second the backend accepts:
+
+    - every throttling exception multiplies the rate by ``decrease_factor``, at most once per ``decrease_cooldown`` seconds so one burst of throttling counts once
+    - every successful call adds ``increase / rate``, which is about ``increase`` attempts per second per second when sending at the rate
+
+    Attempts are gated by a token bucket refilled at the rate. Used as retry handler it returns the time until the next token, so retries are spread out at the rate.
+    The decorator also calls ``acquire()`` before the first attempt of every call and ``record_success()`` after every successful call, so all traffic is gated and not only retries.
+
+    :param throttling_exceptions: Exceptions that mean the backend is throttling. Defaults to Exception
+    :type throttling_exceptions: Exception | tuple[Exception]
+
+    :param initial_rate: Attempts per second to start with. Defaults to 10
+    :type initial_rate: float
+
+    :param min_rate: The rate never goes below this. Defaults to 0.5
+    :type min_rate: float
+
+    :param max_rate: The rate never goes above this. If None there is no upper limit. Defaults to None
+    :type max_rate: float, optional
+
+    :param increase: Attempts per second the rate grows by for a rate worth of successful calls. Defaults to 1
+    :type increase: float
+
+    :param decrease_factor: Multiplier applied to the rate on throttling, between 0 and 1. Defaults to 0.5
+    :type decrease_factor: float
+
+    :param decrease_cooldown: Seconds after a decrease during which further throttling does not decrease the rate again. Defaults to 1
+    :type decrease_cooldown: float
+
+    :param clock: Function returning the current time in seconds. If None the default clock is used, see yet_another_retry.clock. Defaults to None
+    :type clock: Callable[[], float], optional
+    """
+
+    def __init__(
+        self,
+        throttling_exceptions: Exception | tuple[Exception] = Exception,
+        initial_rate: float = 10,
+        min_rate: float = 0.5,
+        max_rate: float = None,
+        increase: float = 1,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 1,
+        clock: Callable[[], float] = None,
+    ):
+        if min_rate <= 0:
+            raise ValueError("min_rate must be above 0")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+
+        self.throttling_exceptions = throttling_exceptions
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._rate = self._clamp(initial_rate)
+        self._tokens = self._capacity()
+        self._updated_at = None
+        self._decreased_at = None
+        self.throttles = 0
+
+    @property
+    def rate(self) -> float:
+        """The current estimate of attempts per second"""
+        return self._rate
+
+    def __call__(self, e: Exception) -> float:
+        """Retry handler, records throttling and returns the seconds until the retry may be made
+
+        :param e: The exception that occurred
+        :type e: Exception
+
+        :return: Number of seconds to sleep
+        :rtype: float
+        """
+        if isinstance(e, self.throttling_exceptions):
+            self.record_throttle()
+        return self.acquire()
+
+    def acquire(self) -> float:
+        """Takes a token for an attempt
+
+        The token is reserved even if the bucket is empty, callers queue up behind each other at the rate.
+
+        :return: Seconds to wait before making the attempt, 0 if a token was available
+        :rtype: float
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self._rate
+
+    def record_success(self) -> None:
+        """Additive increase of the rate after a successful call"""
+        with self._lock:
+            self._refill()
+            self._rate = self._clamp(self._rate + self.increase / self._rate)
+
+    def record_throttle(self) -> None:
+        """Multiplicative decrease of the rate after throttling"""
+        with self._lock:
+            self.throttles += 1
+            now = self._now()
+            if (
+                self._decreased_at is not None
+                and now - self._decreased_at < self.decrease_cooldown
+            ):
+                return
+
+            self._refill()
+            self._rate = self._clamp(self._rate * self.decrease_factor)
+            self._tokens = min(self._tokens, self._capacity())
+            self._decreased_at = now
+
+    def _now(self) -> float:
+        if self.clock is not None:
+            return self.clock()
+        return get_default_clock().now()
+
+    def _capacity(self) -> float:
+        # a burst of at most one second worth of attempts
+        return max(1.0, self._rate)
+
+    def _clamp(self, rate: float) -> float:
+        if self.max_rate is not None and rate > self.max_rate:
+            return self.max_rate
+        return max(self.min_rate, rate)
+
+    def _refill(self) -> None:
+        now = self._now()
+        if self._updated_at is not None:
+            self._tokens = min(
+                self._capacity(), self._tokens + (now - self._updated_at) * self._rate
+            )
+        self._updated_at = now
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(rate={self._rate:.2f}, throttles={self.throttles})"
+        )
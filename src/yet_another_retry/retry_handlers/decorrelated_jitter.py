@@ -0,0 +1,54 @@
+import random
+from datetime import timedelta
+
+
+def decorrelated_jitter(
+    e: Exception,
+    previous_delay: float | int | timedelta,
+    retry_delay: float | int | timedelta = 1,
+    max_delay_seconds: float | int = None,
+    jitter_rng: random.Random = None,
+) -> float:
+    """
+    Retry handler sleeping a random time between retry_delay and three times the previous delay.
+
+    How long to sleep is calculated as::
+
+        min(max_delay_seconds, random between retry_delay and previous_delay x 3)
+
+    The delay grows about exponentially but every call follows its own random path, so retries of clients that failed together drift apart with every try.
+    The first retry uses retry_delay as previous delay.
+
+    :param e: The exception that occurred.
+    :type e: Exception
+
+    :param previous_delay: The delay of the previous retry, is passed from the decorator on each retry.
+    :type previous_delay: int | float | timedelta
+
+    :param retry_delay: The least time to sleep. If int or float, it is treated as seconds. If timedelta, total_seconds() is used. Defaults to 1
+    :type retry_delay: int | float | timedelta
+
+    :param max_delay_seconds: The max seconds to sleep. If None, no upper limit. Defaults to None.
+    :type max_delay_seconds: float or int, optional
+
+    :param jitter_rng: Random number generator to use, e.g. a seeded random.Random(). If None the random module is used. Defaults to None.
+    :type jitter_rng: random.Random, optional
+
+    :returns: Number of seconds to sleep
+    :rtype: float
+    """
+
+    if isinstance(retry_delay, timedelta):
+        retry_delay = retry_delay.total_seconds()
+    if isinstance(previous_delay, timedelta):
+        previous_delay = previous_delay.total_seconds()
+
+    # previous_delay is 0 before the first retry
+    upper = max((previous_delay or retry_delay) * 3, retry_delay)
+
+    sleep_delay = retry_delay + (upper - retry_delay) * (jitter_rng or random).random()
+
+    if max_delay_seconds and sleep_delay > max_delay_seconds:
+        sleep_delay = max_delay_seconds
+
+    return sleep_delay
@@ -0,0 +1,53 @@
+import random
+from datetime import timedelta
+
+
+def equal_jitter(
+    e: Exception,
+    attempt: int,
+    retry_delay: float | int | timedelta = 1,
+    exponential_factor: float | int = 2,
+    max_delay_seconds: float | int = None,
+    jitter_rng: random.Random = None,
+) -> float:
+    """
+    Retry handler sleeping at least half of the exponential backoff delay, plus a random part of the other half.
+
+    How long to sleep is calculated as::
+
+        delay = min(max_delay_seconds, retry_delay x exponential_factor^attempt)
+        delay / 2 + random between 0 and delay / 2
+
+    Unlike full_jitter there is always some backoff, at the cost of spreading retries over half the window.
+
+    :param e: The exception that occurred.
+    :type e: Exception
+
+    :param attempt: Attempt number, is passed from the decorator on each retry.
+    :type attempt: int
+
+    :param retry_delay: Base delay. If int or float, it is treated as seconds. If timedelta, total_seconds() is used. Defaults to 1
+    :type retry_delay: int | float | timedelta
+
+    :param exponential_factor: Multiplier for the delay calculation. Defaults to 2.
+    :type exponential_factor: float or int
+
+    :param max_delay_seconds: The max seconds to sleep. If None, no upper limit. Defaults to None.
+    :type max_delay_seconds: float or int, optional
+
+    :param jitter_rng: Random number generator to use, e.g. a seeded random.Random(). If None the random module is used. Defaults to None.
+    :type jitter_rng: random.Random, optional
+
+    :returns: Number of seconds to sleep
+    :rtype: float
+    """
+
+    if isinstance(retry_delay, timedelta):
+        retry_delay = retry_delay.total_seconds()
+
+    half = retry_delay * (exponential_factor**attempt) / 2
+
+    if max_delay_seconds and half > max_delay_seconds / 2:
+        half = max_delay_seconds / 2
+
+    return half + half * (jitter_rng or random).random()
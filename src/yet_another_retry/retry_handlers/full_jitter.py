@@ -0,0 +1,52 @@
+import random
+from datetime import timedelta
+
+
+def full_jitter(
+    e: Exception,
+    attempt: int,
+    retry_delay: float | int | timedelta = 1,
+    exponential_factor: float | int = 2,
+    max_delay_seconds: float | int = None,
+    jitter_rng: random.Random = None,
+) -> float:
+    """
+    Retry handler sleeping a random time between 0 and the exponential backoff delay.
+
+    How long to sleep is calculated as::
+
+        random between 0 and min(max_delay_seconds, retry_delay x exponential_factor^attempt)
+
+    Spreading the retries over the whole window keeps clients that failed at the same moment from retrying at the same moment.
+
+    :param e: The exception that occurred.
+    :type e: Exception
+
+    :param attempt: Attempt number, is passed from the decorator on each retry.
+    :type attempt: int
+
+    :param retry_delay: Base delay. If int or float, it is treated as seconds. If timedelta, total_seconds() is used. Defaults to 1
+    :type retry_delay: int | float | timedelta
+
+    :param exponential_factor: Multiplier for the delay calculation. Defaults to 2.
+    :type exponential_factor: float or int
+
+    :param max_delay_seconds: The max seconds of the window. If None, no upper limit. Defaults to None.
+    :type max_delay_seconds: float or int, optional
+
+    :param jitter_rng: Random number generator to use, e.g. a seeded random.Random(). If None the random module is used. Defaults to None.
+    :type jitter_rng: random.Random, optional
+
+    :returns: Number of seconds to sleep
+    :rtype: float
+    """
+
+    if isinstance(retry_delay, timedelta):
+        retry_delay = retry_delay.total_seconds()
+
+    window = retry_delay * (exponential_factor**attempt)
+
+    if max_delay_seconds and window > max_delay_seconds:
+        window = max_delay_seconds
+
+    return window * (jitter_rng or random).random()
@@ -0,0 +1,104 @@
+import random
+from datetime import timedelta
+
+JITTERS = ("full", "equal", "decorrelated")
+
+
+class JitteredBackoff:
+    """Retry handler with full, equal or decorrelated jitter, with the capped delays computed once when it is created.
+
+    Works like full_jitter, equal_jitter and decorrelated_jitter, but the exponential delays up to max_delay_seconds are computed in advance,
+    so a retry only looks up its window and draws one random number. The instance also has its own random number generator,
+    seeded with ``seed``, so one decorator, or all decorators sharing the instance, get a reproducible sequence of delays.
+
+    Create one instance per policy, e.g. ``@retry(retry_handler=JitteredBackoff("full", retry_delay=0.5, max_delay_seconds=30))``.
+
+    :param jitter: "full", "equal" or "decorrelated". Defaults to "full"
+    :type jitter: str
+
+    :param retry_delay: Base delay. If int or float, it is treated as seconds. If timedelta, total_seconds() is used. Defaults to 1
+    :type retry_delay: int | float | timedelta
+
+    :param exponential_factor: Multiplier for the delay calculation, not used by decorrelated jitter. Defaults to 2.
+    :type exponential_factor: float or int
+
+    :param max_delay_seconds: The max seconds to sleep. If None, no upper limit. Defaults to None.
+    :type max_delay_seconds: float or int, optional
+
+    :param seed: Seed of the random number generator. If None it is seeded from the system. Defaults to None
+    :type seed: int, optional
+
+    :param schedule_size: Number of attempts to compute the delays of in advance when there is no max_delay_seconds, later attempts are computed when needed. Defaults to 64
+    :type schedule_size: int
+    """
+
+    def __init__(
+        self,
+        jitter: str = "full",
+        retry_delay: float | int | timedelta = 1,
+        exponential_factor: float | int = 2,
+        max_delay_seconds: float | int = None,
+        seed: int = None,
+        schedule_size: int = 64,
+    ):
+        if jitter not in JITTERS:
+            raise ValueError(f"jitter must be one of {', '.join(JITTERS)}")
+        if isinstance(retry_delay, timedelta):
+            retry_delay = retry_delay.total_seconds()
+
+        self.jitter = jitter
+        self.retry_delay = retry_delay
+        self.exponential_factor = exponential_factor
+        self.max_delay_seconds = max_delay_seconds
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self._random = self.rng.random
+
+        # (least delay, random part) for each attempt, the delay is least + random part x random()
+        self._schedule: list[tuple[float, float]] = []
+        self._capped = False
+        for attempt in range(1, schedule_size + 1):
+            window = self._window(attempt)
+            self._schedule.append(self._split(window))
+            # every later attempt is capped too
+            if max_delay_seconds and window >= max_delay_seconds:
+                self._capped = True
+                break
+
+    def _window(self, attempt: int) -> float:
+        window = self.retry_delay * (self.exponential_factor**attempt)
+        if self.max_delay_seconds and window > self.max_delay_seconds:
+            window = self.max_delay_seconds
+        return window
+
+    def _split(self, window: float) -> tuple[float, float]:
+        if self.jitter == "equal":
+            return window / 2, window / 2
+        return 0.0, window
+
+    def __call__(
+        self, e: Exception, attempt: int, previous_delay: float | int | timedelta
+    ) -> float:
+        """Returns the number of seconds to sleep, called by the decorator on each retry"""
+        if self.jitter == "decorrelated":
+            if isinstance(previous_delay, timedelta):
+                previous_delay = previous_delay.total_seconds()
+            # previous_delay is 0 before the first retry
+            upper = max((previous_delay or self.retry_delay) * 3, self.retry_delay)
+            sleep_delay = self.retry_delay + (upper - self.retry_delay) * self._random()
+            if self.max_delay_seconds and sleep_delay > self.max_delay_seconds:
+                sleep_delay = self.max_delay_seconds
+            return sleep_delay
+
+        schedule = self._schedule
+        if attempt <= len(schedule):
+            least, spread = schedule[attempt - 1]
+        elif self._capped:
+            least, spread = schedule[-1]
+        else:
+            least, spread = self._split(self._window(attempt))
+
+        return least + spread * self._random()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(jitter={self.jitter!r}, retry_delay={self.retry_delay}, exponential_factor={self.exponential_factor}, max_delay_seconds={self.max_delay_seconds})"
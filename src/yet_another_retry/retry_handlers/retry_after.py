@@ -0,0 +1,136 @@
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from yet_another_retry.retry_handlers.exponential_backoff import exponential_backoff
+
+
+def retry_after(
+    e: Exception,
+    attempt: int,
+    retry_delay: float | int | timedelta = 1,
+    exponential_factor: float | int = 2,
+    max_delay_seconds: float | int = None,
+    jitter_range: float | int = None,
+    retry_after_attribute: str = "retry_after",
+    retry_after_extractor: Callable[[Exception], Any] = None,
+    retry_after_jitter: float = 0.1,
+) -> float:
+    """
+    Retry handler that sleeps as long as the server asked for, falling back to exponential_backoff when it did not.
+
+    The hint is read from the exception by retry_after_extractor if given, otherwise from the attribute named retry_after_attribute,
+    otherwise from a ``Retry-After`` header of ``e.response.headers``, like the exceptions of requests and httpx have.
+    It can be seconds as int, float or str, a timedelta, a datetime to wait until, or a HTTP-date string.
+
+    A random delay of up to retry_after_jitter times the hint is added so clients told the same time do not all retry at once, then the delay is capped at max_delay_seconds.
+
+    All parameters can be given to the decorator, e.g. ``@retry(retry_handler=retry_after, max_delay_seconds=60, retry_after_attribute="wait_seconds")``.
+
+    :param e: The exception that occurred.
+    :type e: Exception
+
+    :param attempt: Attempt number, is passed from the decorator on each retry.
+    :type attempt: int
+
+    :param retry_delay: Base delay of exponential_backoff when there is no hint. Defaults to 1
+    :type retry_delay: int | float | timedelta
+
+    :param exponential_factor: Multiplier of exponential_backoff when there is no hint. Defaults to 2.
+    :type exponential_factor: float or int
+
+    :param max_delay_seconds: The max seconds to sleep, with or without a hint. If None, no upper limit. Defaults to None.
+    :type max_delay_seconds: float or int, optional
+
+    :param jitter_range: Jitter of exponential_backoff when there is no hint. Defaults to None.
+    :type jitter_range: float or int, optional
+
+    :param retry_after_attribute: Name of the attribute of the exception holding the hint. Defaults to "retry_after"
+    :type retry_after_attribute: str
+
+    :param retry_after_extractor: Function returning the hint for an exception, or None if it has none. Used instead of the attribute and header if given. Defaults to None
+    :type retry_after_extractor: Callable[[Exception], Any], optional
+
+    :param retry_after_jitter: Max random delay added to a hint, as a fraction of it. Defaults to 0.1
+    :type retry_after_jitter: float
+
+    :returns: Number of seconds to sleep
+    :rtype: float
+    """
+
+    if retry_after_extractor is not None:
+        hint = retry_after_extractor(e)
+    else:
+        hint = getattr(e, retry_after_attribute, None)
+        if hint is None:
+            headers = getattr(getattr(e, "response", None), "headers", None)
+            if headers is not None:
+                hint = headers.get("Retry-After")
+
+    sleep_delay = _hint_to_seconds(hint)
+
+    if sleep_delay is None:
+        return exponential_backoff(
+            e,
+            attempt,
+            retry_delay=retry_delay,
+            exponential_factor=exponential_factor,
+            max_delay_seconds=max_delay_seconds,
+            jitter_range=jitter_range,
+        )
+
+    # jitter is only added, retrying before the hint would most likely be throttled again
+    if retry_after_jitter and retry_after_jitter > 0:
+        sleep_delay += random.uniform(0, sleep_delay * retry_after_jitter)
+
+    if max_delay_seconds and sleep_delay > max_delay_seconds:
+        sleep_delay = max_delay_seconds
+
+    return round(sleep_delay, 2)
+
+
+def _hint_to_seconds(hint: Any) -> float | None:
+    # returns None for hints that can not be understood, so the handler falls back to backing off
+    if hint is None or isinstance(hint, bool):
+        return None
+
+    if isinstance(hint, (int, float)):
+        seconds = hint
+
+    elif isinstance(hint, timedelta):
+        seconds = hint.total_seconds()
+
+    elif isinstance(hint, datetime):
+        seconds = _until(hint)
+
+    elif isinstance(hint, (str, bytes)):
+        if isinstance(hint, bytes):
+            hint = hint.decode("latin-1")
+        hint = hint.strip()
+        try:
+            seconds = float(hint)
+        except ValueError:
+            # email.utils is slow to import and only needed for HTTP-dates
+            from email.utils import parsedate_to_datetime
+
+            try:
+                seconds = _until(parsedate_to_datetime(hint))
+            except (TypeError, ValueError):
+                return None
+
+    else:
+        return None
+
+    # float() also reads "inf", "nan" and "1e400", sleeping forever or not at all is not what the server asked for
+    if not math.isfinite(seconds):
+        return None
+
+    # a hint in the past means the server is ready again
+    return max(seconds, 0)
+
+
+def _until(moment: datetime) -> float:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - datetime.now(timezone.utc)).total_seconds()
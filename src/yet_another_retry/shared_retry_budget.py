@@ -0,0 +1,201 @@
+import itertools
+import mmap
+import os
+import struct
+import threading
+
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+    import msvcrt
+
+# magic, tokens, suppressed retries
+_LAYOUT = struct.Struct("<8sdQ")
+_MAGIC = b"YARBUDG1"
+
+
+class SharedRetryBudget:
+    """RetryBudget whose bucket is shared by all processes on the host that use the same file.
+
+    Works like RetryBudget, see it for how tokens are taken and refilled, but the tokens are kept in a small memory-mapped file so every worker process, e.g. of gunicorn or multiprocessing, sees and spends the same budget.
+    Updates lock the file, so they are atomic between processes, and a lock is also held between threads of a process.
+
+    The file is created, with the bucket full or at initial_tokens, by the first process that opens it. Later processes use the bucket as it is, whatever parameters they give.
+    Put it on a memory backed filesystem like /dev/shm to keep it off the disk. The file is not removed, delete it to start over.
+
+    Successful calls are counted in the process and only added to the shared bucket every ``sync_every`` successes or when a retry is asked for, so the success path rarely touches the file.
+
+    A pickled SharedRetryBudget opens the same file again, so it is still shared, e.g. when sent to a ProcessPoolExecutor.
+
+    :param path: Path of the file holding the bucket
+    :type path: str | os.PathLike
+
+    :param retry_ratio: Number of tokens added for each successful call. Defaults to 0.1
+    :type retry_ratio: float
+
+    :param max_tokens: The maximum number of tokens in the bucket. Defaults to 10
+    :type max_tokens: float
+
+    :param initial_tokens: Number of tokens in the bucket when the file is created. If None it starts full. Defaults to None
+    :type initial_tokens: float, optional
+
+    :param sync_every: Number of successes counted in the process before they are added to the shared bucket. Defaults to 10
+    :type sync_every: int
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        retry_ratio: float = 0.1,
+        max_tokens: float = 10,
+        initial_tokens: float = None,
+        sync_every: int = 10,
+    ):
+        if retry_ratio < 0:
+            raise ValueError("retry_ratio can not be negative")
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1")
+        if sync_every < 1:
+            raise ValueError("sync_every must be at least 1")
+
+        self.path = os.fspath(path)
+        self.retry_ratio = retry_ratio
+        self.max_tokens = max_tokens
+        self.initial_tokens = initial_tokens
+        self.sync_every = sync_every
+        self._open()
+
+    def _open(self) -> None:
+        # a file lock does not exclude processes sharing the same open file, so every process opens the file itself
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+        # successes are counted lock-free like in RetryBudget, see _settle()
+        self._successes = itertools.count()
+        self._settled_successes = 0
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            with _FileLock(self._lock, self._fd):
+                if os.fstat(self._fd).st_size < _LAYOUT.size:
+                    os.ftruncate(self._fd, _LAYOUT.size)
+                self._map = mmap.mmap(self._fd, _LAYOUT.size)
+                magic, _, _ = _LAYOUT.unpack_from(self._map)
+                if magic != _MAGIC:
+                    tokens = (
+                        self.max_tokens
+                        if self.initial_tokens is None
+                        else self.initial_tokens
+                    )
+                    _LAYOUT.pack_into(self._map, 0, _MAGIC, tokens, 0)
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    def record_success(self) -> None:
+        """Records a successful call, refilling the bucket with retry_ratio tokens."""
+        if next(self._successes) % self.sync_every == self.sync_every - 1:
+            with self._locked_file():
+                self._settle()
+
+    def try_acquire(self) -> bool:
+        """Takes a token for a retry if there is one
+
+        :return: True if the retry is allowed, False if the budget is spent
+        :rtype: bool
+        """
+        with self._locked_file():
+            tokens, suppressed = self._settle()
+            if tokens >= 1:
+                self._write(tokens - 1, suppressed)
+                return True
+
+            self._write(tokens, suppressed + 1)
+            return False
+
+    @property
+    def tokens(self) -> float:
+        """Number of tokens currently in the shared bucket"""
+        with self._locked_file():
+            return self._settle()[0]
+
+    @property
+    def suppressed(self) -> int:
+        """Number of retries, by all processes, that were not made because the budget was spent"""
+        with self._locked_file():
+            return _LAYOUT.unpack_from(self._map)[2]
+
+    def close(self) -> None:
+        """Closes the file, the budget can not be used afterwards"""
+        with self._lock:
+            self._map.close()
+            os.close(self._fd)
+
+    def _settle(self) -> tuple[float, int]:
+        # must be called with the file locked, adds the successes of this process to the bucket
+        _, tokens, suppressed = _LAYOUT.unpack_from(self._map)
+
+        # reading the counter also increases it by one, which is not a success
+        count = next(self._successes)
+        successes = count - self._settled_successes
+        self._settled_successes = count + 1
+
+        if successes:
+            tokens = min(self.max_tokens, tokens + successes * self.retry_ratio)
+            self._write(tokens, suppressed)
+        return tokens, suppressed
+
+    def _write(self, tokens: float, suppressed: int) -> None:
+        _LAYOUT.pack_into(self._map, 0, _MAGIC, tokens, suppressed)
+
+    def _locked_file(self) -> "_FileLock":
+        # the budget was created before the process was forked, e.g. by gunicorn with preload_app
+        if self._pid != os.getpid():
+            self._open()
+        return _FileLock(self._lock, self._fd)
+
+    def __getstate__(self) -> dict:
+        return {
+            "path": self.path,
+            "retry_ratio": self.retry_ratio,
+            "max_tokens": self.max_tokens,
+            "initial_tokens": self.initial_tokens,
+            "sync_every": self.sync_every,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(path={self.path!r}, retry_ratio={self.retry_ratio}, max_tokens={self.max_tokens}, tokens={self.tokens}, suppressed={self.suppressed})"
+
+
+class _FileLock:
+    """Holds the thread lock and an exclusive lock on the file, which only excludes other processes"""
+
+    def __init__(self, lock: threading.Lock, fd: int):
+        self.lock = lock
+        self.fd = fd
+
+    def __enter__(self) -> None:
+        self.lock.acquire()
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.fd, fcntl.LOCK_EX)
+            else:
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                msvcrt.locking(self.fd, msvcrt.LK_LOCK, _LAYOUT.size)
+        except BaseException:
+            self.lock.release()
+            raise
+
+    def __exit__(self, *exc_info) -> None:
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                msvcrt.locking(self.fd, msvcrt.LK_UNLCK, _LAYOUT.size)
+        finally:
+            self.lock.release()
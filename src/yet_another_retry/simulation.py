@@ -0,0 +1,295 @@
+import math
+import random
+from collections import Counter
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable
+
+from yet_another_retry.retry_handlers import default_retry_handler
+from yet_another_retry.utils import (
+    RETRY_CONFIG_FIELDS,
+    RetryConfig,
+    get_sleep_seconds,
+    make_handler_invoker,
+)
+
+DEFAULT_PERCENTILES = (50, 90, 99, 99.9)
+
+
+@dataclass(frozen=True, slots=True)
+class SimulationResult:
+    """Outcome of simulate_policy
+
+    :param calls: Number of simulated calls
+    :type calls: int
+
+    :param succeeded: Number of calls that succeeded within their tries
+    :type succeeded: int
+
+    :param attempts: Number of attempts made by all calls together
+    :type attempts: int
+
+    :param latencies: Seconds from the start of each call until it succeeded or gave up, sorted
+    :type latencies: list[float]
+
+    :param arrival_rate: Calls started per second
+    :type arrival_rate: float
+
+    :param bucket_seconds: Width of the time buckets
+    :type bucket_seconds: float
+
+    :param attempt_buckets: Number of attempts started in each time bucket, by bucket index
+    :type attempt_buckets: dict[int, int]
+
+    :param retry_buckets: Number of retries, attempts after the first, started in each time bucket, by bucket index
+    :type retry_buckets: dict[int, int]
+    """
+
+    calls: int
+    succeeded: int
+    attempts: int
+    latencies: list[float]
+    arrival_rate: float
+    bucket_seconds: float
+    attempt_buckets: dict[int, int]
+    retry_buckets: dict[int, int]
+
+    @property
+    def success_rate(self) -> float:
+        """Fraction of the calls that succeeded"""
+        return self.succeeded / self.calls
+
+    @property
+    def expected_attempts(self) -> float:
+        """Mean number of attempts per call, also how much the retries multiply the load on average"""
+        return self.attempts / self.calls
+
+    @property
+    def peak_amplification(self) -> float:
+        """Attempts in the busiest time bucket compared to the calls started in a bucket on average"""
+        if not self.attempt_buckets:
+            return 0.0
+        return max(self.attempt_buckets.values()) / (
+            self.arrival_rate * self.bucket_seconds
+        )
+
+    def percentile(self, percent: float) -> float:
+        """Latency below which the given percent of the calls finished
+
+        :param percent: The percentile, between 0 and 100
+        :type percent: float
+
+        :return: Seconds
+        :rtype: float
+        """
+        if not 0 <= percent <= 100:
+            raise ValueError("percent must be between 0 and 100")
+        # nearest rank
+        index = max(math.ceil(percent / 100 * len(self.latencies)) - 1, 0)
+        return self.latencies[index]
+
+    def busiest_buckets(self, count: int = 5) -> list[tuple[float, int, int]]:
+        """The time buckets with the most retries
+
+        :param count: Number of buckets to return. Defaults to 5
+        :type count: int
+
+        :return: Start time in seconds, attempts and retries of each bucket, busiest first
+        :rtype: list[tuple[float, int, int]]
+        """
+        buckets = sorted(
+            self.retry_buckets.items(), key=lambda item: (-item[1], item[0])
+        )[:count]
+        return [
+            (bucket * self.bucket_seconds, self.attempt_buckets[bucket], retries)
+            for bucket, retries in buckets
+        ]
+
+    def report(self, percentiles: tuple[float, ...] = DEFAULT_PERCENTILES) -> str:
+        """Formats the result as text, like printed by ``python -m yet_another_retry simulate``
+
+        :param percentiles: The latency percentiles to include. Defaults to 50, 90, 99 and 99.9
+        :type percentiles: tuple[float, ...]
+
+        :return: The report
+        :rtype: str
+        """
+        lines = [
+            f"calls               {self.calls}",
+            f"succeeded           {self.succeeded} ({self.success_rate:.2%})",
+            f"attempts            {self.attempts}",
+            f"expected attempts   {self.expected_attempts:.3f}",
+            f"load amplification  {self.expected_attempts:.3f} mean, {self.peak_amplification:.3f} peak",
+        ]
+        for percent in percentiles:
+            label = f"latency p{percent:g}"
+            lines.append(f"{label:<20}{self.percentile(percent):.3f}s")
+
+        busiest = self.busiest_buckets()
+        if busiest:
+            lines.append(
+                f"retry bursts, busiest {self.bucket_seconds:g}s buckets of {self.arrival_rate * self.bucket_seconds:g} calls on average:"
+            )
+            for start, attempts, retries in busiest:
+                lines.append(
+                    f"  at {start:>10g}s  {attempts:>8} attempts  {retries:>8} retries"
+                )
+        else:
+            lines.append("no retries")
+
+        return "\n".join(lines)
+
+
+def simulate_policy(
+    failure_probability: float,
+    calls: int = 100_000,
+    tries: int = 3,
+    retry_handler: Callable = default_retry_handler,
+    retry_delay: float | int | timedelta = 0,
+    attempt_duration: float = 0,
+    arrival_rate: float = 1000,
+    bucket_seconds: float = 1,
+    outage_start: float = None,
+    outage_duration: float = 0,
+    seed: int = None,
+    **kwargs: Any,
+) -> SimulationResult:
+    """Simulates many calls of a function retried with the given policy, without calling anything or sleeping.
+
+    Calls start at random times, on average arrival_rate per second. Every attempt fails with failure_probability, and every attempt
+    started during the outage fails. The retry handler is called for every retry like the decorator would, so jitter and delay limits are included.
+
+    Additional kwargs are passed to the retry handler like kwargs of the decorator, e.g. ``exponential_factor`` or ``max_delay_seconds`` of exponential_backoff.
+
+    :param failure_probability: Probability that an attempt fails, between 0 and 1
+    :type failure_probability: float
+
+    :param calls: Number of calls to simulate. Defaults to 100000
+    :type calls: int
+
+    :param tries: Number of tries of each call. Defaults to 3
+    :type tries: int
+
+    :param retry_handler: The retry handler. Defaults to default_retry_handler
+    :type retry_handler: Callable
+
+    :param retry_delay: retry_delay passed to the retry handler. Defaults to 0
+    :type retry_delay: float | int | timedelta
+
+    :param attempt_duration: Seconds every attempt takes. Defaults to 0
+    :type attempt_duration: float
+
+    :param arrival_rate: Calls started per second. Defaults to 1000
+    :type arrival_rate: float
+
+    :param bucket_seconds: Width of the time buckets attempts and retries are counted in. Defaults to 1
+    :type bucket_seconds: float
+
+    :param outage_start: Seconds after the first call when all attempts start failing. If None there is no outage. Defaults to None
+    :type outage_start: float, optional
+
+    :param outage_duration: Seconds the outage lasts. Defaults to 0
+    :type outage_duration: float
+
+    :param seed: Seed of the random numbers, the simulation and the jitter of the handler give the same result every time if set. Defaults to None
+    :type seed: int, optional
+
+    :return: The result of the simulation
+    :rtype: SimulationResult
+    """
+
+    if not 0 <= failure_probability <= 1:
+        raise ValueError("failure_probability must be between 0 and 1")
+    if calls < 1:
+        raise ValueError("calls must be at least 1")
+    if tries < 1:
+        raise ValueError("tries must be at least 1")
+    if arrival_rate <= 0:
+        raise ValueError("arrival_rate must be positive")
+    if bucket_seconds <= 0:
+        raise ValueError("bucket_seconds must be positive")
+
+    retry_config = RetryConfig(
+        tries=tries,
+        retry_delay=retry_delay,
+        raise_final_exception=True,
+        retry_exceptions=Exception,
+        fail_on_exceptions=(),
+        retry_handler=retry_handler,
+        exception_handler=None,
+        kwargs=dict(kwargs),
+    )
+    invoke_retry_handler = make_handler_invoker(
+        retry_handler, (*RETRY_CONFIG_FIELDS, *kwargs)
+    )
+    e = Exception("simulated failure")
+
+    if outage_start is None:
+        outage_start = outage_end = math.inf
+    else:
+        outage_end = outage_start + outage_duration
+
+    rng = random.Random(seed)
+    draw = rng.random
+    latencies = [0.0] * calls
+    attempt_buckets = Counter()
+    retry_buckets = Counter()
+    attempts = 0
+    succeeded = 0
+    start = 0.0
+
+    # the built in handlers draw their jitter from the random module, it is seeded for the simulation and then put back as it was
+    random_state = random.getstate()
+    if seed is not None:
+        random.seed(seed)
+
+    try:
+        for index in range(calls):
+            now = start
+            attempt = 1
+
+            while True:
+                bucket = int(now / bucket_seconds)
+                attempt_buckets[bucket] += 1
+                if attempt > 1:
+                    retry_buckets[bucket] += 1
+
+                failed = (
+                    outage_start <= now < outage_end or draw() < failure_probability
+                )
+                now += attempt_duration
+
+                if not failed:
+                    succeeded += 1
+                    break
+                if attempt >= tries:
+                    break
+
+                retry_config.attempt = attempt
+                delay_time = invoke_retry_handler(e, retry_config)
+                retry_config.previous_delay = delay_time
+                now += get_sleep_seconds(delay_time)
+                attempt += 1
+
+            if attempt > 1:
+                retry_config.previous_delay = 0
+            attempts += attempt
+            latencies[index] = now - start
+            # exponentially distributed time until the next call, like random.expovariate
+            start -= math.log(1.0 - draw()) / arrival_rate
+    finally:
+        if seed is not None:
+            random.setstate(random_state)
+
+    latencies.sort()
+
+    return SimulationResult(
+        calls=calls,
+        succeeded=succeeded,
+        attempts=attempts,
+        latencies=latencies,
+        arrival_rate=arrival_rate,
+        bucket_seconds=bucket_seconds,
+        attempt_buckets=dict(attempt_buckets),
+        retry_buckets=dict(retry_buckets),
+    )
@@ -0,0 +1,203 @@
+import time
+from typing import AsyncIterator, Callable, Iterator
+
+from yet_another_retry.utils import FAIL, IGNORE, RETRY, RetryCall, RetryPolicy
+
+
+class _StreamState(RetryCall):
+    """The retries of one call of a retrying generator function across its restarts
+
+    The generator may store a position in retry_config.checkpoint as it goes. Items yielded since the checkpoint last changed are counted,
+    after a restart from the checkpoint that many items are dropped so no item is delivered twice. Without a checkpoint all delivered items are dropped.
+    """
+
+    def __init__(self, policy: RetryPolicy, add_retry_config: bool, name: str):
+        super().__init__(
+            policy,
+            name,
+            policy.get_deadline() if policy.max_total_time is not None else None,
+        )
+        self.add_retry_config = add_retry_config
+        self.checkpoint = None
+        self.delivered = 0
+        self.skip = 0
+        self.progressed = False
+
+    def start(self, func_kwargs: dict) -> None:
+        """Prepares an attempt, the first run or a restart of the generator"""
+        self.start_attempt(func_kwargs if self.add_retry_config else None)
+        self.progressed = False
+        self.skip = self.delivered
+
+    def update_checkpoint(self) -> None:
+        # items before a new checkpoint will not be yielded again, only the ones still to be skipped come after it
+        if self.retry_config is not None and self.retry_config.checkpoint != (
+            self.checkpoint
+        ):
+            self.checkpoint = self.retry_config.checkpoint
+            self.delivered = self.skip
+
+    def item_skipped(self) -> None:
+        self.update_checkpoint()
+        self.skip -= 1
+
+    def item_delivered(self) -> None:
+        self.update_checkpoint()
+        self.delivered += 1
+        self.progressed = True
+
+    def classify(self, e: BaseException, duration: float) -> str:
+        """Records a failed attempt and classifies it, see RetryCall.classify"""
+        self.update_checkpoint()
+
+        # tries limit failures in a row, a stream that got further since the last failure starts counting again
+        if self.progressed and self.attempt > 1:
+            self.attempt = 1
+
+        return super().classify(e, duration)
+
+
+def make_generator_wrapper(
+    func: Callable, policy: RetryPolicy, add_retry_config: bool
+) -> Callable:
+    """Creates the wrapper for a generator function, restarting the generator after retryable exceptions without yielding an item twice
+
+    Tries limit the failures in a row, a restart that yields at least one new item before failing again counts as the first try.
+
+    :param func: The decorated generator function
+    :type func: Callable
+
+    :param policy: The retry policy of the decorator
+    :type policy: RetryPolicy
+
+    :param add_retry_config: If the retry_config should be passed to the function
+    :type add_retry_config: bool
+
+    :return: The wrapper generator function
+    :rtype: Callable
+    """
+
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    def wrapper(*func_args, **func_kwargs) -> Iterator:
+        state = _StreamState(policy, add_retry_config, name)
+
+        try:
+            while True:
+                state.start(func_kwargs)
+                generator = func(*func_args, **func_kwargs)
+
+                try:
+                    while True:
+                        # only exceptions of the generator are retried, not the ones thrown in by the consumer at the yield below
+                        try:
+                            item = next(generator)
+                        except StopIteration as stop:
+                            state.succeeded()
+                            return stop.value
+                        except BaseException as attempt_error:
+                            e = attempt_error
+                            break
+
+                        if state.skip:
+                            state.item_skipped()
+                            continue
+                        state.item_delivered()
+                        yield item
+                finally:
+                    generator.close()
+
+                action, sleep_seconds = state.failed(
+                    e, time.perf_counter() - state.started
+                )
+
+                if action is RETRY:
+                    # a cancelled sleep ends the retries
+                    if not policy.sleep(sleep_seconds):
+                        continue
+                    e = state.cancelled_error(e)
+                    action = FAIL
+
+                # exceptions that are not an Exception, like KeyboardInterrupt, are always raised
+                if action is IGNORE:
+                    if isinstance(e, Exception):
+                        return None
+                    raise e
+
+                state.give_up(e)
+                return None
+        finally:
+            state.release()
+
+    return wrapper
+
+
+def make_async_generator_wrapper(
+    func: Callable, policy: RetryPolicy, add_retry_config: bool
+) -> Callable:
+    """Creates the wrapper for an async generator function, see make_generator_wrapper
+
+    :param func: The decorated async generator function
+    :type func: Callable
+
+    :param policy: The retry policy of the decorator
+    :type policy: RetryPolicy
+
+    :param add_retry_config: If the retry_config should be passed to the function
+    :type add_retry_config: bool
+
+    :return: The wrapper async generator function
+    :rtype: Callable
+    """
+
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    async def wrapper(*func_args, **func_kwargs) -> AsyncIterator:
+        state = _StreamState(policy, add_retry_config, name)
+
+        try:
+            while True:
+                state.start(func_kwargs)
+                generator = func(*func_args, **func_kwargs)
+
+                try:
+                    while True:
+                        try:
+                            item = await generator.__anext__()
+                        except StopAsyncIteration:
+                            state.succeeded()
+                            return
+                        except BaseException as attempt_error:
+                            e = attempt_error
+                            break
+
+                        if state.skip:
+                            state.item_skipped()
+                            continue
+                        state.item_delivered()
+                        yield item
+                finally:
+                    await generator.aclose()
+
+                action, sleep_seconds = await state.failed_async(
+                    e, time.perf_counter() - state.started
+                )
+
+                if action is RETRY:
+                    if not await policy.async_sleep(sleep_seconds):
+                        continue
+                    e = state.cancelled_error(e)
+                    action = FAIL
+
+                # exceptions that are not an Exception, like asyncio.CancelledError, are always raised
+                if action is IGNORE:
+                    if isinstance(e, Exception):
+                        return
+                    raise e
+
+                await state.give_up_async(e)
+                return
+        finally:
+            state.release()
+
+    return wrapper
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from yet_another_retry.clock import set_default_clock
+
+try:
+    import pytest
+except ImportError:  # pragma: no cover
+    pytest = None
+
+
+class VirtualClock:
+    """Clock for tests where sleeping only moves time forward, so retry schedules complete instantly.
+
+    Every requested sleep is recorded in ``delays``. Use it for one decorator by passing ``clock=virtual_clock.now, sleeper=virtual_clock.sleep``,
+    or for everything that was not given its own clock with ``install()`` or the ``virtual_clock`` pytest fixture.
+    Deadlines from max_total_time and circuit breaker cooldowns follow the same virtual time.
+
+    :param start: The time the clock starts at. Defaults to 0
+    :type start: float
+    """
+
+    def __init__(self, start: float = 0.0):
+        self.time = start
+        self.delays: list[float] = []
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        """Returns the virtual time"""
+        return self.time
+
+    def sleep(self, seconds: float, cancel_token=None) -> None:
+        """Records the delay and moves the virtual time forward, without sleeping"""
+        with self._lock:
+            self.delays.append(seconds)
+            self.time += seconds
+
+    async def async_sleep(self, seconds: float, cancel_token=None) -> None:
+        """Records the delay and moves the virtual time forward, only yielding to the event loop"""
+        self.sleep(seconds)
+        await asyncio.sleep(0)
+
+    def advance(self, seconds: float) -> None:
+        """Moves the virtual time forward without recording a delay, e.g. to simulate a slow call"""
+        with self._lock:
+            self.time += seconds
+
+    @property
+    def total_sleep(self) -> float:
+        """Sum of all recorded delays"""
+        return sum(self.delays)
+
+    @contextmanager
+    def install(self) -> Iterator["VirtualClock"]:
+        """Makes this the default clock while the context is open
+
+        :return: Context manager yielding this clock
+        :rtype: Iterator[VirtualClock]
+        """
+        previous = set_default_clock(self)
+        try:
+            yield self
+        finally:
+            set_default_clock(previous)
+
+
+if pytest is not None:
+
+    @pytest.fixture
+    def virtual_clock() -> Iterator[VirtualClock]:
+        """pytest fixture installing a VirtualClock for the duration of a test.
+
+        Import it in a conftest.py to use it::
+
+            from yet_another_retry.testing import virtual_clock
+        """
+        clock = VirtualClock()
+        with clock.install():
+            yield clock
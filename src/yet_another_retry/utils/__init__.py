@@ -1,5 +1,29 @@
-from .retry_config import RetryConfig
+from .retry_config import RetryConfig, RETRY_CONFIG_FIELDS
 from .get_func_meta import get_func_meta
+from .get_sleep_seconds import get_sleep_seconds
+from .to_seconds import to_seconds
 from .call_handler import call_handler
+from .handler_invoker import make_handler_invoker
+from .single_flight import SingleFlight
+from .exception_policy import ExceptionPolicy
+from .attempt_record import AttemptRecord
+from .retry_policy import RetryPolicy, FAIL, RETRY, IGNORE
+from .retry_call import RetryCall
 
-__all__ = ["RetryConfig", "get_func_meta", "call_handler"]
+__all__ = [
+    "RetryConfig",
+    "RETRY_CONFIG_FIELDS",
+    "get_func_meta",
+    "get_sleep_seconds",
+    "to_seconds",
+    "call_handler",
+    "make_handler_invoker",
+    "SingleFlight",
+    "ExceptionPolicy",
+    "AttemptRecord",
+    "RetryPolicy",
+    "FAIL",
+    "RETRY",
+    "IGNORE",
+    "RetryCall",
+]
@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True, slots=True)
+class AttemptRecord:
+    """Compact record of a failed attempt, kept in retry_config.attempt_history instead of the exception itself.
+
+    :param attempt: The attempt number
+    :type attempt: int
+
+    :param exception_type: Qualified name of the type of the exception
+    :type exception_type: str
+
+    :param message: str() of the exception
+    :type message: str
+
+    :param duration: Seconds the attempt took
+    :type duration: float
+
+    :param delay: Seconds slept before the next attempt, None if the attempt was not retried
+    :type delay: float, optional
+    """
+
+    attempt: int
+    exception_type: str
+    message: str
+    duration: float
+    delay: Optional[float] = None
+
+    def __str__(self) -> str:
+        text = f"attempt {self.attempt}: {self.exception_type}: {self.message} ({self.duration:.3f}s)"
+        if self.delay is not None:
+            text += f", retried after {self.delay:g}s"
+        return text
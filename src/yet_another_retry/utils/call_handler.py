@@ -3,13 +3,13 @@ from typing import Callable, Protocol, Any
 import inspect
 
 
-class HasDict(Protocol):
+class HasAsDict(Protocol):
     """Dummy class for typehiting and avoid circular imports"""
 
-    __dict__: dict[str, Any]
+    def as_dict(self) -> dict[str, Any]: ...
 
 
-def call_handler(e: Exception, handler: Callable, retry_config: HasDict) -> None:
+def call_handler(e: Exception, handler: Callable, retry_config: HasAsDict) -> None:
     """Calls the given handler with the appropriate parameters based on its signature.
 
     :param e: The exception to pass to the handler.
@@ -21,12 +21,13 @@ def call_handler(e: Exception, handler: Callable, retry_config: HasDict) -> None
     """
 
     handler_params, handler_has_kwargs = get_func_meta(handler)
+    values = retry_config.as_dict()
 
     if handler_has_kwargs:
-        delay_time = handler(e, **retry_config.__dict__)
+        delay_time = handler(e, **values)
     else:
         delay_time = handler(
-            e, **{k: v for k, v in retry_config.__dict__.items() if k in handler_params}
+            e, **{k: v for k, v in values.items() if k in handler_params}
         )
 
     return delay_time
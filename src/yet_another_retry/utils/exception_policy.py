@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class ExceptionPolicy:
+    """How the retry decorator treats one exception type and its subclasses, overriding the decorator settings.
+
+    Exceptions with a policy are retried even if they are not in retry_exceptions, unless fail is True.
+
+    :param tries: Maximum number of tries when the exception occurs. Tries are counted for the whole call, not per exception type. If None the tries of the decorator are used. Defaults to None
+    :type tries: int, optional
+
+    :param retry_handler: Retry handler for the exception. If None the retry handler of the decorator is used. Defaults to None
+    :type retry_handler: Callable, optional
+
+    :param fail: Call the exception handler without retrying, like fail_on_exceptions. Defaults to False
+    :type fail: bool
+    """
+
+    tries: Optional[int] = None
+    retry_handler: Optional[Callable] = None
+    fail: bool = False
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+
+def get_sleep_seconds(delay_time: int | float | timedelta) -> float:
+    """Validates the value returned by a retry handler and converts it to seconds
+
+    :param delay_time: The value returned by the retry handler
+    :type delay_time: int | float | timedelta
+
+    :raises TypeError: If the retry handler did not return an int, float or timedelta
+
+    :return: Number of seconds to sleep, never negative
+    :rtype: float
+    """
+
+    if not isinstance(delay_time, (int, float, timedelta)):
+        raise TypeError(
+            f"The retry_handler did not return an int, float or timedelta. Can not use {type(delay_time)} as input to sleep."
+        )
+
+    # we need to make sure sleep gets a float/int so if we happen to have a timedelta we convert it now, the original value is saved to the config so that handlers can still use it
+    if isinstance(delay_time, timedelta):
+        delay_time = delay_time.total_seconds()
+
+    # can not sleep negative time
+    if delay_time < 0:
+        return 0
+
+    return delay_time
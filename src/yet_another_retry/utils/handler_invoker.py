@@ -0,0 +1,50 @@
+from operator import attrgetter
+from typing import Any, Callable, Iterable
+
+from yet_another_retry.utils.get_func_meta import get_func_meta
+
+
+def make_handler_invoker(
+    handler: Callable, config_keys: Iterable[str]
+) -> Callable[[Exception, Any], Any]:
+    """Resolves the signature of a handler once and returns a function that calls it.
+
+    The returned invoker has the signature ``invoker(e, retry_config)`` and behaves like
+    call_handler, but all signature introspection and parameter filtering is done here,
+    so a retry only has to read the requested values from the retry_config.
+
+    :param handler: The handler function to call.
+    :type handler: Callable
+
+    :param config_keys: All names that will be available on the retry_config object.
+    :type config_keys: Iterable[str]
+
+    :return: Function taking the exception and the retry_config that calls the handler.
+    :rtype: Callable[[Exception, Any], Any]
+    """
+
+    handler_params, handler_has_kwargs = get_func_meta(handler)
+
+    if handler_has_kwargs:
+        names = tuple(config_keys)
+    else:
+        names = tuple(key for key in config_keys if key in handler_params)
+
+    if not names:
+
+        def invoke(e: Exception, retry_config: Any) -> Any:
+            return handler(e)
+
+    elif len(names) == 1:
+        name = names[0]
+
+        def invoke(e: Exception, retry_config: Any) -> Any:
+            return handler(e, **{name: getattr(retry_config, name)})
+
+    else:
+        get_values = attrgetter(*names)
+
+        def invoke(e: Exception, retry_config: Any) -> Any:
+            return handler(e, **dict(zip(names, get_values(retry_config))))
+
+    return invoke
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+
+class Hedger:
+    """Runs hedged attempts of a function: if an attempt has not finished within hedge_after seconds another one is started next to it.
+
+    The first attempt to succeed wins. Attempts that are still running are abandoned, a regular function keeps running in its thread until it returns but the result is ignored, a coroutine is cancelled.
+    Every started attempt counts as an attempt, so hedges are limited by tries.
+
+    :param hedge_after: Seconds to wait for an attempt before starting another one
+    :type hedge_after: float
+
+    :param max_workers: Max number of threads used for attempts of regular functions. If None the ThreadPoolExecutor default is used. Defaults to None
+    :type max_workers: int, optional
+    """
+
+    def __init__(self, hedge_after: float, max_workers: int = None):
+        if hedge_after < 0:
+            raise ValueError("hedge_after can not be negative")
+
+        self.hedge_after = hedge_after
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The thread pool attempts of regular functions run in, created on first use"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="yet-another-retry-hedge",
+                    )
+        return self._executor
+
+    def run(
+        self, func: Callable, args: tuple, kwargs: dict, attempt: int, tries: int
+    ) -> tuple[int, Future]:
+        """Runs hedged attempts of a regular function until one succeeds or all started attempts failed
+
+        :param func: The function to call
+        :type func: Callable
+
+        :param args: Positional arguments for the function
+        :type args: tuple
+
+        :param kwargs: Keyword arguments for the function
+        :type kwargs: dict
+
+        :param attempt: Number of the first attempt
+        :type attempt: int
+
+        :param tries: The max number of attempts, no hedge is started beyond it
+        :type tries: int
+
+        :return: The number of the last started attempt and the finished future, either the first successful one or the last one that failed
+        :rtype: tuple[int, Future]
+        """
+        executor = self.executor
+        pending = {executor.submit(func, *args, **kwargs)}
+
+        try:
+            while True:
+                can_hedge = attempt < tries
+                done, pending = wait(
+                    pending,
+                    timeout=self.hedge_after if can_hedge else None,
+                    return_when=FIRST_COMPLETED,
+                )
+
+                for future in done:
+                    if future.exception() is None:
+                        return attempt, future
+                    failed = future
+
+                if not pending:
+                    return attempt, failed
+
+                if not done:
+                    attempt += 1
+                    pending.add(executor.submit(func, *args, **kwargs))
+        finally:
+            # attempts that did not start yet are dropped, running ones can not be stopped
+            for future in pending:
+                future.cancel()
+
+    async def run_async(
+        self, func: Callable, args: tuple, kwargs: dict, attempt: int, tries: int
+    ) -> tuple[int, asyncio.Task]:
+        """Runs hedged attempts of a coroutine function as tasks, see run()
+
+        :return: The number of the last started attempt and the finished task, either the first successful one or the last one that failed
+        :rtype: tuple[int, asyncio.Task]
+        """
+        pending = {asyncio.ensure_future(func(*args, **kwargs))}
+
+        try:
+            while True:
+                can_hedge = attempt < tries
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_after if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        return attempt, task
+                    failed = task
+
+                if not pending:
+                    return attempt, failed
+
+                if not done:
+                    attempt += 1
+                    pending.add(asyncio.ensure_future(func(*args, **kwargs)))
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shuts down the thread pool, a new one is created if the hedger is used again
+
+        :param wait: Wait for running attempts to finish. Defaults to True
+        :type wait: bool
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
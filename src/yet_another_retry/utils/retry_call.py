@@ -0,0 +1,336 @@
+import inspect
+import time
+from typing import Any
+
+from yet_another_retry.exceptions import CircuitOpenError, RetryResultError
+from yet_another_retry.utils.get_sleep_seconds import get_sleep_seconds
+from yet_another_retry.utils.retry_config import RetryConfig
+from yet_another_retry.utils.retry_policy import FAIL, IGNORE, RETRY, RetryPolicy
+
+
+class RetryCall:
+    """The retries of one call of a retrying function.
+
+    Holds what a call keeps between its attempts and makes every decision after a failed attempt, so the wrappers of the retry decorator,
+    the generator wrappers, RetryExecutor and retry_map only differ in how they make an attempt and how they wait before the next one.
+
+    The wrappers of the retry decorator only create it once an attempt failed, a call that succeeds on the first try never needs one.
+
+    :param policy: The retry policy of the decorator
+    :type policy: RetryPolicy
+
+    :param name: Name of the function, passed to the hooks
+    :type name: str
+
+    :param deadline: Clock time the call has to finish by, from RetryPolicy.get_deadline(). Defaults to None
+    :type deadline: float, optional
+
+    :param retry_config: The retry_config of the call, if one was created already. Defaults to None
+    :type retry_config: RetryConfig, optional
+
+    :param attempt: The current attempt. Defaults to 1
+    :type attempt: int
+    """
+
+    # a retry waits for a free slot of the bulkhead, if False it fails fast when there is none
+    wait_for_slot = True
+
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        name: str,
+        deadline: float = None,
+        retry_config: RetryConfig = None,
+        attempt: int = 1,
+    ):
+        self.policy = policy
+        self.name = name
+        self.deadline = deadline
+        self.retry_config = retry_config
+        self.attempt = attempt
+        self.total_sleep = 0
+        self.started = 0
+        self.duration = 0
+        self.holds_slot = False
+        # the last exception that was retried
+        self.error = None
+        # failed attempts so far and how many of them are in the attempt history.
+        # attempt numbers can repeat, a generator that made progress starts counting again
+        self.failures = 0
+        self.recorded = 0
+
+    def start_attempt(self, func_kwargs: dict = None) -> None:
+        """Prepares the next attempt
+
+        :param func_kwargs: Keyword arguments of the function to add the retry_config to, or None if the function does not take it. Defaults to None
+        :type func_kwargs: dict, optional
+
+        :raises CircuitOpenError: If the circuit breaker does not allow the attempt
+        """
+        policy = self.policy
+
+        if func_kwargs is not None:
+            func_kwargs["retry_config"] = self.get_retry_config()
+
+        # an open circuit fails fast without calling the function
+        circuit_breaker = policy.circuit_breaker
+        if circuit_breaker is not None and not circuit_breaker.allow_request():
+            raise CircuitOpenError(circuit_breaker)
+
+        if policy.hooks is not None:
+            policy.hooks.on_attempt_start(self.name, self.attempt)
+        self.started = time.perf_counter()
+
+    def succeeded(self) -> None:
+        """Records that the attempt started by start_attempt() succeeded"""
+        policy = self.policy
+        if policy.hooks is not None:
+            policy.hooks.on_attempt_end(
+                self.name, self.attempt, time.perf_counter() - self.started, None
+            )
+            policy.hooks.on_success(self.name, self.attempt, self.total_sleep)
+        for callback in policy.success_callbacks:
+            callback()
+
+    def get_retry_config(self) -> RetryConfig:
+        """Returns the retry_config of the call, created on first use, updated for the current attempt
+
+        :return: The retry_config
+        :rtype: RetryConfig
+        """
+        retry_config = self.retry_config
+        if retry_config is None:
+            retry_config = self.retry_config = self.policy.new_retry_config()
+        retry_config.attempt = self.attempt
+        if self.deadline is not None:
+            self.policy.update_remaining_time(retry_config, self.deadline)
+        return retry_config
+
+    def failed(self, e: BaseException, duration: float) -> tuple[str, float | None]:
+        """Records a failed attempt and decides what to do next, calling the retry handler if it is retried
+
+        :param e: The exception of the attempt
+        :type e: BaseException
+
+        :param duration: Seconds the attempt took
+        :type duration: float
+
+        :return: FAIL, RETRY or IGNORE, see RetryPolicy.classify, and the seconds to wait before the next attempt if it is RETRY
+        :rtype: tuple[str, float | None]
+        """
+        action = self.classify(e, duration)
+
+        if action is RETRY and not self.holds_slot and self.policy.bulkhead is not None:
+            if self.wait_for_slot:
+                self.holds_slot = self.policy.bulkhead.acquire()
+            else:
+                # e.g. RetryExecutor, waiting would take up the worker
+                self.holds_slot = self.policy.bulkhead.try_acquire()
+            if not self.holds_slot:
+                action = FAIL
+
+        if action is not RETRY:
+            return action, None
+
+        return self.retry(e, self.policy.invoke_retry_handler(e, self.retry_config))
+
+    async def failed_async(
+        self, e: BaseException, duration: float
+    ) -> tuple[str, float | None]:
+        """Async version of failed(), the retry handler may be a coroutine function
+
+        :param e: The exception of the attempt
+        :type e: BaseException
+
+        :param duration: Seconds the attempt took
+        :type duration: float
+
+        :return: FAIL, RETRY or IGNORE and the seconds to wait before the next attempt if it is RETRY
+        :rtype: tuple[str, float | None]
+        """
+        action = self.classify(e, duration)
+
+        if action is RETRY and not self.holds_slot and self.policy.bulkhead is not None:
+            self.holds_slot = await self.policy.bulkhead.acquire_async()
+            if not self.holds_slot:
+                action = FAIL
+
+        if action is not RETRY:
+            return action, None
+
+        delay_time = self.policy.invoke_retry_handler(e, self.retry_config)
+        if inspect.isawaitable(delay_time):
+            delay_time = await delay_time
+        return self.retry(e, delay_time)
+
+    def classify(self, e: BaseException, duration: float) -> str:
+        """Records a failed attempt with the circuit breaker and the hooks and classifies the exception, see RetryPolicy.classify
+
+        Unless the exception is ignored the retry_config is created or updated for the failed attempt.
+
+        :param e: The exception of the attempt
+        :type e: BaseException
+
+        :param duration: Seconds the attempt took
+        :type duration: float
+
+        :return: FAIL, RETRY or IGNORE
+        :rtype: str
+        """
+        policy = self.policy
+        self.duration = duration
+        self.failures += 1
+
+        if policy.circuit_breaker is not None:
+            policy.circuit_breaker.record_exception(e)
+
+        if policy.hooks is not None:
+            policy.hooks.on_attempt_end(self.name, self.attempt, duration, e)
+
+        action = policy.classify(e, self.attempt)
+        if action is IGNORE:
+            return action
+
+        retry_config = self.get_retry_config()
+        if e.__class__ is RetryResultError:
+            retry_config.last_result = e.result
+
+        return action
+
+    def retry(self, e: BaseException, delay_time: Any) -> tuple[str, float | None]:
+        """Handles the delay returned by the retry handler for a retried exception and moves on to the next attempt
+
+        :param e: The exception that is retried
+        :type e: BaseException
+
+        :param delay_time: What the retry handler returned
+        :type delay_time: Any
+
+        :raises TypeError: If the retry handler did not return an int, float or timedelta
+
+        :return: RETRY and the seconds to wait, or FAIL and None if waiting would pass the deadline or the retry budget is spent
+        :rtype: tuple[str, float | None]
+        """
+        policy = self.policy
+        retry_config = self.retry_config
+        sleep_seconds = get_sleep_seconds(delay_time)
+
+        # give up instead of sleeping past the deadline
+        if self.deadline is not None and sleep_seconds >= retry_config.remaining_time:
+            return FAIL, None
+
+        # the token is only taken for a retry that happens, one turned down by the bulkhead or the deadline does not use up the budget.
+        # a spent budget turns the retry into a final failure
+        if policy.retry_budget is not None and not policy.retry_budget.try_acquire():
+            return FAIL, None
+
+        if policy.hooks is not None:
+            policy.hooks.on_retry(self.name, self.attempt, sleep_seconds, e)
+
+        retry_config.previous_delay = delay_time
+        self.total_sleep += sleep_seconds
+
+        if policy.attempt_history is not None:
+            policy.record_attempt(
+                retry_config, self.attempt, e, self.duration, sleep_seconds
+            )
+            self.recorded = self.failures
+        if policy.clear_tracebacks:
+            policy.clear_traceback(e)
+
+        self.error = e
+        self.attempt += 1
+        return RETRY, sleep_seconds
+
+    def cancelled_error(self, e: BaseException) -> BaseException:
+        """Creates the exception for a call whose retries were cancelled while waiting, see RetryPolicy.cancelled_error
+
+        :param e: The exception that was retried
+        :type e: BaseException
+
+        :return: The exception to give up with
+        :rtype: RetryCancelledError
+        """
+        return self.policy.cancelled_error(e, self.retry_config.attempt)
+
+    def record_give_up(self, e: BaseException) -> None:
+        """Records the final exception with the hooks and in the attempt history
+
+        :param e: The final exception
+        :type e: BaseException
+        """
+        policy = self.policy
+        # the attempt that failed, also after a cancelled wait for the next one
+        retry_config = (
+            self.get_retry_config() if self.retry_config is None else self.retry_config
+        )
+        attempt = retry_config.attempt
+
+        if policy.hooks is not None:
+            policy.hooks.on_give_up(self.name, attempt, e, self.total_sleep)
+
+        if policy.attempt_history is not None:
+            # a cancelled wait gives up after the attempt was recorded as retried
+            if self.recorded != self.failures:
+                policy.record_attempt(retry_config, attempt, e, self.duration)
+                self.recorded = self.failures
+            policy.add_history_note(e, retry_config)
+
+    def give_up(self, e: BaseException) -> Any:
+        """Ends the call with a final exception, calling the exception handler
+
+        :param e: The final exception
+        :type e: BaseException
+
+        :raises BaseException: e if raise_final_exception is True, or what the exception handler raised
+
+        :return: What the call returns without raising, the result rejected by retry_on_result or None
+        :rtype: Any
+        """
+        self.record_give_up(e)
+        try:
+            self.policy.invoke_exception_handler(e, self.retry_config)
+        except BaseException as handler_error:
+            _chain(handler_error, e)
+            raise
+        return self.final_result(e)
+
+    async def give_up_async(self, e: BaseException) -> Any:
+        """Async version of give_up(), the exception handler may be a coroutine function
+
+        :param e: The final exception
+        :type e: BaseException
+
+        :return: What the call returns without raising, the result rejected by retry_on_result or None
+        :rtype: Any
+        """
+        self.record_give_up(e)
+        try:
+            handler_result = self.policy.invoke_exception_handler(e, self.retry_config)
+            if inspect.isawaitable(handler_result):
+                await handler_result
+        except BaseException as handler_error:
+            _chain(handler_error, e)
+            raise
+        return self.final_result(e)
+
+    def final_result(self, e: BaseException) -> Any:
+        if self.policy.raise_final_exception:
+            raise e
+
+        # without raising, a rejected result is returned as it is
+        if e.__class__ is RetryResultError:
+            return e.result
+        return None
+
+    def release(self) -> None:
+        """Releases the slot of the bulkhead, if the call holds one"""
+        if self.holds_slot:
+            self.holds_slot = False
+            self.policy.bulkhead.release()
+
+
+def _chain(handler_error: BaseException, e: BaseException) -> None:
+    # the exception handler is not called inside an except clause, chain the exceptions it raises to e like python would
+    if handler_error is not e and handler_error.__context__ is None:
+        handler_error.__context__ = e
@@ -1,12 +1,15 @@
+from collections import deque
 from datetime import timedelta
-from typing import Optional, Callable
-from dataclasses import dataclass
+from typing import Any, Optional, Callable
+from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True, init=False)
 class RetryConfig:
     """config class for retries
 
+    The built in values are stored in slots. Any additional kwargs given to the decorator are kept in the ``kwargs`` mapping but can still be read and set as attributes, e.g. ``retry_config.custom_value``.
+
     :param tries: number of total tries
     :type tries: int
 
@@ -28,6 +31,27 @@ class RetryConfig:
     :param previous_delay: The delay used in the previous retry, defaults to 0
     :type previous_delay: int | float | timedelta
 
+    :param max_total_time: Maximum number of seconds all tries together may take, None if not limited. Defaults to None
+    :type max_total_time: float, optional
+
+    :param attempt_timeout: Number of seconds an attempt should at most take, clamped to remaining_time when max_total_time is set. None if not set. Defaults to None
+    :type attempt_timeout: float, optional
+
+    :param remaining_time: Seconds left of max_total_time, updated before each attempt and before calling the handlers. None if max_total_time is not set. Defaults to None
+    :type remaining_time: float, optional
+
+    :param last_result: The last result rejected by retry_on_result, None if no result was rejected. Defaults to None
+    :type last_result: Any, optional
+
+    :param attempt_history: Records of the failed attempts of the call, oldest first, None unless attempt_history was given to the decorator. Defaults to None
+    :type attempt_history: deque[AttemptRecord], optional
+
+    :param checkpoint: For generator functions, the position to resume from when the generator is restarted after a retryable exception. Set by the generator, None until it does. Defaults to None
+    :type checkpoint: Any, optional
+
+    :param kwargs: Additional values given to the decorator, defaults to an empty dict
+    :type kwargs: dict[str, Any]
+
     """
 
     tries: int
@@ -39,3 +63,120 @@ class RetryConfig:
     exception_handler: Callable
     attempt: int = 0
     previous_delay: int | float | timedelta = 0
+    max_total_time: Optional[float] = None
+    attempt_timeout: Optional[float] = None
+    remaining_time: Optional[float] = None
+    last_result: Any = None
+    attempt_history: Optional[deque] = None
+    checkpoint: Any = None
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+    def __init__(
+        self,
+        tries: int,
+        retry_delay: int | float | timedelta,
+        raise_final_exception: bool,
+        retry_exceptions: Exception | tuple[Exception],
+        fail_on_exceptions: Optional[Exception | tuple[Exception]],
+        retry_handler: Callable,
+        exception_handler: Callable,
+        attempt: int = 0,
+        previous_delay: int | float | timedelta = 0,
+        max_total_time: Optional[float] = None,
+        attempt_timeout: Optional[float] = None,
+        remaining_time: Optional[float] = None,
+        last_result: Any = None,
+        attempt_history: Optional[deque] = None,
+        checkpoint: Any = None,
+        kwargs: dict[str, Any] = None,
+    ):
+        # written by hand to set the slots through their descriptors, going through __setattr__ below would make every call that gets a retry_config several times slower.
+        # Optional values left at their default are not set at all, __getattr__ returns the default for them
+        _set_tries(self, tries)
+        _set_retry_delay(self, retry_delay)
+        _set_raise_final_exception(self, raise_final_exception)
+        _set_retry_exceptions(self, retry_exceptions)
+        _set_fail_on_exceptions(self, fail_on_exceptions)
+        _set_retry_handler(self, retry_handler)
+        _set_exception_handler(self, exception_handler)
+        _set_attempt(self, attempt)
+        _set_previous_delay(self, previous_delay)
+        _set_kwargs(self, {} if kwargs is None else kwargs)
+        if max_total_time is not None:
+            _set_max_total_time(self, max_total_time)
+        if attempt_timeout is not None:
+            _set_attempt_timeout(self, attempt_timeout)
+        if remaining_time is not None:
+            _set_remaining_time(self, remaining_time)
+        if last_result is not None:
+            _set_last_result(self, last_result)
+        if attempt_history is not None:
+            _set_attempt_history(self, attempt_history)
+        if checkpoint is not None:
+            _set_checkpoint(self, checkpoint)
+
+    def __getattr__(self, name: str) -> Any:
+        # only called when the name is not one of the slots, or is an optional slot that was never set
+        if name in _UNSET_DEFAULTS:
+            return None
+        if name == "kwargs":
+            raise AttributeError(name)
+        try:
+            return self.kwargs[name]
+        except KeyError:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            ) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _SLOT_NAMES:
+            object.__setattr__(self, name, value)
+        else:
+            self.kwargs[name] = value
+
+    def as_dict(self) -> dict[str, Any]:
+        """Returns all built in values and additional kwargs as one dict
+
+        :return: dict of all values available to handlers
+        :rtype: dict[str, Any]
+        """
+        values = dict(self.kwargs)
+        values.update((name, getattr(self, name)) for name in RETRY_CONFIG_FIELDS)
+        return values
+
+
+# names of the built in values that are passed on to handlers
+RETRY_CONFIG_FIELDS = tuple(name for name in RetryConfig.__slots__ if name != "kwargs")
+_SLOT_NAMES = frozenset(RetryConfig.__slots__)
+
+# optional slots that default to None, they are only set when given a value
+_UNSET_DEFAULTS = frozenset(
+    (
+        "max_total_time",
+        "attempt_timeout",
+        "remaining_time",
+        "last_result",
+        "attempt_history",
+        "checkpoint",
+    )
+)
+
+# the __set__ of each slot descriptor
+(
+    _set_tries,
+    _set_retry_delay,
+    _set_raise_final_exception,
+    _set_retry_exceptions,
+    _set_fail_on_exceptions,
+    _set_retry_handler,
+    _set_exception_handler,
+    _set_attempt,
+    _set_previous_delay,
+    _set_max_total_time,
+    _set_attempt_timeout,
+    _set_remaining_time,
+    _set_last_result,
+    _set_attempt_history,
+    _set_checkpoint,
+    _set_kwargs,
+) = (getattr(RetryConfig, name).__set__ for name in RetryConfig.__slots__)
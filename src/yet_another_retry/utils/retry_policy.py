@@ -0,0 +1,447 @@
+import inspect
+import threading
+import traceback
+from collections import deque
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Callable
+
+from yet_another_retry.utils.handler_invoker import make_handler_invoker
+from yet_another_retry.utils.hedger import Hedger
+from yet_another_retry.instrumentation import MultiHooks
+from yet_another_retry.clock import get_default_clock
+from yet_another_retry.cancellation import CancellationToken, shutdown_token
+from yet_another_retry.bulkhead import RetryBulkhead
+from yet_another_retry.exceptions import RetryCancelledError, RetryResultError
+from yet_another_retry.utils.attempt_record import AttemptRecord
+from yet_another_retry.utils.exception_policy import ExceptionPolicy
+from yet_another_retry.utils.retry_config import RETRY_CONFIG_FIELDS, RetryConfig
+from yet_another_retry.utils.to_seconds import to_seconds
+
+if TYPE_CHECKING:
+    from yet_another_retry.circuit_breaker import CircuitBreaker
+    from yet_another_retry.instrumentation import RetryHooks
+    from yet_another_retry.retry_budget import RetryBudget
+
+# what to do with an exception raised by the decorated function
+FAIL = "fail"
+RETRY = "retry"
+IGNORE = "ignore"
+
+
+class RetryPolicy:
+    """All settings of a retry decorator, resolved once when the decorator is created.
+
+    The policy holds the decisions that are the same no matter how the decorated function is run, the state of one call between its attempts is kept by a RetryCall,
+    so that the sync and async wrappers only differ in how they call, await and sleep.
+
+    A policy can be pickled, it is then rebuilt from the parameters it was created with. The handlers and other parameters must be picklable themselves.
+
+    See the retry decorator for a description of the parameters.
+    """
+
+    def __init__(
+        self,
+        retry_exceptions: Exception | tuple[Exception, ...],
+        fail_on_exceptions: Exception | tuple[Exception, ...],
+        tries: int,
+        retry_delay: float | int | timedelta,
+        retry_handler: Callable,
+        exception_handler: Callable,
+        raise_final_exception: bool,
+        kwargs: dict[str, Any],
+        retry_budget: "RetryBudget" = None,
+        circuit_breaker: "CircuitBreaker" = None,
+        max_total_time: float | int | timedelta = None,
+        attempt_timeout: float | int | timedelta = None,
+        hedge_after: float | int | timedelta = None,
+        hedge_max_workers: int = None,
+        hooks: "RetryHooks | list[RetryHooks]" = None,
+        clock: Callable[[], float] = None,
+        sleeper: Callable[[float], Any] = None,
+        cancel_token: "CancellationToken | threading.Event" = None,
+        exception_policies: dict[type[BaseException], ExceptionPolicy] = None,
+        retry_on_result: Callable[[Any], bool] = None,
+        attempt_history: int = None,
+        clear_tracebacks: bool = False,
+        bulkhead: "RetryBulkhead | int" = None,
+    ):
+        # the parameters are kept to rebuild the policy when unpickled
+        self.parameters = {
+            name: value for name, value in locals().items() if name != "self"
+        }
+
+        self.retry_exceptions = retry_exceptions
+        self.fail_on_exceptions = fail_on_exceptions
+        self.tries = tries
+        self.retry_delay = retry_delay
+        self.retry_handler = retry_handler
+        self.exception_handler = exception_handler
+        self.raise_final_exception = raise_final_exception
+        self.kwargs = kwargs
+        self.retry_budget = retry_budget
+        self.circuit_breaker = circuit_breaker
+        self.max_total_time = to_seconds(max_total_time)
+        self.attempt_timeout = to_seconds(attempt_timeout)
+        self.clock = clock
+        self.sleeper = sleeper
+        self.retry_on_result = retry_on_result
+        self.attempt_history = attempt_history
+        self.clear_tracebacks = clear_tracebacks
+        self.bulkhead = (
+            RetryBulkhead(bulkhead)
+            if isinstance(bulkhead, int) and not isinstance(bulkhead, bool)
+            else bulkhead
+        )
+        self.cancel_token = (
+            CancellationToken(cancel_token)
+            if isinstance(cancel_token, threading.Event)
+            else cancel_token
+        )
+        self.hooks = MultiHooks(hooks) if isinstance(hooks, (list, tuple)) else hooks
+        self.hedger = (
+            None
+            if hedge_after is None
+            else Hedger(to_seconds(hedge_after), max_workers=hedge_max_workers)
+        )
+
+        # a retry handler that gates all attempts, like AdaptiveRateLimit, is asked before the first attempt of every call and told about every success
+        self.acquire_attempt = getattr(retry_handler, "acquire", None)
+
+        # everything that needs to know about a successful call, kept as one tuple so the success path is a single check when empty
+        self.success_callbacks = tuple(
+            obj.record_success
+            for obj in (retry_budget, circuit_breaker, retry_handler)
+            if obj is not None and hasattr(obj, "record_success")
+        )
+
+        # resolve the handler signatures once instead of on every retry
+        self.config_keys = RETRY_CONFIG_FIELDS + tuple(
+            key for key in kwargs if key not in RETRY_CONFIG_FIELDS
+        )
+        self.invoke_exception_handler = make_handler_invoker(
+            exception_handler, self.config_keys
+        )
+        self.default_retry_invoker = make_handler_invoker(
+            retry_handler, self.config_keys
+        )
+
+        self.exception_policies = dict(exception_policies or {})
+        self.retry_invokers = {
+            exception_type: make_handler_invoker(
+                exception_policy.retry_handler, self.config_keys
+            )
+            for exception_type, exception_policy in self.exception_policies.items()
+            if exception_policy.retry_handler is not None
+        }
+
+        # classification of each concrete exception type seen so far, so classifying a failure is one dict lookup
+        self.classifications: dict[type, tuple[str, int, Callable]] = {}
+
+        # the retry handler only has to be looked up per exception if a policy has its own
+        if self.retry_invokers:
+            self.invoke_retry_handler = self.invoke_exception_retry_handler
+        else:
+            self.invoke_retry_handler = self.default_retry_invoker
+
+        # handlers and sleepers that can only be used when decorating a coroutine function
+        handlers = (retry_handler, exception_handler, sleeper) + tuple(
+            exception_policy.retry_handler
+            for exception_policy in self.exception_policies.values()
+        )
+        self.has_async_handlers = any(
+            inspect.iscoroutinefunction(handler)
+            or inspect.iscoroutinefunction(getattr(handler, "__call__", None))
+            for handler in handlers
+            if handler is not None
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        return self.parameters
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def new_retry_config(self) -> RetryConfig:
+        """Creates the retry_config for one call of the decorated function
+
+        :return: A new RetryConfig
+        :rtype: RetryConfig
+        """
+        # positional, binding keyword arguments costs more than the rest of creating the config
+        return RetryConfig(
+            self.tries,
+            self.retry_delay,
+            self.raise_final_exception,
+            self.retry_exceptions,
+            self.fail_on_exceptions,
+            self.retry_handler,
+            self.exception_handler,
+            0,
+            0,
+            self.max_total_time,
+            self.attempt_timeout,
+            None,
+            None,
+            (
+                None
+                if self.attempt_history is None
+                else deque(maxlen=self.attempt_history)
+            ),
+            None,
+            dict(self.kwargs),
+        )
+
+    def record_attempt(
+        self,
+        retry_config: RetryConfig,
+        attempt: int,
+        e: BaseException,
+        duration: float,
+        delay: float = None,
+    ) -> None:
+        """Adds a record of a failed attempt to the attempt history
+
+        :param retry_config: The retry_config of the call
+        :type retry_config: RetryConfig
+
+        :param attempt: The attempt that failed
+        :type attempt: int
+
+        :param e: The exception of the attempt
+        :type e: BaseException
+
+        :param duration: Seconds the attempt took
+        :type duration: float
+
+        :param delay: Seconds slept before the next attempt, None if it is not retried
+        :type delay: float, optional
+        """
+        exception_type = type(e)
+        retry_config.attempt_history.append(
+            AttemptRecord(
+                attempt=attempt,
+                exception_type=f"{exception_type.__module__}.{exception_type.__qualname__}",
+                message=str(e),
+                duration=duration,
+                delay=delay,
+            )
+        )
+
+    def clear_traceback(self, e: BaseException) -> None:
+        """Clears the frames of the traceback of a retried exception and removes the traceback, freeing the variables of the failed attempt
+
+        :param e: The exception that is retried
+        :type e: BaseException
+        """
+        # frames that are still running, like the one of the wrapper, are skipped by clear_frames
+        traceback.clear_frames(e.__traceback__)
+        e.__traceback__ = None
+
+    def add_history_note(self, e: BaseException, retry_config: RetryConfig) -> None:
+        """Adds the attempt history to the final exception as a note, shown below its traceback
+
+        Notes need python 3.11 or later, on older versions the history is only available on the retry_config.
+
+        :param e: The final exception
+        :type e: BaseException
+
+        :param retry_config: The retry_config of the call
+        :type retry_config: RetryConfig
+        """
+        history = retry_config.attempt_history
+        if not history or not hasattr(e, "add_note"):
+            return
+
+        lines = [f"{history[-1].attempt} attempts failed, the last {len(history)}:"]
+        lines.extend(f"  {record}" for record in history)
+        e.add_note("\n".join(lines))
+
+    def now(self) -> float:
+        """Returns the current time from the clock, or from the default clock if none was given
+
+        :return: Current time in seconds
+        :rtype: float
+        """
+        if self.clock is not None:
+            return self.clock()
+        return get_default_clock().now()
+
+    def sleep(self, seconds: float) -> bool:
+        """Sleeps with the sleeper, or with the default clock if none was given, until the cancel token is cancelled
+
+        A sleeper that was given can not be woken up, the cancel token is only checked after it returns.
+
+        :param seconds: Number of seconds to sleep
+        :type seconds: float
+
+        :return: True if the cancel token is cancelled
+        :rtype: bool
+        """
+        cancel_token = self.get_cancel_token()
+        if self.sleeper is not None:
+            self.sleeper(seconds)
+        else:
+            get_default_clock().sleep(seconds, cancel_token)
+        return cancel_token.cancelled
+
+    async def async_sleep(self, seconds: float) -> bool:
+        """Async version of sleep(), the sleeper may also be a coroutine function
+
+        :param seconds: Number of seconds to sleep
+        :type seconds: float
+
+        :return: True if the cancel token is cancelled
+        :rtype: bool
+        """
+        cancel_token = self.get_cancel_token()
+        if self.sleeper is not None:
+            sleep_result = self.sleeper(seconds)
+            if inspect.isawaitable(sleep_result):
+                await sleep_result
+        else:
+            await get_default_clock().async_sleep(seconds, cancel_token)
+        return cancel_token.cancelled
+
+    def get_cancel_token(self) -> CancellationToken:
+        """Returns the cancel token of the policy, or the global shutdown_token if it has none
+
+        :return: The cancel token
+        :rtype: CancellationToken
+        """
+        if self.cancel_token is not None:
+            return self.cancel_token
+        return shutdown_token
+
+    def cancelled_error(self, e: BaseException, attempt: int) -> RetryCancelledError:
+        """Creates the exception for a call whose retries were cancelled
+
+        :param e: The exception of the last attempt, set as __cause__
+        :type e: BaseException
+
+        :param attempt: The last attempt
+        :type attempt: int
+
+        :return: The exception to pass to the exception handler
+        :rtype: RetryCancelledError
+        """
+        cancelled_error = RetryCancelledError(attempt)
+        cancelled_error.__cause__ = e
+        return cancelled_error
+
+    def get_deadline(self) -> float | None:
+        """Returns the clock time a call starting now has to finish by
+
+        :return: The deadline, or None if max_total_time is not set
+        :rtype: float | None
+        """
+        if self.max_total_time is None:
+            return None
+
+        return self.now() + self.max_total_time
+
+    def update_remaining_time(self, retry_config: RetryConfig, deadline: float) -> None:
+        """Updates remaining_time and attempt_timeout on the retry_config from the deadline
+
+        :param retry_config: The retry_config of the call
+        :type retry_config: RetryConfig
+
+        :param deadline: The deadline from get_deadline()
+        :type deadline: float
+        """
+        remaining_time = deadline - self.now()
+        retry_config.remaining_time = remaining_time
+
+        # an attempt can not be given more time than what is left
+        if self.attempt_timeout is None or remaining_time < self.attempt_timeout:
+            retry_config.attempt_timeout = max(remaining_time, 0)
+        else:
+            retry_config.attempt_timeout = self.attempt_timeout
+
+    def classify(self, e: BaseException, attempt: int) -> str:
+        """Decides what to do with an exception raised by the decorated function
+
+        :param e: The exception that occurred
+        :type e: BaseException
+
+        :param attempt: The attempt that raised the exception
+        :type attempt: int
+
+        The retry budget is not asked here, a retry only takes a token once it is certain to happen, see RetryCall.retry.
+
+        :return: FAIL to call the exception handler, RETRY to call the retry handler or IGNORE to exit the decorator
+        :rtype: str
+        """
+
+        classification = self.classifications.get(type(e))
+        if classification is None:
+            classification = self.classify_type(type(e))
+        action, tries, _ = classification
+
+        if action is not RETRY:
+            return action
+
+        # we are out of tries
+        if attempt >= tries:
+            return FAIL
+
+        return RETRY
+
+    def classify_type(self, exception_type: type) -> tuple[str, int, Callable]:
+        """Classifies an exception type and caches the result
+
+        The closest exception policy in the MRO of the type wins, types without a policy are classified by fail_on_exceptions and retry_exceptions.
+
+        :param exception_type: The concrete type of a raised exception
+        :type exception_type: type
+
+        :return: FAIL, RETRY if it may be retried or IGNORE, the tries and the retry handler invoker for the type
+        :rtype: tuple[str, int, Callable]
+        """
+        for cls in exception_type.__mro__:
+            exception_policy = self.exception_policies.get(cls)
+            if exception_policy is not None:
+                classification = (
+                    FAIL if exception_policy.fail else RETRY,
+                    (
+                        self.tries
+                        if exception_policy.tries is None
+                        else exception_policy.tries
+                    ),
+                    self.retry_invokers.get(cls, self.default_retry_invoker),
+                )
+                break
+
+        # if we hit an exception that is not in either retry_exceptions or fail_on_exceptions we exit the decorator
+        else:
+            # rejected results are always retried, they are not in retry_exceptions
+            if issubclass(exception_type, RetryResultError):
+                action = RETRY
+            elif issubclass(exception_type, self.fail_on_exceptions):
+                action = FAIL
+            elif issubclass(exception_type, self.retry_exceptions):
+                action = RETRY
+            else:
+                action = IGNORE
+            classification = (action, self.tries, self.default_retry_invoker)
+
+        self.classifications[exception_type] = classification
+        return classification
+
+    def invoke_exception_retry_handler(
+        self, e: BaseException, retry_config: RetryConfig
+    ) -> Any:
+        """Calls the retry handler of the exception policy for the exception, or the retry handler of the decorator
+
+        :param e: The exception that occurred
+        :type e: BaseException
+
+        :param retry_config: The retry_config of the call
+        :type retry_config: RetryConfig
+
+        :return: What the retry handler returned
+        :rtype: Any
+        """
+        classification = self.classifications.get(type(e))
+        if classification is None:
+            classification = self.classify_type(type(e))
+        return classification[2](e, retry_config)
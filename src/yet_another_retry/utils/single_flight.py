@@ -0,0 +1,113 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class _Call:
+    """An in-flight call that other callers with the same key wait for"""
+
+    __slots__ = ("done", "result", "exception")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class SingleFlight:
+    """Lets concurrent calls with the same key share one execution.
+
+    The first caller with a key runs the function, callers arriving while it runs wait for it and get the same result or exception.
+    The key is forgotten as soon as the call finishes, so later calls run again.
+    Regular calls are shared between threads, async calls are shared between tasks of the same event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._async_calls: dict[
+            tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future
+        ] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Runs fn, or waits for the call already running with the same key
+
+        :param key: Key identifying calls that can share a result
+        :type key: Hashable
+
+        :param fn: The function to run
+        :type fn: Callable[[], Any]
+
+        :return: The result of fn
+        :rtype: Any
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+
+        if not is_leader:
+            call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable]) -> Any:
+        """Async version of do(), fn is a function returning an awaitable
+
+        If the task running the call is cancelled, the waiting tasks get a CancelledError as well.
+
+        :param key: Key identifying calls that can share a result
+        :type key: Hashable
+
+        :param fn: Function returning the awaitable to run
+        :type fn: Callable[[], Awaitable]
+
+        :return: The result of the awaitable
+        :rtype: Any
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (loop, key)
+
+        with self._lock:
+            future = self._async_calls.get(loop_key)
+            is_leader = future is None
+            if is_leader:
+                future = self._async_calls[loop_key] = loop.create_future()
+                # the exception is retrieved even if no other task waits for it, to avoid asyncio warnings
+                future.add_done_callback(_retrieve_exception)
+
+        if not is_leader:
+            return await asyncio.shield(future)
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._async_calls[loop_key]
+
+
+def _retrieve_exception(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+
+def to_seconds(value: int | float | timedelta | None) -> float | None:
+    """Converts a time value given to the decorator to seconds
+
+    :param value: Time as seconds or a timedelta, or None
+    :type value: int | float | timedelta | None
+
+    :return: Number of seconds, or None if value is None
+    :rtype: float | None
+    """
+
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+
+    return value
@@ -0,0 +1,91 @@
+import asyncio
+import pytest
+from yet_another_retry import retry
+from yet_another_retry.retry_handlers import AdaptiveRateLimit
+from yet_another_retry.testing import virtual_clock
+
+
+class ThrottledError(Exception):
+    pass
+
+
+def test_adaptive_rate_limit_aimd(virtual_clock):
+
+    limit = AdaptiveRateLimit(
+        throttling_exceptions=ThrottledError, initial_rate=8, decrease_cooldown=1
+    )
+
+    # throttling halves the rate, only once per cooldown
+    limit.record_throttle()
+    limit.record_throttle()
+    assert limit.rate == 4
+    assert limit.throttles == 2
+
+    virtual_clock.advance(1)
+    limit.record_throttle()
+    assert limit.rate == 2
+
+    # each success adds increase / rate
+    limit.record_success()
+    assert limit.rate == 2.5
+
+    # other exceptions do not lower the rate
+    limit(ValueError("not throttled"))
+    assert limit.rate == 2.5
+
+
+def test_adaptive_rate_limit_token_bucket(virtual_clock):
+
+    limit = AdaptiveRateLimit(initial_rate=2)
+
+    # a burst of one second worth of attempts, then callers queue up at the rate
+    assert limit.acquire() == 0
+    assert limit.acquire() == 0
+    assert limit.acquire() == 0.5
+    assert limit.acquire() == 1
+
+    virtual_clock.advance(1)
+    assert limit.acquire() == 0.5
+
+
+def test_adaptive_rate_limit_decorator(virtual_clock):
+
+    limit = AdaptiveRateLimit(
+        throttling_exceptions=ThrottledError, initial_rate=1, min_rate=0.25
+    )
+    calls = []
+
+    @retry(tries=3, retry_handler=limit)
+    def function_to_retry():
+        calls.append(virtual_clock.now())
+        if len(calls) < 3:
+            raise ThrottledError("Slow down")
+        return "ok"
+
+    assert function_to_retry() == "ok"
+
+    # the first attempt takes the only token, retries wait for tokens at the lowered rate
+    assert calls == [0, 2, 6]
+    assert limit.throttles == 2
+    assert limit.rate == 0.25 + 1 / 0.25
+
+    # the next call waits for a token before the first attempt
+    calls.clear()
+    function_to_retry()
+    assert virtual_clock.delays[-1] > 0
+
+
+def test_adaptive_rate_limit_async(virtual_clock):
+
+    limit = AdaptiveRateLimit(initial_rate=1)
+
+    @retry(tries=2, retry_handler=limit)
+    async def function_to_call():
+        return "ok"
+
+    async def main():
+        return await asyncio.gather(*(function_to_call() for _ in range(3)))
+
+    assert asyncio.run(main()) == ["ok", "ok", "ok"]
+    # only the first call got a token right away
+    assert len(virtual_clock.delays) == 2
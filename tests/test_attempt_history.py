@@ -0,0 +1,83 @@
+import asyncio
+import gc
+import sys
+import weakref
+import pytest
+from yet_another_retry import retry, AttemptRecord, RetryConfig
+
+
+class Payload:
+    pass
+
+
+def test_attempt_history_records():
+
+    histories = []
+
+    @retry(tries=4, retry_delay=0, attempt_history=2)
+    def function_to_retry(retry_config: RetryConfig):
+        histories.append(list(retry_config.attempt_history))
+        raise ValueError(f"failed {retry_config.attempt}")
+
+    with pytest.raises(ValueError) as exc_info:
+        function_to_retry()
+
+    # the history is capped to the latest records
+    assert [len(history) for history in histories] == [0, 1, 2, 2]
+    assert [record.attempt for record in histories[-1]] == [2, 3]
+
+    record = histories[-1][-1]
+    assert isinstance(record, AttemptRecord)
+    assert record.exception_type == "builtins.ValueError"
+    assert record.message == "failed 3"
+    assert record.delay == 0
+    assert record.duration >= 0
+
+    if sys.version_info >= (3, 11):
+        note = exc_info.value.__notes__[0]
+        assert note.startswith("4 attempts failed, the last 2:")
+        assert "failed 4" in note
+
+
+def test_attempt_history_async():
+
+    @retry(tries=2, attempt_history=10)
+    async def function_to_retry(retry_config: RetryConfig):
+        if retry_config.attempt == 1:
+            raise KeyError("missing")
+        return [record.exception_type for record in retry_config.attempt_history]
+
+    assert asyncio.run(function_to_retry()) == ["builtins.KeyError"]
+
+
+def test_clear_tracebacks_frees_locals():
+
+    payloads = []
+    errors = []
+
+    def retry_handler(e: Exception):
+        errors.append(e)
+        return 0
+
+    def exception_handler(e: Exception):
+        errors.append(e)
+
+    @retry(
+        tries=2,
+        clear_tracebacks=True,
+        retry_handler=retry_handler,
+        exception_handler=exception_handler,
+        raise_final_exception=False,
+    )
+    def function_to_retry():
+        payload = Payload()
+        payloads.append(weakref.ref(payload))
+        raise ValueError("This is an exception")
+
+    function_to_retry()
+    gc.collect()
+
+    # the retried exception is kept alive by the test but not the payload of its attempt, the final one keeps its traceback
+    assert errors[0].__traceback__ is None
+    assert payloads[0]() is None
+    assert errors[1].__traceback__ is not None
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import pytest
+from yet_another_retry import retry, RetryBulkhead
+
+
+def test_bulkhead_slots():
+
+    bulkhead = RetryBulkhead(max_concurrent_retries=1)
+
+    assert bulkhead.try_acquire()
+    assert not bulkhead.acquire()
+    assert bulkhead.rejected == 1
+
+    bulkhead.release()
+    assert bulkhead.active == 0
+    assert bulkhead.acquire()
+
+
+def test_bulkhead_waiting_queue():
+
+    bulkhead = RetryBulkhead(max_concurrent_retries=1, max_waiting=1)
+    assert bulkhead.acquire()
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(bulkhead.acquire()))
+    waiter.start()
+    while not bulkhead.waiting:
+        pass
+
+    # the queue is full
+    assert not bulkhead.acquire()
+
+    # the slot is handed to the waiter
+    bulkhead.release()
+    waiter.join()
+    assert results == [True]
+    assert bulkhead.active == 1
+
+    timeout_bulkhead = RetryBulkhead(1, max_waiting=1, wait_timeout=0.01)
+    assert timeout_bulkhead.acquire()
+    assert not timeout_bulkhead.acquire()
+    assert timeout_bulkhead.waiting == 0
+
+
+def test_bulkhead_fails_fast_in_decorator():
+
+    calls = []
+    retrying = threading.Event()
+    proceed = threading.Event()
+
+    def retry_handler(e: Exception):
+        retrying.set()
+        proceed.wait()
+        return 0
+
+    @retry(tries=2, bulkhead=1, retry_handler=retry_handler)
+    def function_to_retry(name: str):
+        calls.append(name)
+        raise ValueError("This is an exception")
+
+    def first_call():
+        with pytest.raises(ValueError):
+            function_to_retry("first")
+
+    thread = threading.Thread(target=first_call)
+    thread.start()
+    retrying.wait()
+
+    # the only slot is held by the first call, the second is not retried
+    with pytest.raises(ValueError):
+        function_to_retry("second")
+
+    proceed.set()
+    thread.join()
+    assert calls == ["first", "second", "first"]
+    assert function_to_retry.retry_policy.bulkhead.active == 0
+
+
+def test_bulkhead_async():
+
+    bulkhead = RetryBulkhead(max_concurrent_retries=1, max_waiting=5)
+    attempts = {}
+
+    @retry(tries=2, bulkhead=bulkhead)
+    async def function_to_retry(name: str):
+        attempts[name] = attempts.get(name, 0) + 1
+        await asyncio.sleep(0)
+        if attempts[name] == 1:
+            raise ValueError("This is an exception")
+        return name
+
+    async def main():
+        return await asyncio.gather(*(function_to_retry(name) for name in "abc"))
+
+    # all calls retry, one at a time
+    assert asyncio.run(main()) == ["a", "b", "c"]
+    assert bulkhead.active == 0
+    assert bulkhead.rejected == 0
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import time
+import pytest
+from yet_another_retry import (
+    retry,
+    CancellationToken,
+    RetryCancelledError,
+    cancel_all_retries,
+    shutdown_token,
+)
+
+
+def cancel_later(cancel, delay: float = 0.05):
+    timer = threading.Timer(delay, cancel)
+    timer.start()
+    return timer
+
+
+def test_cancel_token_wakes_sleeping_call():
+
+    token = CancellationToken()
+    handled = []
+
+    @retry(
+        tries=3, retry_delay=10, cancel_token=token, exception_handler=handled.append
+    )
+    def function_to_retry():
+        raise ValueError("This is an exception")
+
+    cancel_later(token.cancel)
+    start = time.monotonic()
+    with pytest.raises(RetryCancelledError) as exc_info:
+        function_to_retry()
+
+    assert time.monotonic() - start < 5
+    assert isinstance(exc_info.value.__cause__, ValueError)
+    assert isinstance(handled[0], RetryCancelledError)
+
+
+def test_cancel_with_threading_event():
+
+    event = threading.Event()
+
+    @retry(tries=3, retry_delay=10, cancel_token=event)
+    async def function_to_retry():
+        raise ValueError("This is an exception")
+
+    cancel_later(event.set)
+    start = time.monotonic()
+    with pytest.raises(RetryCancelledError):
+        asyncio.run(function_to_retry())
+
+    assert time.monotonic() - start < 5
+
+
+def test_cancel_all_retries_async():
+
+    @retry(tries=3, retry_delay=10)
+    async def function_to_retry():
+        raise ValueError("This is an exception")
+
+    async def run_many():
+        return await asyncio.gather(
+            *(function_to_retry() for _ in range(100)), return_exceptions=True
+        )
+
+    cancel_later(cancel_all_retries)
+    try:
+        start = time.monotonic()
+        results = asyncio.run(run_many())
+        assert time.monotonic() - start < 5
+        assert all(isinstance(result, RetryCancelledError) for result in results)
+    finally:
+        shutdown_token.reset()
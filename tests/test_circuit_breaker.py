@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from yet_another_retry import retry, CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_circuit_breaker_states():
+
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        failure_rate_threshold=0.5,
+        window_size=4,
+        minimum_calls=4,
+        cooldown=10,
+        clock=clock,
+    )
+
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_exception(Exception())
+    assert breaker.state == "closed"
+
+    breaker.record_exception(Exception())
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+    clock.now = 10
+    assert breaker.state == "half_open"
+
+    # only one trial attempt is allowed at a time
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_exception(Exception())
+    assert breaker.state == "open"
+
+    clock.now = 20
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_circuit_breaker_ignores_other_exceptions():
+
+    breaker = CircuitBreaker(
+        window_size=2, minimum_calls=2, failure_exceptions=ConnectionError
+    )
+
+    breaker.record_exception(ValueError())
+    breaker.record_exception(ValueError())
+    assert breaker.state == "closed"
+
+
+def test_circuit_breaker_cancelled_trial_frees_slot():
+
+    clock = FakeClock()
+    breaker = CircuitBreaker(window_size=2, minimum_calls=2, cooldown=10, clock=clock)
+    breaker.record_exception(Exception())
+    breaker.record_exception(Exception())
+    assert breaker.state == "open"
+
+    clock.now = 10
+    for interrupted in (KeyboardInterrupt(), asyncio.CancelledError()):
+        assert breaker.allow_request()
+        # not a success, the circuit stays half-open and the next trial can go
+        breaker.record_exception(interrupted)
+        assert breaker.state == "half_open"
+
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_retry_circuit_breaker_fails_fast():
+
+    breaker = CircuitBreaker(window_size=2, minimum_calls=2, cooldown=60)
+    calls = []
+
+    @retry(tries=5, circuit_breaker=breaker)
+    def function_to_retry():
+        calls.append(1)
+        raise ConnectionError("This is an exception")
+
+    with pytest.raises(CircuitOpenError):
+        function_to_retry()
+    assert len(calls) == 2
+
+    with pytest.raises(CircuitOpenError):
+        function_to_retry()
+    assert len(calls) == 2
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import time
+import pytest
+from yet_another_retry import retry
+
+
+def test_coalesce_threads_share_one_call():
+
+    calls = []
+    results = []
+    start = threading.Barrier(5)
+
+    @retry(tries=3, coalesce_key=True)
+    def fetch(key: str):
+        calls.append(key)
+        time.sleep(0.1)
+        return key.upper()
+
+    def call():
+        start.wait()
+        results.append(fetch("a"))
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["A"] * 5
+    assert calls == ["a"]
+
+    # the key is forgotten once the call finished
+    assert fetch("a") == "A"
+    assert calls == ["a", "a"]
+
+
+def test_coalesce_async_shares_final_exception():
+
+    calls = []
+
+    @retry(tries=2, coalesce_key=lambda key, **kwargs: key)
+    async def fetch(key: str, other: int = 0):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        raise ConnectionError(key)
+
+    async def run():
+        return await asyncio.gather(
+            fetch("a", other=1), fetch("a", other=2), fetch("b"), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert [type(result) for result in results] == [ConnectionError] * 3
+    assert results[0] is results[1]
+    assert sorted(calls) == ["a", "a", "b", "b"]
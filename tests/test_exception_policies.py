@@ -0,0 +1,91 @@
+import pytest
+from yet_another_retry import retry, ExceptionPolicy, RetryConfig
+
+
+class ThrottledError(Exception):
+    pass
+
+
+class SlowDownError(ThrottledError):
+    pass
+
+
+def test_exception_policies_tries_and_handlers():
+
+    delays = []
+
+    def slow_handler(e: Exception, attempt: int) -> float:
+        delays.append(("slow", attempt))
+        return 0
+
+    def fast_handler(e: Exception, attempt: int) -> float:
+        delays.append(("fast", attempt))
+        return 0
+
+    errors = [TimeoutError(), SlowDownError(), TimeoutError(), ThrottledError()]
+
+    @retry(
+        tries=2,
+        retry_handler=fast_handler,
+        exception_policies={
+            ThrottledError: ExceptionPolicy(tries=5, retry_handler=slow_handler),
+            TimeoutError: ExceptionPolicy(tries=10),
+        },
+    )
+    def function_to_retry():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    assert function_to_retry() == "ok"
+
+    # subclasses use the policy of their closest base class
+    assert delays == [("fast", 1), ("slow", 2), ("fast", 3), ("slow", 4)]
+
+
+def test_exception_policies_fail_and_retry_exceptions():
+
+    calls = []
+
+    @retry(
+        retry_exceptions=ValueError,
+        exception_policies={
+            KeyError: ExceptionPolicy(tries=3),
+            LookupError: ExceptionPolicy(fail=True),
+        },
+    )
+    def function_to_retry(error: Exception):
+        calls.append(1)
+        raise error
+
+    # KeyError is retried even though it is not in retry_exceptions
+    with pytest.raises(KeyError):
+        function_to_retry(KeyError())
+    assert len(calls) == 3
+
+    calls.clear()
+    with pytest.raises(IndexError):
+        function_to_retry(IndexError())
+    assert len(calls) == 1
+
+    # classifications are cached per concrete type
+    assert set(function_to_retry.retry_policy.classifications) == {
+        KeyError,
+        IndexError,
+    }
+
+
+def test_exception_policies_tries_count_the_whole_call():
+
+    @retry(
+        tries=10,
+        exception_policies={ThrottledError: ExceptionPolicy(tries=2)},
+    )
+    def function_to_retry(retry_config: RetryConfig):
+        if retry_config.attempt < 3:
+            raise TimeoutError()
+        raise ThrottledError()
+
+    # the third attempt is already past the tries of ThrottledError
+    with pytest.raises(ThrottledError):
+        function_to_retry()
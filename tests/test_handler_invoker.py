@@ -0,0 +1,36 @@
+import pytest
+from types import SimpleNamespace
+from yet_another_retry.utils import make_handler_invoker
+
+
+def test_handler_invoker_filters_params():
+
+    def handler(e: Exception, attempt: int, custom_value: str):
+        return (attempt, custom_value)
+
+    retry_config = SimpleNamespace(attempt=2, tries=3, custom_value="foo")
+    invoke = make_handler_invoker(handler, ["attempt", "tries", "custom_value"])
+
+    assert invoke(Exception(), retry_config) == (2, "foo")
+
+
+def test_handler_invoker_kwargs():
+
+    def handler(e: Exception, **kwargs):
+        return kwargs
+
+    retry_config = SimpleNamespace(attempt=1, tries=3)
+    invoke = make_handler_invoker(handler, ["attempt", "tries"])
+
+    assert invoke(Exception(), retry_config) == {"attempt": 1, "tries": 3}
+
+
+def test_handler_invoker_only_exception():
+
+    def handler(e: Exception):
+        return e
+
+    e = Exception()
+    invoke = make_handler_invoker(handler, ["attempt"])
+
+    assert invoke(e, SimpleNamespace(attempt=1)) is e
@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import time
+import pytest
+from yet_another_retry import retry
+
+
+def test_retry_hedge_after_uses_fastest_attempt():
+
+    calls = []
+    lock = threading.Lock()
+
+    @retry(tries=3, hedge_after=0.05)
+    def slow_first_call():
+        with lock:
+            calls.append(1)
+            call_nr = len(calls)
+        if call_nr == 1:
+            time.sleep(0.5)
+            return "slow"
+        return "fast"
+
+    start = time.monotonic()
+    assert slow_first_call() == "fast"
+    assert time.monotonic() - start < 0.4
+    assert len(calls) == 2
+
+
+def test_retry_hedges_count_against_tries():
+
+    calls = []
+
+    @retry(tries=2, hedge_after=0.01)
+    def always_fails():
+        calls.append(1)
+        time.sleep(0.05)
+        raise ValueError("This is an exception")
+
+    with pytest.raises(ValueError):
+        always_fails()
+
+    # the primary and one hedge, no retries left after that
+    assert len(calls) == 2
+
+
+def test_retry_hedge_after_async():
+
+    calls = []
+
+    @retry(tries=3, hedge_after=0.05)
+    async def slow_first_call():
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(0.5)
+            return "slow"
+        return "fast"
+
+    assert asyncio.run(slow_first_call()) == "fast"
+    assert len(calls) == 2
@@ -0,0 +1,78 @@
+import pytest
+from yet_another_retry import retry, RetryHooks, RetryStats
+
+
+class RecordingHooks(RetryHooks):
+    def __init__(self):
+        self.events = []
+
+    def on_attempt_start(self, name, attempt):
+        self.events.append(("start", attempt))
+
+    def on_attempt_end(self, name, attempt, duration, e):
+        self.events.append(("end", attempt, e is None))
+
+    def on_retry(self, name, attempt, delay, e):
+        self.events.append(("retry", attempt, delay))
+
+    def on_give_up(self, name, attempt, e, total_sleep):
+        self.events.append(("give_up", attempt, total_sleep))
+
+    def on_success(self, name, attempt, total_sleep):
+        self.events.append(("success", attempt, total_sleep))
+
+
+def test_hooks_events():
+
+    hooks = RecordingHooks()
+    calls = []
+
+    @retry(tries=3, retry_delay=0.01, hooks=hooks)
+    def function_to_retry():
+        calls.append(1)
+        if len(calls) < 2:
+            raise ValueError("This is an exception")
+        return True
+
+    assert function_to_retry()
+    assert hooks.events == [
+        ("start", 1),
+        ("end", 1, False),
+        ("retry", 1, 0.01),
+        ("start", 2),
+        ("end", 2, True),
+        ("success", 2, 0.01),
+    ]
+
+
+def test_retry_stats():
+
+    stats = RetryStats()
+    other_hooks = RecordingHooks()
+
+    @retry(tries=2, hooks=[stats, other_hooks])
+    def always_fails():
+        raise ValueError("This is an exception")
+
+    @retry(hooks=stats)
+    def succeeds():
+        return True
+
+    with pytest.raises(ValueError):
+        always_fails()
+    succeeds()
+
+    snapshot = stats.snapshot()
+    failing = snapshot[f"{__name__}.test_retry_stats.<locals>.always_fails"]
+    assert failing["calls"] == 1
+    assert failing["give_ups"] == 1
+    assert failing["attempts"] == 2
+    assert failing["retries"] == 1
+    assert failing["exceptions"] == {"ValueError": 2}
+    assert failing["attempts_histogram"] == {2: 1}
+
+    succeeding = snapshot[f"{__name__}.test_retry_stats.<locals>.succeeds"]
+    assert succeeding["successes"] == 1
+    assert sum(succeeding["latency_histogram"].values()) == 1
+
+    assert other_hooks.events[-1] == ("give_up", 2, 0)
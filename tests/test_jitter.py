@@ -0,0 +1,117 @@
+import pickle
+import random
+from datetime import timedelta
+
+import pytest
+from yet_another_retry import retry, RetryConfig
+from yet_another_retry.retry_handlers import (
+    JitteredBackoff,
+    decorrelated_jitter,
+    equal_jitter,
+    full_jitter,
+)
+
+
+def test_full_jitter():
+
+    for attempt in range(1, 8):
+        delay = full_jitter(Exception(), attempt, max_delay_seconds=30)
+        assert 0 <= delay <= min(2**attempt, 30)
+
+    # same seed, same delays
+    first = [full_jitter(Exception(), 3, jitter_rng=random.Random(1)) for _ in range(3)]
+    second = [
+        full_jitter(Exception(), 3, jitter_rng=random.Random(1)) for _ in range(3)
+    ]
+    assert first == second
+
+
+def test_equal_jitter():
+
+    for attempt in range(1, 8):
+        delay = equal_jitter(
+            Exception(), attempt, retry_delay=timedelta(seconds=1), max_delay_seconds=30
+        )
+        window = min(2**attempt, 30)
+        assert window / 2 <= delay <= window
+
+
+def test_decorrelated_jitter():
+
+    # first retry, previous_delay is 0
+    assert 1 <= decorrelated_jitter(Exception(), previous_delay=0) <= 3
+
+    previous_delay = 0
+    for _ in range(20):
+        delay = decorrelated_jitter(
+            Exception(), previous_delay=previous_delay, max_delay_seconds=10
+        )
+        assert 1 <= delay <= min((previous_delay or 1) * 3, 10)
+        previous_delay = delay
+
+
+def test_jittered_backoff_schedule():
+
+    handler = JitteredBackoff("equal", retry_delay=0.5, max_delay_seconds=10, seed=1)
+
+    # the schedule stops at the cap
+    assert len(handler._schedule) == 5
+    for attempt in range(1, 100):
+        window = min(0.5 * 2**attempt, 10)
+        assert window / 2 <= handler(Exception(), attempt, 0) <= window
+
+    same = JitteredBackoff("equal", retry_delay=0.5, max_delay_seconds=10, seed=1)
+    other = JitteredBackoff("equal", retry_delay=0.5, max_delay_seconds=10, seed=1)
+    assert [same(Exception(), 3, 0) for _ in range(5)] == [
+        other(Exception(), 3, 0) for _ in range(5)
+    ]
+
+    # uncapped attempts past the schedule are computed
+    uncapped = JitteredBackoff(schedule_size=4)
+    assert 0 <= uncapped(Exception(), 10, 0) <= 2**10
+
+    with pytest.raises(ValueError):
+        JitteredBackoff("none")
+
+
+def test_jittered_backoff_in_decorator():
+
+    handler = JitteredBackoff(
+        "decorrelated", retry_delay=1, max_delay_seconds=5, seed=7
+    )
+    delays = []
+
+    @retry(tries=6, retry_handler=handler, sleeper=delays.append)
+    def fails(retry_config: RetryConfig):
+        if retry_config.attempt < 6:
+            raise ValueError("This is an exception")
+        return retry_config.previous_delay
+
+    assert fails() == delays[-1]
+    assert len(delays) == 5
+    assert all(1 <= delay <= 5 for delay in delays)
+
+    # the random number generator keeps its state when pickled
+    copy = pickle.loads(pickle.dumps(handler))
+    assert copy(Exception(), 1, 2) == handler(Exception(), 1, 2)
+
+
+def test_jitter_rng_from_decorator():
+
+    delays = []
+
+    @retry(
+        tries=4,
+        retry_handler=full_jitter,
+        retry_delay=1,
+        jitter_rng=random.Random(3),
+        sleeper=delays.append,
+    )
+    def fails():
+        raise ValueError("This is an exception")
+
+    with pytest.raises(ValueError):
+        fails()
+
+    rng = random.Random(3)
+    assert delays == [2**attempt * rng.random() for attempt in range(1, 4)]
@@ -0,0 +1,66 @@
+import asyncio
+import os
+import pickle
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from yet_another_retry import (
+    retry,
+    RetryBudget,
+    RetryConfig,
+    RetryingFunction,
+    submit_retry,
+)
+
+
+@retry(tries=3, retry_budget=RetryBudget())
+def succeeds_on_last_try(value: int, retry_config: RetryConfig):
+    """Docstring of the decorated function"""
+    if retry_config.attempt < retry_config.tries:
+        raise ValueError("This is an exception")
+    return value, os.getpid()
+
+
+@retry(tries=2)
+async def async_function(value: int):
+    await asyncio.sleep(0)
+    return value
+
+
+def plain_function(value: int):
+    return value * 2
+
+
+def test_decorated_function_metadata():
+
+    assert succeeds_on_last_try.__name__ == "succeeds_on_last_try"
+    assert succeeds_on_last_try.__doc__ == "Docstring of the decorated function"
+    assert succeeds_on_last_try.__wrapped__ is not None
+    assert succeeds_on_last_try.retry_policy.tries == 3
+
+
+def test_decorated_function_and_policy_pickle():
+
+    assert pickle.loads(pickle.dumps(succeeds_on_last_try)) is succeeds_on_last_try
+
+    policy = pickle.loads(pickle.dumps(succeeds_on_last_try.retry_policy))
+    assert policy.tries == 3
+    assert policy.retry_budget is not succeeds_on_last_try.retry_policy.retry_budget
+
+
+def test_submit_retry():
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        value, pid = submit_retry(executor, succeeds_on_last_try, 1).result()
+        assert value == 1
+        assert pid != os.getpid()
+
+        assert submit_retry(executor, async_function, 2).result() == 2
+
+        retrying = RetryingFunction(plain_function, tries=2)
+        assert submit_retry(executor, retrying, 3).result() == 6
+
+
+def test_submit_retry_requires_retry():
+
+    with pytest.raises(TypeError):
+        submit_retry(None, plain_function, 1)
@@ -1,5 +1,6 @@
 import pytest
-from yet_another_retry import retry, RetryConfig
+from yet_another_retry import retry, RetryBudget, RetryConfig
+from yet_another_retry.testing import virtual_clock
 
 
 def test_retry():
@@ -19,3 +20,103 @@ def function_to_retry(retry_config: RetryConfig):
         return True
 
     raise Exception("This is an exception")
+
+
+def test_retry_success_does_not_create_config(monkeypatch):
+
+    created = []
+    original_init = RetryConfig.__init__
+
+    def tracking_init(self, *args, **kwargs):
+        created.append(self)
+        original_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(RetryConfig, "__init__", tracking_init)
+
+    @retry()
+    def succeeds():
+        return True
+
+    assert succeeds()
+    assert created == []
+
+
+def test_retry_fail_on_exceptions_without_raise():
+
+    calls = []
+
+    @retry(
+        fail_on_exceptions=ValueError,
+        raise_final_exception=False,
+        exception_handler=lambda e: None,
+    )
+    def fails():
+        calls.append(1)
+        raise ValueError("fail")
+
+    assert fails() is None
+    assert len(calls) == 1
+
+
+def test_retry_max_total_time(virtual_clock):
+
+    calls = []
+
+    @retry(tries=10, retry_delay=5, max_total_time=12)
+    def function_to_retry(retry_config: RetryConfig):
+        calls.append(retry_config.remaining_time)
+        raise Exception("This is an exception")
+
+    try:
+        function_to_retry()
+        assert False
+    except Exception:
+        pass
+
+    # 12 seconds only fits two sleeps of 5 seconds
+    assert calls == [12, 7, 2]
+    assert virtual_clock.delays == [5, 5]
+
+
+def test_retry_max_total_time_keeps_budget_tokens(virtual_clock):
+
+    budget = RetryBudget(retry_ratio=0, max_tokens=5)
+
+    @retry(tries=10, retry_delay=5, max_total_time=12, retry_budget=budget)
+    def function_to_retry():
+        raise Exception("This is an exception")
+
+    with pytest.raises(Exception):
+        function_to_retry()
+
+    # the two sleeps took a token each, the retry given up for the deadline did not
+    assert virtual_clock.delays == [5, 5]
+    assert budget.tokens == 3
+    assert budget.suppressed == 0
+
+
+def test_retry_attempt_timeout_clamped():
+
+    timeouts = []
+
+    @retry(tries=2, max_total_time=0.5, attempt_timeout=10)
+    def function_to_retry(retry_config: RetryConfig):
+        timeouts.append(retry_config.attempt_timeout)
+        return True
+
+    assert function_to_retry()
+    assert 0 < timeouts[0] <= 0.5
+
+
+def test_exception_handler_error_is_chained():
+
+    def exception_handler(e: Exception):
+        raise RuntimeError("Wrapped")
+
+    @retry(tries=2, exception_handler=exception_handler)
+    def function_to_retry():
+        raise ValueError("This is an exception")
+
+    with pytest.raises(RuntimeError) as exc_info:
+        function_to_retry()
+    assert isinstance(exc_info.value.__context__, ValueError)
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+from yet_another_retry import retry
+from yet_another_retry.retry_handlers import retry_after
+from yet_another_retry.testing import virtual_clock
+
+
+class ThrottledError(Exception):
+    def __init__(self, retry_after=None):
+        self.retry_after = retry_after
+
+
+def test_retry_after_hints():
+
+    assert retry_after(ThrottledError(5), attempt=1, retry_after_jitter=0) == 5
+    assert retry_after(ThrottledError("7"), attempt=1, retry_after_jitter=0) == 7
+    assert (
+        retry_after(
+            ThrottledError(timedelta(seconds=3)), attempt=1, retry_after_jitter=0
+        )
+        == 3
+    )
+
+    # HTTP-date, in the past means no wait
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = retry_after(
+        ThrottledError(format_datetime(later, usegmt=True)),
+        attempt=1,
+        retry_after_jitter=0,
+    )
+    assert 25 <= delay <= 30
+    assert retry_after(ThrottledError(-3), attempt=1) == 0
+
+    # header of a response, like requests and httpx
+    e = Exception()
+    e.response = SimpleNamespace(headers={"Retry-After": "2"})
+    assert retry_after(e, attempt=1, retry_after_jitter=0) == 2
+
+
+def test_retry_after_jitter_and_clamp():
+
+    delays = {retry_after(ThrottledError(10), attempt=1) for _ in range(50)}
+    assert all(10 <= delay <= 11 for delay in delays)
+    assert len(delays) > 1
+
+    assert retry_after(ThrottledError(3600), attempt=1, max_delay_seconds=60) == 60
+
+
+def test_retry_after_falls_back_to_exponential_backoff():
+
+    assert retry_after(ThrottledError(), attempt=3) == 8
+    assert retry_after(ThrottledError("soon"), attempt=1, retry_delay=2) == 4
+
+
+def test_retry_after_ignores_hints_that_are_not_finite():
+
+    # "inf" would overflow the wait of the sleeper and "nan" would not wait at all
+    for hint in ("inf", "-inf", "nan", "1e400", float("inf"), float("nan")):
+        assert retry_after(ThrottledError(hint), attempt=3) == 8
+
+    e = Exception()
+    e.response = SimpleNamespace(headers={"Retry-After": "Infinity"})
+    assert retry_after(e, attempt=1, retry_delay=2) == 4
+
+
+def test_retry_after_decorator(virtual_clock):
+
+    class WaitError(Exception):
+        def __init__(self, wait_seconds):
+            self.wait_seconds = wait_seconds
+
+    errors = [WaitError(4), WaitError(None)]
+
+    @retry(
+        tries=3,
+        retry_delay=1,
+        retry_handler=retry_after,
+        retry_after_extractor=lambda e: e.wait_seconds,
+        retry_after_jitter=0,
+    )
+    def function_to_retry():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    assert function_to_retry() == "ok"
+
+    # the hint, then exponential_backoff for the attempt without one
+    assert virtual_clock.delays == [4, 4]
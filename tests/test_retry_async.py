@@ -0,0 +1,49 @@
+import asyncio
+import pytest
+from yet_another_retry import retry, RetryConfig
+
+
+def test_retry_async():
+
+    @retry()
+    async def function_to_retry(retry_config: RetryConfig):
+        await asyncio.sleep(0)
+        if retry_config.attempt == retry_config.tries:
+            return True
+        raise Exception("This is an exception")
+
+    assert asyncio.run(function_to_retry())
+
+
+def test_retry_async_handlers():
+
+    handled = []
+
+    async def retry_handler(e: Exception, attempt: int):
+        handled.append(attempt)
+        return 0
+
+    async def exception_handler(e: Exception):
+        handled.append("final")
+        raise e
+
+    @retry(retry_handler=retry_handler, exception_handler=exception_handler)
+    async def function_to_retry():
+        raise ValueError("This is an exception")
+
+    with pytest.raises(ValueError):
+        asyncio.run(function_to_retry())
+
+    assert handled == [1, 2, "final"]
+
+
+def test_retry_async_handler_on_sync_function():
+
+    async def retry_handler(e: Exception):
+        return 0
+
+    with pytest.raises(TypeError):
+
+        @retry(retry_handler=retry_handler)
+        def function_to_retry():
+            pass
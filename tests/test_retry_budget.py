@@ -0,0 +1,78 @@
+import threading
+import pytest
+from yet_another_retry import retry, RetryBudget, RetryBulkhead
+
+
+def test_retry_budget_tokens():
+
+    budget = RetryBudget(retry_ratio=0.5, max_tokens=2, initial_tokens=1)
+
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+    assert budget.suppressed == 1
+
+    budget.record_success()
+    budget.record_success()
+    assert budget.tokens == 1
+
+    # refills are capped at max_tokens
+    for _ in range(10):
+        budget.record_success()
+    assert budget.tokens == 2
+
+
+def test_retry_budget_suppresses_retries():
+
+    budget = RetryBudget(retry_ratio=0, max_tokens=1)
+    calls = []
+
+    @retry(tries=5, retry_budget=budget)
+    def function_to_retry():
+        calls.append(1)
+        raise ValueError("This is an exception")
+
+    # first call uses the only token, second call is not retried at all
+    with pytest.raises(ValueError):
+        function_to_retry()
+    assert len(calls) == 2
+
+    with pytest.raises(ValueError):
+        function_to_retry()
+    assert len(calls) == 3
+    assert budget.suppressed == 2
+
+
+def test_retry_budget_not_used_by_retries_the_bulkhead_rejects():
+
+    budget = RetryBudget(retry_ratio=0, max_tokens=1)
+    bulkhead = RetryBulkhead(max_concurrent_retries=1)
+    # another call holds the only slot
+    assert bulkhead.try_acquire()
+
+    @retry(tries=2, retry_budget=budget, bulkhead=bulkhead)
+    def function_to_retry():
+        raise ValueError("This is an exception")
+
+    with pytest.raises(ValueError):
+        function_to_retry()
+
+    assert bulkhead.rejected == 1
+    assert budget.tokens == 1
+    assert budget.suppressed == 0
+
+
+def test_retry_budget_threads():
+
+    budget = RetryBudget(retry_ratio=1, max_tokens=10000, initial_tokens=0)
+
+    def record():
+        for _ in range(1000):
+            budget.record_success()
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert budget.tokens == 4000
@@ -0,0 +1,60 @@
+import pytest
+from yet_another_retry import RetryConfig
+from yet_another_retry.retry_handlers import default_retry_handler
+from yet_another_retry.exception_handlers import default_exception_handler
+
+
+def make_retry_config(**kwargs) -> RetryConfig:
+    return RetryConfig(
+        tries=3,
+        retry_delay=0,
+        raise_final_exception=True,
+        retry_exceptions=Exception,
+        fail_on_exceptions=(),
+        retry_handler=default_retry_handler,
+        exception_handler=default_exception_handler,
+        kwargs=kwargs,
+    )
+
+
+def test_retry_config_kwargs_as_attributes():
+
+    retry_config = make_retry_config(custom_value="foo")
+
+    assert retry_config.custom_value == "foo"
+
+    retry_config.custom_value += " bar"
+    assert retry_config.kwargs["custom_value"] == "foo bar"
+
+    with pytest.raises(AttributeError):
+        retry_config.does_not_exist
+
+
+def test_retry_config_as_dict():
+
+    retry_config = make_retry_config(custom_value="foo")
+    values = retry_config.as_dict()
+
+    assert values["tries"] == 3
+    assert values["attempt"] == 0
+    assert values["custom_value"] == "foo"
+    assert "kwargs" not in values
+
+
+def test_retry_config_has_no_dict():
+
+    assert not hasattr(make_retry_config(), "__dict__")
+
+
+def test_retry_config_optional_values_default_to_none():
+
+    retry_config = make_retry_config()
+
+    assert retry_config.max_total_time is None
+    assert retry_config.last_result is None
+    assert retry_config.as_dict()["checkpoint"] is None
+    assert retry_config == make_retry_config()
+
+    retry_config.last_result = "result"
+    assert retry_config.last_result == "result"
+    assert "last_result" not in retry_config.kwargs
@@ -0,0 +1,122 @@
+import time
+import pytest
+from yet_another_retry import (
+    retry,
+    RetryConfig,
+    RetryExecutor,
+    RetryingFunction,
+    RetryCancelledError,
+    RetryStats,
+)
+from yet_another_retry.retry_handlers import AdaptiveRateLimit
+
+
+def test_retry_executor_retries_without_holding_a_worker():
+
+    attempts = {}
+
+    @retry(tries=3, retry_delay=0.05)
+    def function_to_retry(name: str, retry_config: RetryConfig):
+        attempts[name] = retry_config.attempt
+        if retry_config.attempt < 3:
+            raise ValueError("This is an exception")
+        return name
+
+    # one worker, but all calls back off at the same time
+    with RetryExecutor(max_workers=1) as executor:
+        started = time.monotonic()
+        futures = [executor.submit(function_to_retry, name) for name in "abcdefgh"]
+        results = [future.result() for future in futures]
+        elapsed = time.monotonic() - started
+
+    assert results == list("abcdefgh")
+    assert set(attempts.values()) == {3}
+    # sleeping in the worker would take 8 calls x 2 delays of 0.05s
+    assert elapsed < 0.5
+
+
+def test_retry_executor_final_exception_and_hooks():
+
+    stats = RetryStats()
+
+    @retry(tries=2, hooks=stats)
+    def always_fails():
+        raise KeyError("missing")
+
+    with RetryExecutor() as executor:
+        future = executor.submit(always_fails)
+        with pytest.raises(KeyError):
+            future.result()
+
+    snapshot = next(iter(stats.snapshot().values()))
+    assert snapshot["attempts"] == 2
+    assert snapshot["give_ups"] == 1
+
+
+def test_retry_executor_retrying_function_and_errors():
+
+    calls = []
+
+    def plain_function(value: int):
+        calls.append(value)
+        if len(calls) == 1:
+            raise ValueError("This is an exception")
+        return value * 2
+
+    executor = RetryExecutor()
+    future = executor.submit(RetryingFunction(plain_function, tries=2), 21)
+    assert future.result() == 42
+
+    with pytest.raises(TypeError):
+        executor.submit(plain_function, 1)
+
+    @retry()
+    async def coroutine_function():
+        pass
+
+    with pytest.raises(TypeError):
+        executor.submit(coroutine_function)
+
+    executor.shutdown()
+    with pytest.raises(RuntimeError):
+        executor.submit(RetryingFunction(plain_function), 1)
+
+
+def test_retry_executor_cancel_pending():
+
+    @retry(tries=3, retry_delay=60)
+    def function_to_retry():
+        raise ValueError("This is an exception")
+
+    executor = RetryExecutor()
+    future = executor.submit(function_to_retry)
+    while not executor.pending:
+        time.sleep(0.001)
+
+    executor.shutdown(cancel_pending=True)
+    with pytest.raises(RetryCancelledError) as exc_info:
+        future.result()
+    assert isinstance(exc_info.value.__cause__, ValueError)
+
+
+def test_retry_executor_rate_limits_first_attempts():
+
+    calls = []
+
+    # one attempt per second, the second call has to wait for its turn
+    @retry(retry_handler=AdaptiveRateLimit(initial_rate=1, max_rate=1))
+    def function_to_retry(name: str):
+        calls.append(name)
+        return name
+
+    executor = RetryExecutor()
+    first = executor.submit(function_to_retry, "first")
+    second = executor.submit(function_to_retry, "second")
+
+    assert first.result() == "first"
+    assert executor.pending == 1
+    assert calls == ["first"]
+
+    executor.shutdown(cancel_pending=True)
+    assert second.cancelled()
+    assert calls == ["first"]
@@ -0,0 +1,109 @@
+import asyncio
+import pytest
+from yet_another_retry import retry, RetryConfig
+
+
+def test_generator_resumes_from_checkpoint():
+
+    pages = {0: [1, 2, 3], 3: [4, 5, 6], 6: [7, 8]}
+    failures = {(3, 1), (6, 0), (6, 1)}
+    starts = []
+
+    @retry(tries=3)
+    def export(retry_config: RetryConfig):
+        offset = retry_config.checkpoint or 0
+        starts.append(offset)
+        while offset in pages:
+            for index, row in enumerate(pages[offset]):
+                if (offset, index) in failures:
+                    failures.discard((offset, index))
+                    raise ConnectionError("Connection reset")
+                yield row
+            offset += len(pages[offset])
+            retry_config.checkpoint = offset
+
+    assert list(export()) == [1, 2, 3, 4, 5, 6, 7, 8]
+
+    # restarts begin at the last checkpoint, not at the start
+    assert starts == [0, 3, 6, 6]
+
+
+def test_generator_without_checkpoint_drops_delivered_items():
+
+    runs = []
+
+    @retry(tries=2)
+    def numbers():
+        runs.append(1)
+        yield 1
+        yield 2
+        if len(runs) == 1:
+            raise ValueError("This is an exception")
+        yield 3
+
+    assert list(numbers()) == [1, 2, 3]
+    assert len(runs) == 2
+
+
+def test_generator_tries_count_failures_in_a_row():
+
+    @retry(tries=2)
+    def fails_every_item():
+        yield 1
+        raise ValueError("This is an exception")
+
+    generator = fails_every_item()
+    assert next(generator) == 1
+    with pytest.raises(ValueError):
+        next(generator)
+
+    # consumer exceptions are not retried
+    @retry(tries=5)
+    def endless():
+        while True:
+            yield 1
+
+    generator = endless()
+    next(generator)
+    with pytest.raises(KeyError):
+        generator.throw(KeyError("from the consumer"))
+
+
+def test_generator_history_keeps_failures_after_progress():
+
+    configs = []
+
+    @retry(tries=2, attempt_history=10)
+    def numbers(retry_config: RetryConfig):
+        configs.append(retry_config)
+        runs = len(configs)
+        yield from range(runs)
+        if runs < 3:
+            raise ValueError(f"run {runs}")
+
+    assert list(numbers()) == [0, 1, 2]
+
+    # both failures were the first try after progress, both are recorded
+    history = configs[-1].attempt_history
+    assert [record.attempt for record in history] == [1, 1]
+    assert [record.message for record in history] == ["run 1", "run 2"]
+
+
+def test_async_generator_resumes():
+
+    failed = []
+
+    @retry(tries=2)
+    async def stream(retry_config: RetryConfig):
+        start = retry_config.checkpoint or 0
+        for number in range(start, 5):
+            retry_config.checkpoint = number
+            if number == 3 and not failed:
+                failed.append(number)
+                raise ConnectionError("Connection reset")
+            yield number
+
+    async def main():
+        return [number async for number in stream()]
+
+    assert asyncio.run(main()) == [0, 1, 2, 3, 4]
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import pytest
+from yet_another_retry import retry_map, RetryConfig
+
+
+def test_retry_map_retries_only_failed_items():
+
+    calls = {}
+    lock = threading.Lock()
+
+    def flaky(item: int):
+        with lock:
+            calls[item] = calls.get(item, 0) + 1
+            if item % 3 == 0 and calls[item] < 3:
+                raise ConnectionError(f"item {item} failed")
+        return item * 2
+
+    results = list(retry_map(flaky, range(10), tries=3, chunk_size=4))
+
+    assert results == [item * 2 for item in range(10)]
+    assert calls == {item: 3 if item % 3 == 0 else 1 for item in range(10)}
+
+
+def test_retry_map_shared_delay_per_round():
+
+    delays = []
+
+    def retry_handler(e: Exception, attempt: int):
+        delays.append(attempt)
+        return 0
+
+    def always_fails(item: int):
+        raise ValueError(item)
+
+    results = list(
+        retry_map(
+            always_fails,
+            range(5),
+            tries=3,
+            retry_handler=retry_handler,
+            exception_handler=lambda e: None,
+            raise_final_exception=False,
+        )
+    )
+
+    assert results == [None] * 5
+    # one retry handler call per round, not per item
+    assert delays == [1, 2]
+
+
+def test_retry_map_raises_final_exception():
+
+    def always_fails(item: int):
+        raise ValueError(item)
+
+    with pytest.raises(ValueError):
+        list(retry_map(always_fails, range(3), tries=2))
+
+
+def test_retry_map_rejects_decorator_only_parameters():
+
+    for name, value in (("max_total_time", 10), ("hooks", []), ("bulkhead", 1)):
+        with pytest.raises(TypeError, match=name):
+            retry_map(lambda item: item, [1], **{name: value})
+
+    # other kwargs are still passed to the handlers
+    assert list(retry_map(lambda item: item, [1], custom_value=1)) == [1]
+
+
+def test_retry_map_async():
+
+    attempts = {}
+
+    async def flaky(item: int, retry_config: RetryConfig):
+        attempts[item] = retry_config.attempt
+        await asyncio.sleep(0)
+        if item == 2 and retry_config.attempt == 1:
+            raise ConnectionError("failed")
+        return item
+
+    async def collect():
+        return [result async for result in retry_map(flaky, range(4), max_workers=2)]
+
+    assert asyncio.run(collect()) == [0, 1, 2, 3]
+    assert attempts == {0: 1, 1: 1, 2: 2, 3: 1}
@@ -0,0 +1,72 @@
+import asyncio
+import pytest
+from yet_another_retry import retry, retry_map, RetryConfig, RetryResultError
+from yet_another_retry.exception_handlers import do_not_raise
+
+
+def test_retry_on_result():
+
+    results = [503, 429, 200]
+    seen = []
+
+    def handler(e: Exception, attempt: int) -> int:
+        # the rejected result is passed without being raised
+        assert isinstance(e, RetryResultError)
+        assert e.__traceback__ is None
+        seen.append(e.result)
+        return 0
+
+    @retry(tries=5, retry_handler=handler, retry_on_result=lambda status: status != 200)
+    def function_to_retry(retry_config: RetryConfig):
+        seen.append(retry_config.last_result)
+        return results.pop(0)
+
+    assert function_to_retry() == 200
+    assert seen == [None, 503, 503, 429, 429]
+
+
+def test_retry_on_result_out_of_tries():
+
+    @retry(tries=3, retry_on_result=lambda value: value is None)
+    def raises_final():
+        return None
+
+    with pytest.raises(RetryResultError):
+        raises_final()
+
+    calls = []
+
+    @retry(
+        tries=3,
+        retry_on_result=lambda value: value < 10,
+        exception_handler=do_not_raise,
+        raise_final_exception=False,
+    )
+    def returns_last_result():
+        calls.append(1)
+        return len(calls)
+
+    assert returns_last_result() == 3
+
+
+def test_retry_on_result_async_and_map():
+
+    @retry(tries=3, retry_on_result=lambda value: value == "not ready")
+    async def poll(values: list):
+        return values.pop(0)
+
+    assert asyncio.run(poll(["not ready", "ready"])) == "ready"
+
+    attempts = {}
+
+    def get(item: int):
+        attempts[item] = attempts.get(item, 0) + 1
+        return attempts[item]
+
+    results = retry_map(
+        get,
+        [1, 2],
+        tries=3,
+        retry_on_result=lambda value: value < 2,
+    )
+    assert list(results) == [2, 2]
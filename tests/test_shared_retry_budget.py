@@ -0,0 +1,65 @@
+import multiprocessing
+import pickle
+import pytest
+from yet_another_retry import retry, SharedRetryBudget
+
+
+def spend_token(budget: SharedRetryBudget) -> bool:
+    return budget.try_acquire()
+
+
+def test_shared_retry_budget_tokens(tmp_path):
+
+    budget = SharedRetryBudget(
+        tmp_path / "budget", retry_ratio=0.5, max_tokens=2, initial_tokens=1
+    )
+
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+    assert budget.suppressed == 1
+
+    # successes are added when the bucket is read
+    budget.record_success()
+    budget.record_success()
+    assert budget.tokens == 1
+
+    for _ in range(10):
+        budget.record_success()
+    assert budget.tokens == 2
+
+
+def test_shared_retry_budget_shared_by_instances(tmp_path):
+
+    path = tmp_path / "budget"
+    budget = SharedRetryBudget(path, retry_ratio=0, max_tokens=1)
+
+    # a second instance uses the bucket as it is, not its own parameters
+    other_budget = SharedRetryBudget(path, retry_ratio=0, max_tokens=5)
+    assert other_budget.tokens == 1
+
+    calls = []
+
+    @retry(tries=5, retry_budget=other_budget)
+    def function_to_retry():
+        calls.append(1)
+        raise ValueError("This is an exception")
+
+    with pytest.raises(ValueError):
+        function_to_retry()
+    assert len(calls) == 2
+
+    assert not budget.try_acquire()
+    assert budget.suppressed == 2
+
+
+def test_shared_retry_budget_processes(tmp_path):
+
+    budget = SharedRetryBudget(tmp_path / "budget", retry_ratio=0, max_tokens=3)
+    assert pickle.loads(pickle.dumps(budget)).tokens == 3
+
+    with multiprocessing.get_context("spawn").Pool(2) as pool:
+        results = pool.map(spend_token, [budget] * 5)
+
+    assert sorted(results) == [False, False, True, True, True]
+    assert budget.tokens == 0
+    assert budget.suppressed == 2
@@ -0,0 +1,96 @@
+import pytest
+from yet_another_retry import simulate_policy
+from yet_another_retry.__main__ import main
+from yet_another_retry.retry_handlers import exponential_backoff
+
+
+def test_simulate_without_failures():
+
+    result = simulate_policy(0, calls=1000, attempt_duration=0.1)
+
+    assert result.succeeded == 1000
+    assert result.expected_attempts == 1
+    assert result.percentile(99) == pytest.approx(0.1)
+    assert result.retry_buckets == {}
+    assert result.busiest_buckets() == []
+
+
+def test_simulate_always_failing():
+
+    result = simulate_policy(
+        1,
+        calls=100,
+        tries=4,
+        retry_handler=exponential_backoff,
+        retry_delay=1,
+        max_delay_seconds=5,
+        attempt_duration=0.5,
+    )
+
+    assert result.succeeded == 0
+    assert result.attempts == 400
+    # 4 attempts and delays of 2, 4 and 5 seconds
+    assert result.percentile(0) == pytest.approx(13)
+    assert result.percentile(100) == pytest.approx(13)
+
+
+def test_simulate_is_repeatable_with_seed():
+
+    def run():
+        return simulate_policy(
+            0.3,
+            calls=2000,
+            tries=5,
+            retry_handler=exponential_backoff,
+            retry_delay=0.1,
+            jitter_range=1,
+            seed=42,
+        )
+
+    first, second = run(), run()
+    assert first.latencies == second.latencies
+    assert first.attempt_buckets == second.attempt_buckets
+    assert 1 < first.expected_attempts < 1.5
+
+
+def test_outage_causes_retry_burst():
+
+    result = simulate_policy(
+        0,
+        calls=20_000,
+        tries=3,
+        retry_delay=1,
+        arrival_rate=1000,
+        outage_start=10,
+        outage_duration=2,
+        seed=1,
+    )
+
+    start, attempts, retries = result.busiest_buckets(1)[0]
+    assert 10 <= start <= 13
+    assert result.peak_amplification > 1.5
+
+
+def test_simulate_command(capsys):
+
+    main(
+        [
+            "simulate",
+            "--failure-probability",
+            "0.2",
+            "--calls",
+            "1000",
+            "--retry-delay",
+            "0.5",
+            "--seed",
+            "1",
+            "--percentiles",
+            "50",
+            "99",
+        ]
+    )
+
+    output = capsys.readouterr().out
+    assert "expected attempts" in output
+    assert "latency p99 " in output
+    assert "retry bursts" in output
@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from yet_another_retry import retry, CircuitBreaker
+from yet_another_retry.retry_handlers import exponential_backoff
+from yet_another_retry.testing import VirtualClock, virtual_clock
+
+
+def test_virtual_clock_records_delays(virtual_clock):
+
+    @retry(tries=5, retry_handler=exponential_backoff, retry_delay=10)
+    def function_to_retry():
+        raise Exception("This is an exception")
+
+    with pytest.raises(Exception):
+        function_to_retry()
+
+    assert virtual_clock.delays == [20, 40, 80, 160]
+    assert virtual_clock.now() == 300
+
+
+def test_virtual_clock_async(virtual_clock):
+
+    @retry(tries=3, retry_delay=60)
+    async def function_to_retry():
+        raise Exception("This is an exception")
+
+    with pytest.raises(Exception):
+        asyncio.run(function_to_retry())
+
+    assert virtual_clock.delays == [60, 60]
+
+
+def test_explicit_clock_and_sleeper():
+
+    clock = VirtualClock()
+
+    @retry(tries=3, retry_delay=1, clock=clock.now, sleeper=clock.sleep)
+    def function_to_retry():
+        raise Exception("This is an exception")
+
+    with pytest.raises(Exception):
+        function_to_retry()
+
+    assert clock.delays == [1, 1]
+
+
+def test_circuit_breaker_uses_default_clock(virtual_clock):
+
+    breaker = CircuitBreaker(window_size=1, minimum_calls=1, cooldown=30)
+    breaker.record_exception(Exception())
+    assert breaker.state == "open"
+
+    virtual_clock.advance(30)
+    assert breaker.state == "half_open"